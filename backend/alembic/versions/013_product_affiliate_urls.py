@@ -0,0 +1,43 @@
+"""Add product_affiliate_urls table with materialized affiliate URLs
+
+Revision ID: 013_product_affiliate_urls
+Revises: 012_simplify_blog_system
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '013_product_affiliate_urls'
+down_revision = '012_simplify_blog_system'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'product_affiliate_urls',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('store_id', sa.Integer(), nullable=False),
+        sa.Column('original_url', sa.Text(), nullable=True),
+        sa.Column('affiliate_url', sa.Text(), nullable=True),
+        sa.Column('generated_at', sa.DateTime(), nullable=False, server_default=sa.text('NOW()')),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['store_id'], ['affiliate_stores.id'], ondelete='CASCADE'),
+        sa.UniqueConstraint('product_id', 'store_id', name='uq_product_store_affiliate_url'),
+    )
+    op.create_index('ix_product_affiliate_urls_id', 'product_affiliate_urls', ['id'], unique=False)
+    op.create_index('ix_product_affiliate_urls_product_id', 'product_affiliate_urls', ['product_id'], unique=False)
+    op.create_index('ix_product_affiliate_urls_store_id', 'product_affiliate_urls', ['store_id'], unique=False)
+    op.create_index('ix_product_affiliate_urls_generated_at', 'product_affiliate_urls', ['generated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_product_affiliate_urls_generated_at', table_name='product_affiliate_urls')
+    op.drop_index('ix_product_affiliate_urls_store_id', table_name='product_affiliate_urls')
+    op.drop_index('ix_product_affiliate_urls_product_id', table_name='product_affiliate_urls')
+    op.drop_index('ix_product_affiliate_urls_id', table_name='product_affiliate_urls')
+    op.drop_table('product_affiliate_urls')
@@ -0,0 +1,49 @@
+"""Add product_specs normalized specification index
+
+Revision ID: 014_product_spec_index
+Revises: 013_product_affiliate_urls
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '014_product_spec_index'
+down_revision = '013_product_affiliate_urls'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'product_specs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('spec_key', sa.String(length=100), nullable=False),
+        sa.Column('raw_key', sa.String(length=255), nullable=False),
+        sa.Column('value_text', sa.Text(), nullable=True),
+        sa.Column('numeric_value', sa.Float(), nullable=True),
+        sa.Column('unit', sa.String(length=10), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.UniqueConstraint('product_id', 'spec_key', name='uq_product_spec_key'),
+    )
+    op.create_index('ix_product_specs_id', 'product_specs', ['id'], unique=False)
+    op.create_index('ix_product_specs_product_id', 'product_specs', ['product_id'], unique=False)
+    # Serves range filters like "frets >= 24": equality on key, range on the normalized number
+    op.create_index('ix_product_specs_key_numeric', 'product_specs', ['spec_key', 'numeric_value'], unique=False)
+    # Text equality filters ("color = red")
+    op.create_index(
+        'ix_product_specs_key_lower_text', 'product_specs',
+        ['spec_key', sa.text('lower(value_text)')], unique=False,
+        postgresql_where=sa.text('numeric_value IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_product_specs_key_lower_text', table_name='product_specs')
+    op.drop_index('ix_product_specs_key_numeric', table_name='product_specs')
+    op.drop_index('ix_product_specs_product_id', table_name='product_specs')
+    op.drop_index('ix_product_specs_id', table_name='product_specs')
+    op.drop_table('product_specs')
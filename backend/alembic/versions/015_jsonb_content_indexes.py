@@ -0,0 +1,67 @@
+"""Convert product JSON columns to JSONB and index hot JSON paths
+
+Revision ID: 015_jsonb_content_indexes
+Revises: 014_product_spec_index
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '015_jsonb_content_indexes'
+down_revision = '014_product_spec_index'
+branch_labels = None
+depends_on = None
+
+JSONB_COLUMNS = ('content', 'images', 'category_attributes')
+
+
+def upgrade() -> None:
+    # No-op for columns that are already jsonb (databases created by the openai importer)
+    for column in JSONB_COLUMNS:
+        op.alter_column(
+            'products', column,
+            type_=postgresql.JSONB(astext_type=sa.Text()),
+            postgresql_using=f'{column}::jsonb',
+        )
+
+    # Store link presence: content->'store_links' ? 'Thomann'
+    op.create_index(
+        'ix_products_store_links', 'products',
+        [sa.text("(content->'store_links')")], unique=False,
+        postgresql_using='gin',
+    )
+    # Products still missing their main image (image pipeline / maintenance scripts)
+    op.create_index(
+        'ix_products_missing_main_image', 'products',
+        ['id'], unique=False,
+        postgresql_where=sa.text("COALESCE(images->'thomann_main'->>'url', '') = ''"),
+    )
+
+    # Blog tag filter: content_json->'tags' ? :tag
+    op.create_index(
+        'ix_blog_posts_content_tags', 'blog_posts',
+        [sa.text("(content_json->'tags')")], unique=False,
+        postgresql_using='gin',
+    )
+    # Blog category filter, same expression the listing queries use
+    op.create_index(
+        'ix_blog_posts_content_category', 'blog_posts',
+        [sa.text("COALESCE(content_json->>'category', 'general')"), 'status'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_blog_posts_content_category', table_name='blog_posts')
+    op.drop_index('ix_blog_posts_content_tags', table_name='blog_posts')
+    op.drop_index('ix_products_missing_main_image', table_name='products')
+    op.drop_index('ix_products_store_links', table_name='products')
+
+    for column in JSONB_COLUMNS:
+        op.alter_column(
+            'products', column,
+            type_=sa.JSON(),
+            postgresql_using=f'{column}::json',
+        )
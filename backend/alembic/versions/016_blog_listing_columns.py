@@ -0,0 +1,85 @@
+"""Denormalize blog listing fields (category_slug, reading_time, tags) onto blog_posts
+
+Revision ID: 016_blog_listing_columns
+Revises: 015_jsonb_content_indexes
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '016_blog_listing_columns'
+down_revision = '015_jsonb_content_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('blog_posts', sa.Column('category_slug', sa.String(length=100), nullable=False, server_default='general'))
+    op.add_column('blog_posts', sa.Column('reading_time', sa.Integer(), nullable=False, server_default='5'))
+    op.add_column('blog_posts', sa.Column('tag_names', postgresql.ARRAY(sa.Text()), nullable=False, server_default='{}'))
+    op.add_column('blog_posts', sa.Column('tag_slugs', postgresql.ARRAY(sa.Text()), nullable=False, server_default='{}'))
+
+    # Derive the listing fields from content_json on every write, whichever code path
+    # (API, admin, batch processor, maintenance scripts) performs it. Tag slugs use the
+    # same rules the listing endpoint used to apply in Python.
+    op.execute("""
+    CREATE OR REPLACE FUNCTION blog_posts_listing_fields()
+    RETURNS TRIGGER AS $$
+    DECLARE
+        word_count TEXT;
+    BEGIN
+        NEW.category_slug = LEFT(COALESCE(NULLIF(NEW.content_json->>'category', ''), 'general'), 100);
+
+        word_count = NEW.content_json->>'word_count';
+        NEW.reading_time = CASE WHEN word_count ~ '^\\d+$' THEN word_count::int / 200 ELSE 5 END;
+
+        IF jsonb_typeof(NEW.content_json->'tags') = 'array' THEN
+            SELECT
+                COALESCE(array_agg(tag ORDER BY ord), '{}'),
+                COALESCE(array_agg(
+                    trim(both '-' from regexp_replace(
+                        regexp_replace(lower(tag), '[^a-z0-9\\s-]', '', 'g'), '\\s+', '-', 'g'
+                    )) ORDER BY ord
+                ), '{}')
+            INTO NEW.tag_names, NEW.tag_slugs
+            FROM jsonb_array_elements_text(NEW.content_json->'tags') WITH ORDINALITY AS t(tag, ord);
+        ELSE
+            NEW.tag_names = '{}';
+            NEW.tag_slugs = '{}';
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+    CREATE TRIGGER blog_posts_listing_fields_trigger
+        BEFORE INSERT OR UPDATE OF content_json ON blog_posts
+        FOR EACH ROW
+        EXECUTE FUNCTION blog_posts_listing_fields();
+    """)
+
+    # Backfill existing posts through the trigger
+    op.execute("UPDATE blog_posts SET content_json = content_json")
+
+    # Listing: published posts by category, newest first
+    op.create_index(
+        'ix_blog_posts_published_category', 'blog_posts',
+        ['category_slug', sa.text('published_at DESC'), sa.text('created_at DESC')], unique=False,
+        postgresql_where=sa.text("status = 'published'"),
+    )
+    # Tag filter: tag_slugs @> ARRAY[:tag]
+    op.create_index('ix_blog_posts_tag_slugs', 'blog_posts', ['tag_slugs'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_blog_posts_tag_slugs', table_name='blog_posts')
+    op.drop_index('ix_blog_posts_published_category', table_name='blog_posts')
+    op.execute("DROP TRIGGER IF EXISTS blog_posts_listing_fields_trigger ON blog_posts;")
+    op.execute("DROP FUNCTION IF EXISTS blog_posts_listing_fields();")
+    op.drop_column('blog_posts', 'tag_slugs')
+    op.drop_column('blog_posts', 'tag_names')
+    op.drop_column('blog_posts', 'reading_time')
+    op.drop_column('blog_posts', 'category_slug')
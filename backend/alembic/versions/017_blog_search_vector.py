@@ -0,0 +1,67 @@
+"""Add weighted full-text search vector to blog_posts
+
+Revision ID: 017_blog_search_vector
+Revises: 016_blog_listing_columns
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '017_blog_search_vector'
+down_revision = '016_blog_listing_columns'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('blog_posts', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    # Weights: title A, excerpt and tags B, section bodies C (legacy posts without
+    # sections fall back to the plain content column)
+    op.execute("""
+    CREATE OR REPLACE FUNCTION blog_posts_search_vector()
+    RETURNS TRIGGER AS $$
+    DECLARE
+        tags_text TEXT := '';
+        body_text TEXT;
+    BEGIN
+        IF jsonb_typeof(NEW.content_json->'tags') = 'array' THEN
+            SELECT string_agg(tag, ' ') INTO tags_text
+            FROM jsonb_array_elements_text(NEW.content_json->'tags') AS t(tag);
+        END IF;
+
+        IF jsonb_typeof(NEW.content_json->'sections') = 'array' THEN
+            SELECT string_agg(section->>'content', ' ') INTO body_text
+            FROM jsonb_array_elements(NEW.content_json->'sections') AS s(section)
+            WHERE jsonb_typeof(section) = 'object';
+        END IF;
+
+        NEW.search_vector =
+            setweight(to_tsvector('english', COALESCE(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', COALESCE(NEW.excerpt, '') || ' ' || COALESCE(tags_text, '')), 'B') ||
+            setweight(to_tsvector('english', COALESCE(body_text, NEW.content, '')), 'C');
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+    CREATE TRIGGER blog_posts_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, excerpt, content, content_json ON blog_posts
+        FOR EACH ROW
+        EXECUTE FUNCTION blog_posts_search_vector();
+    """)
+
+    # Backfill existing posts through the trigger
+    op.execute("UPDATE blog_posts SET title = title")
+
+    op.create_index('ix_blog_posts_search_vector', 'blog_posts', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_blog_posts_search_vector', table_name='blog_posts')
+    op.execute("DROP TRIGGER IF EXISTS blog_posts_search_vector_trigger ON blog_posts;")
+    op.execute("DROP FUNCTION IF EXISTS blog_posts_search_vector();")
+    op.drop_column('blog_posts', 'search_vector')
@@ -0,0 +1,37 @@
+"""Add blog_post_stats for buffered view counts
+
+Revision ID: 018_blog_post_stats
+Revises: 017_blog_search_vector
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '018_blog_post_stats'
+down_revision = '017_blog_search_vector'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Kept apart from blog_posts so view flushes never rewrite (or lock) post rows
+    op.create_table(
+        'blog_post_stats',
+        sa.Column('post_id', sa.Integer(), sa.ForeignKey('blog_posts.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('view_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('last_viewed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    # Top posts and sort_by=views walk this index
+    op.create_index(
+        'ix_blog_post_stats_view_count',
+        'blog_post_stats',
+        [sa.text('view_count DESC'), 'post_id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_blog_post_stats_view_count', table_name='blog_post_stats')
+    op.drop_table('blog_post_stats')
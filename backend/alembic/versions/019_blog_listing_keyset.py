@@ -0,0 +1,65 @@
+"""Keyset indexes for the published blog listing
+
+Revision ID: 019_blog_listing_keyset
+Revises: 018_blog_post_stats
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '019_blog_listing_keyset'
+down_revision = '018_blog_post_stats'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keyset cursors need a non-NULL published_at on every published post
+    op.execute("""
+    UPDATE blog_posts SET published_at = COALESCE(created_at, NOW())
+    WHERE status = 'published' AND published_at IS NULL
+    """)
+    op.execute("""
+    CREATE OR REPLACE FUNCTION blog_posts_default_published_at()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF NEW.status = 'published' AND NEW.published_at IS NULL THEN
+            NEW.published_at = COALESCE(NEW.created_at, NOW());
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+    CREATE TRIGGER blog_posts_default_published_at_trigger
+        BEFORE INSERT OR UPDATE OF status, published_at ON blog_posts
+        FOR EACH ROW
+        EXECUTE FUNCTION blog_posts_default_published_at();
+    """)
+
+    # Listing order is (published_at DESC, id DESC); the cursor is the last row's pair
+    op.create_index(
+        'ix_blog_posts_published_keyset', 'blog_posts',
+        [sa.text('published_at DESC'), sa.text('id DESC')], unique=False,
+        postgresql_where=sa.text("status = 'published'"),
+    )
+    op.drop_index('ix_blog_posts_published_category', table_name='blog_posts')
+    op.create_index(
+        'ix_blog_posts_published_category', 'blog_posts',
+        ['category_slug', sa.text('published_at DESC'), sa.text('id DESC')], unique=False,
+        postgresql_where=sa.text("status = 'published'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_blog_posts_published_category', table_name='blog_posts')
+    op.create_index(
+        'ix_blog_posts_published_category', 'blog_posts',
+        ['category_slug', sa.text('published_at DESC'), sa.text('created_at DESC')], unique=False,
+        postgresql_where=sa.text("status = 'published'"),
+    )
+    op.drop_index('ix_blog_posts_published_keyset', table_name='blog_posts')
+    op.execute("DROP TRIGGER IF EXISTS blog_posts_default_published_at_trigger ON blog_posts;")
+    op.execute("DROP FUNCTION IF EXISTS blog_posts_default_published_at();")
@@ -0,0 +1,42 @@
+"""Add precomputed related posts/products for blog posts
+
+Revision ID: 020_blog_related_index
+Revises: 019_blog_listing_keyset
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '020_blog_related_index'
+down_revision = '019_blog_listing_keyset'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Top-K neighbours per post, written by app.scripts.rebuild_blog_similarity
+    op.create_table(
+        'blog_post_related',
+        sa.Column('post_id', sa.Integer(), sa.ForeignKey('blog_posts.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('kind', sa.String(length=10), nullable=False),  # 'post' or 'product'
+        sa.Column('rank', sa.SmallInteger(), nullable=False),
+        sa.Column('related_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('post_id', 'kind', 'rank'),
+    )
+    # Fingerprint of the text each post was vectorized from; incremental runs only
+    # recompute posts whose fingerprint changed
+    op.create_table(
+        'blog_post_similarity_state',
+        sa.Column('post_id', sa.Integer(), sa.ForeignKey('blog_posts.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('doc_hash', sa.String(length=32), nullable=False),
+        sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('blog_post_similarity_state')
+    op.drop_table('blog_post_related')
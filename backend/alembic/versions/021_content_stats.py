@@ -0,0 +1,106 @@
+"""Add trigger-maintained content_stats for the admin dashboards
+
+Revision ID: 021_content_stats
+Revises: 020_blog_related_index
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '021_content_stats'
+down_revision = '020_blog_related_index'
+branch_labels = None
+depends_on = None
+
+# bucket_day '-infinity' holds the all-time count of a (status, ai_generated) key;
+# other rows count by created_at day, so "last 7/30 days" sums at most 30 days of rows
+ALL_TIME = "'-infinity'::date"
+
+
+def upgrade() -> None:
+    op.create_table(
+        'content_stats',
+        sa.Column('entity', sa.String(length=30), nullable=False),
+        sa.Column('bucket_day', sa.Date(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('ai_generated', sa.Boolean(), nullable=False, server_default='false'),
+        sa.Column('count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('entity', 'bucket_day', 'status', 'ai_generated'),
+    )
+
+    op.execute(f"""
+    CREATE OR REPLACE FUNCTION content_stats_apply(
+        p_entity TEXT, p_created_at TIMESTAMP, p_status TEXT, p_ai BOOLEAN, p_delta INTEGER
+    ) RETURNS VOID AS $$
+    BEGIN
+        INSERT INTO content_stats (entity, bucket_day, status, ai_generated, count)
+        VALUES
+            (p_entity, COALESCE(p_created_at, 'epoch')::date, COALESCE(p_status, 'unknown'), COALESCE(p_ai, false), p_delta),
+            (p_entity, {ALL_TIME}, COALESCE(p_status, 'unknown'), COALESCE(p_ai, false), p_delta)
+        ON CONFLICT (entity, bucket_day, status, ai_generated)
+        DO UPDATE SET count = content_stats.count + EXCLUDED.count;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+
+    # Row triggers move a row's contribution from its old key to its new one; updates
+    # that do not touch the counted columns skip the trigger entirely
+    for table, ai_column in (('blog_posts', 'generated_by_ai'), ('instrument_requests', None)):
+        old_ai = f"OLD.{ai_column}" if ai_column else "false"
+        new_ai = f"NEW.{ai_column}" if ai_column else "false"
+        op.execute(f"""
+        CREATE OR REPLACE FUNCTION {table}_content_stats()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM content_stats_apply('{table}', OLD.created_at, OLD.status, {old_ai}, -1);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM content_stats_apply('{table}', NEW.created_at, NEW.status, {new_ai}, 1);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """)
+        changed = " OR ".join(
+            f"OLD.{column} IS DISTINCT FROM NEW.{column}"
+            for column in ['status', 'created_at'] + ([ai_column] if ai_column else [])
+        )
+        op.execute(f"""
+        CREATE TRIGGER {table}_content_stats_insert_delete
+            AFTER INSERT OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {table}_content_stats();
+        CREATE TRIGGER {table}_content_stats_update
+            AFTER UPDATE ON {table}
+            FOR EACH ROW WHEN ({changed})
+            EXECUTE FUNCTION {table}_content_stats();
+        """)
+
+        op.execute(f"""
+        INSERT INTO content_stats (entity, bucket_day, status, ai_generated, count)
+        SELECT '{table}', COALESCE(created_at, 'epoch')::date, COALESCE(status, 'unknown'),
+               COALESCE({ai_column or 'false'}, false), COUNT(*)
+        FROM {table}
+        GROUP BY 2, 3, 4
+        UNION ALL
+        SELECT '{table}', {ALL_TIME}, COALESCE(status, 'unknown'), COALESCE({ai_column or 'false'}, false), COUNT(*)
+        FROM {table}
+        GROUP BY 3, 4
+        """)
+
+    # Total blog views, added to by the view counter's flushes
+    op.execute(f"""
+    INSERT INTO content_stats (entity, bucket_day, status, ai_generated, count)
+    SELECT 'blog_views', {ALL_TIME}, 'all', false, COALESCE(SUM(view_count), 0) FROM blog_post_stats
+    """)
+
+
+def downgrade() -> None:
+    for table in ('instrument_requests', 'blog_posts'):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_content_stats_update ON {table};")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_content_stats_insert_delete ON {table};")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_content_stats();")
+    op.execute("DROP FUNCTION IF EXISTS content_stats_apply(TEXT, TIMESTAMP, TEXT, BOOLEAN, INTEGER);")
+    op.drop_table('content_stats')
@@ -0,0 +1,57 @@
+"""Add blog_generation_jobs queue for background AI generation
+
+Revision ID: 022_blog_generation_jobs
+Revises: 021_content_stats
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '022_blog_generation_jobs'
+down_revision = '021_content_stats'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Jobs are claimed with FOR UPDATE SKIP LOCKED by app.scripts.run_generation_worker
+    op.create_table(
+        'blog_generation_jobs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('kind', sa.String(length=30), nullable=False),  # 'generate' or 'clone_rewrite'
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='3'),
+        sa.Column('blog_post_id', sa.Integer(), sa.ForeignKey('blog_posts.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('requested_by', sa.String(length=255), nullable=True),
+        sa.Column('locked_by', sa.String(length=100), nullable=True),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('run_after', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    # The claim query only looks at due pending jobs and at running jobs whose lock expired
+    op.create_index(
+        'ix_blog_generation_jobs_pending', 'blog_generation_jobs', ['run_after', 'id'],
+        postgresql_where=sa.text("status = 'pending'")
+    )
+    op.create_index(
+        'ix_blog_generation_jobs_running', 'blog_generation_jobs', ['locked_at'],
+        postgresql_where=sa.text("status = 'running'")
+    )
+    op.create_index('ix_blog_generation_jobs_created_at', 'blog_generation_jobs', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_blog_generation_jobs_created_at', table_name='blog_generation_jobs')
+    op.drop_index('ix_blog_generation_jobs_running', table_name='blog_generation_jobs')
+    op.drop_index('ix_blog_generation_jobs_pending', table_name='blog_generation_jobs')
+    op.drop_table('blog_generation_jobs')
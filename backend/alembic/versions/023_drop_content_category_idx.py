@@ -0,0 +1,35 @@
+"""Drop the content_json category/tag expression indexes superseded by the 016 listing columns
+
+Revision ID: 023_drop_content_category_idx
+Revises: 022_blog_generation_jobs
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '023_drop_content_category_idx'
+down_revision = '022_blog_generation_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Category and tag filters read blog_posts.category_slug / tag_slugs (kept in sync by
+    # the listing-fields trigger from 016, indexed there), so the 015 expression indexes
+    # on content_json are only write overhead.
+    op.drop_index('ix_blog_posts_content_category', table_name='blog_posts')
+    op.drop_index('ix_blog_posts_content_tags', table_name='blog_posts')
+
+
+def downgrade() -> None:
+    op.create_index(
+        'ix_blog_posts_content_tags', 'blog_posts',
+        [sa.text("(content_json->'tags')")], unique=False,
+        postgresql_using='gin',
+    )
+    op.create_index(
+        'ix_blog_posts_content_category', 'blog_posts',
+        [sa.text("COALESCE(content_json->>'category', 'general')"), 'status'], unique=False,
+    )
@@ -0,0 +1,50 @@
+"""Subtract deleted posts' views from the all-time blog_views counter
+
+Revision ID: 024_blog_views_delete_trigger
+Revises: 023_drop_content_category_idx
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '024_blog_views_delete_trigger'
+down_revision = '023_drop_content_category_idx'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The view counter's flushes add to blog_views; stats rows that go away (including
+    # the cascade when a post is deleted) take their views back out, so the counter
+    # stays equal to SUM(blog_post_stats.view_count) as it was before content_stats
+    op.execute("""
+    CREATE OR REPLACE FUNCTION blog_post_stats_views_deleted()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        UPDATE content_stats
+        SET count = count - (SELECT COALESCE(SUM(view_count), 0) FROM deleted_stats)
+        WHERE entity = 'blog_views' AND bucket_day = '-infinity'::date AND status = 'all' AND ai_generated = false;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+    # One counter update per DELETE statement rather than per stats row
+    op.execute("""
+    CREATE TRIGGER blog_post_stats_views_deleted
+        AFTER DELETE ON blog_post_stats
+        REFERENCING OLD TABLE AS deleted_stats
+        FOR EACH STATEMENT EXECUTE FUNCTION blog_post_stats_views_deleted();
+    """)
+
+    # Views of posts deleted since 021
+    op.execute("""
+    UPDATE content_stats
+    SET count = (SELECT COALESCE(SUM(view_count), 0) FROM blog_post_stats)
+    WHERE entity = 'blog_views' AND bucket_day = '-infinity'::date AND status = 'all' AND ai_generated = false
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS blog_post_stats_views_deleted ON blog_post_stats;")
+    op.execute("DROP FUNCTION IF EXISTS blog_post_stats_views_deleted();")
@@ -6,9 +6,10 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models import AffiliateStore
 from ..services.affiliate_manager import AffiliateManager
+from ..services.enhanced_affiliate_service import EnhancedAffiliateService
 
 router = APIRouter(prefix="/affiliate-stores", tags=["affiliate-stores"])
 
@@ -18,7 +19,7 @@ async def list_affiliate_stores(
     has_affiliate_program: Optional[bool] = Query(None),
     show_affiliate_buttons: Optional[bool] = Query(None),
     is_active: Optional[bool] = Query(None),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List all affiliate stores with optional filtering"""
     
@@ -60,7 +61,7 @@ async def list_affiliate_stores(
 @router.get("/{store_id}")
 async def get_affiliate_store(
     store_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get detailed information about a specific affiliate store"""
     
@@ -100,12 +101,12 @@ async def update_store_affiliate_config(
     priority: Optional[int] = None,
     db: AsyncSession = Depends(get_db),
 ):
-    """Update affiliate configuration for a store"""
+    """Update affiliate configuration for a store and re-materialize its product affiliate URLs"""
     
-    affiliate_manager = AffiliateManager(db)
+    affiliate_service = EnhancedAffiliateService(db)
     
     try:
-        store = await affiliate_manager.update_store_affiliate_config(
+        store = await affiliate_service.update_store_affiliate_config(
             store_id=store_id,
             has_affiliate_program=has_affiliate_program,
             affiliate_base_url=affiliate_base_url,
@@ -133,7 +134,7 @@ async def update_store_affiliate_config(
 @router.get("/{store_id}/affiliate-config")
 async def get_store_affiliate_config(
     store_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get affiliate configuration for a store"""
     
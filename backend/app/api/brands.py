@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
+from ..database import get_read_db
 from ..models import Brand, Category, Product
 
 
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/brands", tags=["brands"])
 
 
 @router.get("")
-async def list_brands(category: Optional[str] = Query(None), db: AsyncSession = Depends(get_db)):
+async def list_brands(category: Optional[str] = Query(None), db: AsyncSession = Depends(get_read_db)):
     """List brands, excluding placeholder/unknown entries.
 
     Excludes brands with name 'Unknown Brand' or slug 'unknown-brand'.
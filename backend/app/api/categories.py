@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
+from ..database import get_read_db
 from ..models import Category
 
 
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/categories", tags=["categories"])
 
 
 @router.get("")
-async def list_categories(parent_id: Optional[int] = Query(None), db: AsyncSession = Depends(get_db)):
+async def list_categories(parent_id: Optional[int] = Query(None), db: AsyncSession = Depends(get_read_db)):
     stmt = select(Category).where(Category.is_active.is_(True))
     if parent_id is not None:
         stmt = stmt.where(Category.parent_id == parent_id)
@@ -3,13 +3,17 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, List
 
-from fastapi import APIRouter, Body, Depends, HTTPException
-from sqlalchemy import select
+import hashlib
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
-from ..database import get_db
-from ..models import Product, ProductPrice
+from ..database import get_db, get_read_db
+from ..models import Product, ProductPrice, ProductVote
+from ..services.cache_service import cache_service
+from ..services.spec_index import SpecIndexService, spec_label
 from ..services.trending_service import trending_service
 from ..utils.vote_utils import get_multiple_products_vote_stats
 from .products import get_clean_content
@@ -17,6 +21,11 @@ from .products import get_clean_content
 
 router = APIRouter(prefix="/compare", tags=["compare"])
 
+# Comparison result caching
+COMPARE_CACHE_TTL = 1800  # 30 minutes
+COMPARE_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=600"
+MAX_COMPARE_PRODUCTS = 10
+
 
 def _extract_image_urls(images_dict: Dict[str, Any]) -> List[str]:
     """
@@ -38,17 +47,37 @@ def _extract_image_urls(images_dict: Dict[str, Any]) -> List[str]:
     return urls
 
 
-@router.post("")
-async def compare_products(
-    product_ids: List[int] = Body(..., embed=False), db: AsyncSession = Depends(get_db)
-):
-    if not product_ids or len(product_ids) < 1:
-        raise HTTPException(status_code=400, detail="Provide at least one product ID")
+async def _get_comparison_version(db: AsyncSession, product_ids: List[int]) -> str:
+    """Freshness stamp for a product set: latest product/price/vote update plus the vote count"""
+    product_updated = (
+        select(func.max(Product.updated_at)).where(Product.id.in_(product_ids)).scalar_subquery()
+    )
+    price_updated = (
+        select(func.max(ProductPrice.updated_at)).where(ProductPrice.product_id.in_(product_ids)).scalar_subquery()
+    )
+    vote_updated = (
+        select(func.max(ProductVote.updated_at)).where(ProductVote.product_id.in_(product_ids)).scalar_subquery()
+    )
+    vote_count = (
+        select(func.count(ProductVote.id)).where(ProductVote.product_id.in_(product_ids)).scalar_subquery()
+    )
+    result = await db.execute(select(product_updated, price_updated, vote_updated, vote_count))
+    product_ts, price_ts, vote_ts, votes = result.one()
+    stamps = [stamp for stamp in (product_ts, price_ts, vote_ts) if stamp is not None]
+    latest = max(stamps).isoformat() if stamps else ""
+    return f"{latest}:{votes}"
+
 
+async def _build_comparison(db: AsyncSession, product_ids: List[int]) -> Dict[str, Any]:
     stmt = (
         select(Product)
-        .options(joinedload(Product.brand), joinedload(Product.category), joinedload(Product.prices))
+        .options(
+            joinedload(Product.brand),
+            joinedload(Product.category),
+            joinedload(Product.prices).joinedload(ProductPrice.store),
+        )
         .where(Product.id.in_(product_ids))
+        .order_by(Product.id)
     )
     result = await db.execute(stmt)
     products = result.scalars().unique().all()
@@ -61,7 +90,6 @@ async def compare_products(
 
     # Build comparison data
     products_data: List[Dict[str, Any]] = []
-    spec_sets: List[set[str]] = []
     for p in products:
         prices = [
             {
@@ -110,25 +138,102 @@ async def compare_products(
                 "prices": prices,
             }
         )
-        specs = p.content.get('specifications', {}) if p.content else {}
-        spec_sets.append(set(specs.keys()) if specs else set())
 
-    common_specs = sorted(list(set.intersection(*spec_sets))) if spec_sets else []
+    # Align specs on canonical keys from the spec index (synonyms like "Weight (lbs)" / "Weight" match)
+    aligned = await SpecIndexService(db).get_aligned_specs(products)
+    spec_key_sets = [set(aligned.get(p.id, {}).keys()) for p in products]
+    common_specs = sorted(set.intersection(*spec_key_sets)) if spec_key_sets else []
+    all_specs = sorted(set.union(*spec_key_sets)) if spec_key_sets else []
 
-    # Build comparison matrix for common specs
-    comparison_matrix: Dict[str, Dict[str, Any]] = {}
-    for spec in common_specs:
+    # Display the raw value as stored in content, aligned under the canonical key
+    aligned_specs: Dict[str, Dict[str, Any]] = {}
+    for spec in all_specs:
         row: Dict[str, Any] = {}
         for p in products:
-            specs = p.content.get('specifications', {}) if p.content else {}
-            row[str(p.id)] = specs.get(spec, None)
-        comparison_matrix[spec] = row
+            entry = aligned.get(p.id, {}).get(spec)
+            if entry is None:
+                row[str(p.id)] = None
+                continue
+            raw_specs = p.content.get('specifications', {}) if p.content else {}
+            row[str(p.id)] = raw_specs.get(entry["raw_key"], entry["value_text"])
+        aligned_specs[spec] = row
+
+    comparison_matrix: Dict[str, Dict[str, Any]] = {spec: aligned_specs[spec] for spec in common_specs}
+    spec_labels = {spec: spec_label(spec) for spec in all_specs}
 
     return {
         "products": products_data,
         "common_specs": common_specs,
         "comparison_matrix": comparison_matrix,
+        "aligned_specs": aligned_specs,
+        "spec_labels": spec_labels,
         "generated_at": datetime.utcnow().isoformat(),
     }
 
 
+def _parse_product_ids(ids: str) -> List[int]:
+    try:
+        return [int(pid) for pid in ids.split(',') if pid.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of product IDs")
+
+
+async def _get_comparison(db: AsyncSession, product_ids: List[int]) -> Dict[str, Any]:
+    """
+    Comparison for a product set, cached under its canonical (sorted, de-duplicated) id key.
+    A cached entry is reused only while no product, price or vote in the set has changed since.
+
+    Returns the cache envelope: {"version", "etag", "comparison"}; only "comparison" is sent.
+    """
+    canonical_ids = sorted(set(product_ids))
+    cache_key = f"compare:{','.join(str(pid) for pid in canonical_ids)}"
+    version = await _get_comparison_version(db, canonical_ids)
+
+    cached = await cache_service.get(cache_key)
+    if cached is not None and cached.get("version") == version and "comparison" in cached:
+        return cached
+
+    entry = {
+        "version": version,
+        "etag": '"' + hashlib.md5(f"{cache_key}:{version}".encode()).hexdigest() + '"',
+        "comparison": await _build_comparison(db, canonical_ids),
+    }
+    await cache_service.set(cache_key, entry, COMPARE_CACHE_TTL)
+    return entry
+
+
+def _validate_product_ids(product_ids: List[int]) -> None:
+    if not product_ids:
+        raise HTTPException(status_code=400, detail="Provide at least one product ID")
+    if len(set(product_ids)) > MAX_COMPARE_PRODUCTS:
+        raise HTTPException(status_code=400, detail=f"Compare at most {MAX_COMPARE_PRODUCTS} products")
+
+
+@router.get("")
+async def compare_products_get(
+    request: Request,
+    response: Response,
+    ids: str = Query(..., description="Comma-separated product IDs"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Cacheable comparison; the same product set in any order shares one cache entry and ETag"""
+    product_ids = _parse_product_ids(ids)
+    _validate_product_ids(product_ids)
+
+    entry = await _get_comparison(db, product_ids)
+
+    headers = {"Cache-Control": COMPARE_CACHE_CONTROL, "ETag": entry["etag"]}
+    if request.headers.get("if-none-match") == entry["etag"]:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return entry["comparison"]
+
+
+@router.post("")
+async def compare_products(
+    product_ids: List[int] = Body(..., embed=False), db: AsyncSession = Depends(get_db)
+):
+    _validate_product_ids(product_ids)
+
+    return (await _get_comparison(db, product_ids))["comparison"]
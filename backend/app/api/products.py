@@ -1,21 +1,35 @@
 from __future__ import annotations
 
+import asyncio
+import operator as op
+from datetime import datetime
 from decimal import Decimal
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import asc, desc, func, select, case
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, joinedload
 
-from ..database import get_db
-from ..models import AffiliateStore, Product, ProductPrice
+from ..database import get_db, get_read_db, session_factory_for
+from ..models import AffiliateStore, Product, ProductPrice, ProductSpec
+from ..services.cache_service import cache_service
 from ..services.enhanced_affiliate_service import EnhancedAffiliateService
+from ..services.spec_index import parse_spec_filter
+from ..services.trending_service import trending_service
 from ..utils.vote_utils import get_multiple_products_vote_stats, get_product_vote_stats
 
 
 router = APIRouter(prefix="/products", tags=["products"])
 
+# Product page bundle caching
+PRODUCT_PAGE_CACHE_TTL = 300  # 5 minutes
+PRODUCT_PAGE_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+
+SPEC_FILTER_OPERATORS = {
+    ">=": op.ge, "<=": op.le, ">": op.gt, "<": op.lt, "=": op.eq, "!=": op.ne,
+}
+
 
 def _extract_image_urls(images_dict: Dict[str, Any]) -> List[str]:
     """
@@ -113,6 +127,59 @@ def get_clean_content(content: Dict[str, Any]) -> Dict[str, Any]:
     return result
 
 
+def _build_product_detail(product: Product, vote_stats: Dict[str, int]) -> Dict[str, Any]:
+    """Serialize a product (with brand, category and prices loaded) for the product detail views"""
+    prices = [
+        {
+            "store": {
+                "id": pr.store.id,
+                "name": pr.store.name,
+                "logo_url": pr.store.logo_url,
+                "website_url": pr.store.website_url,
+            },
+            "price": float(pr.price),
+            "currency": pr.currency,
+            "affiliate_url": pr.affiliate_url,
+            "last_checked": pr.last_checked.isoformat(),
+        }
+        for pr in sorted(product.prices, key=lambda x: (x.price or Decimal("0")))
+        if pr.is_available
+    ]
+
+    # Get clean content for display (no sensitive AI metadata) 
+    clean_content = get_clean_content(product.content or {})
+    
+    # Extract thomann URL for affiliate buttons
+    thomann_info = None
+    if product.content and product.content.get('store_links', {}).get('Thomann'):
+        thomann_info = {
+            "has_direct_url": True,
+            "url": product.content['store_links']['Thomann']
+        }
+
+    return {
+        "id": product.id,
+        "sku": product.sku,
+        "name": product.name,
+        "slug": product.slug,
+        "brand": {"id": product.brand.id, "name": product.brand.name, "slug": product.brand.slug},
+        "category": {
+            "id": product.category.id,
+            "name": product.category.name,
+            "slug": product.category.slug,
+        },
+        "description": product.description,
+        "images": _extract_image_urls(product.images) if product.images else [],
+        "msrp_price": float(product.msrp_price) if product.msrp_price is not None else None,
+        "avg_rating": float(product.avg_rating) if product.avg_rating is not None else 0.0,
+        "review_count": product.review_count,
+        "vote_stats": vote_stats,
+        "content": clean_content,
+        "thomann_info": thomann_info,
+        "prices": prices,
+    }
+
+
 @router.get("")
 async def search_products(
     q: Optional[str] = Query(None, alias="query"),
@@ -125,9 +192,10 @@ async def search_products(
     price_min: Optional[float] = Query(None),
     price_max: Optional[float] = Query(None),
     sort_by: str = Query("name"),
+    spec: Optional[List[str]] = Query(None, description='Spec filters like "frets>=24" or "weight<3kg" (repeatable)'),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     # Handle parameter aliases
     search_query = q or query
@@ -163,6 +231,25 @@ async def search_products(
         if slug_list:
             base_stmt = base_stmt.where(Product.slug.in_(slug_list))
 
+    if spec:
+        # Spec filters run against the normalized product_specs index (key, numeric_value)
+        for expression in spec:
+            try:
+                spec_key, operator, value = parse_spec_filter(expression)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            conditions = [ProductSpec.spec_key == spec_key]
+            if isinstance(value, str):
+                # Text values are only indexed for non-numeric specs (ix_product_specs_key_lower_text is partial)
+                conditions += [
+                    ProductSpec.numeric_value.is_(None),
+                    SPEC_FILTER_OPERATORS[operator](func.lower(ProductSpec.value_text), value.lower()),
+                ]
+            else:
+                conditions.append(SPEC_FILTER_OPERATORS[operator](ProductSpec.numeric_value, value))
+            spec_subq = select(ProductSpec.product_id).where(*conditions)
+            base_stmt = base_stmt.where(Product.id.in_(spec_subq))
+
     # Price filtering removed - not using best price functionality
 
     # Sorting
@@ -294,8 +381,9 @@ async def search_products(
                 "price_min": min_price_filter,
                 "price_max": max_price_filter,
                 "sort_by": sort_by,
+                "spec": spec,
             }.items()
-            if v not in (None, "")
+            if v not in (None, "", [])
         },
     }
 
@@ -308,7 +396,7 @@ async def search_products(
 async def get_product(
     product_id: int, 
     user_region: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get product by ID with affiliate stores following brand exclusivity and regional rules"""
     stmt = (
@@ -321,67 +409,13 @@ async def get_product(
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
-    # Build response
-    prices = [
-        {
-            "store": {
-                "id": pr.store.id,
-                "name": pr.store.name,
-                "logo_url": pr.store.logo_url,
-                "website_url": pr.store.website_url,
-            },
-            "price": float(pr.price),
-            "currency": pr.currency,
-            "affiliate_url": pr.affiliate_url,
-            "last_checked": pr.last_checked.isoformat(),
-        }
-        for pr in sorted(product.prices, key=lambda x: (x.price or Decimal("0")))
-        if pr.is_available
-    ]
     # Best price functionality removed
+    # Affiliate stores are served by /products/{id}/affiliate-urls (materialized lookup)
 
-    # Get affiliate stores using enhanced service with brand exclusivity rules
-    affiliate_service = EnhancedAffiliateService(db)
-    affiliate_stores = await affiliate_service.get_affiliate_stores_for_product(
-        product=product,
-        user_region=user_region
-    )
-
-    # Get clean content for display (no sensitive AI metadata) 
-    clean_content = get_clean_content(product.content or {})
-    
-    # Extract thomann URL for affiliate buttons
-    thomann_info = None
-    if product.content and product.content.get('store_links', {}).get('Thomann'):
-        thomann_info = {
-            "has_direct_url": True,
-            "url": product.content['store_links']['Thomann']
-        }
-    
     # Get vote statistics
     vote_stats = await get_product_vote_stats(db, product_id)
 
-    return {
-        "id": product.id,
-        "sku": product.sku,
-        "name": product.name,
-        "slug": product.slug,
-        "brand": {"id": product.brand.id, "name": product.brand.name, "slug": product.brand.slug},
-        "category": {
-            "id": product.category.id,
-            "name": product.category.name,
-            "slug": product.category.slug,
-        },
-        "description": product.description,
-        "images": _extract_image_urls(product.images) if product.images else [],
-        "msrp_price": float(product.msrp_price) if product.msrp_price is not None else None,
-        "avg_rating": float(product.avg_rating) if product.avg_rating is not None else 0.0,
-        "review_count": product.review_count,
-        "vote_stats": vote_stats,
-        "content": clean_content,
-        "thomann_info": thomann_info,
-        "prices": prices,
-    }
+    return _build_product_detail(product, vote_stats)
 
 
 @router.post("/{product_id}/affiliate-stores")
@@ -425,7 +459,7 @@ async def get_product_affiliate_stores_with_links(
 async def get_product_affiliate_urls(
     product_id: int,
     user_region: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get affiliate URLs for a product in all available stores"""
     
@@ -437,19 +471,13 @@ async def get_product_affiliate_urls(
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    # Build store links from product content (same logic as /affiliate-stores endpoint)
-    store_links = {}
-    if product.content and 'store_links' in product.content:
-        for store_name, url in product.content['store_links'].items():
-            if isinstance(url, str) and url:
-                store_links[store_name.lower()] = {'product_url': url}
-    
-    # Get affiliate stores for this product using enhanced service
+    # Store links come from product content; affiliate URLs are looked up in
+    # product_affiliate_urls instead of being rebuilt on every request
     affiliate_service = EnhancedAffiliateService(db)
     affiliate_stores = await affiliate_service.get_affiliate_stores_for_product(
         product=product,
         user_region=user_region,
-        store_links=store_links
+        use_materialized=True
     )
     
     return {
@@ -460,5 +488,108 @@ async def get_product_affiliate_urls(
     }
 
 
+def _build_product_summary(product: Product) -> Dict[str, Any]:
+    """Compact product card used for related products"""
+    return {
+        "id": product.id,
+        "name": product.name,
+        "slug": product.slug,
+        "brand": {"id": product.brand.id, "name": product.brand.name, "slug": product.brand.slug},
+        "category": {"id": product.category.id, "name": product.category.name, "slug": product.category.slug},
+        "images": _extract_image_urls(product.images) if product.images else [],
+        "msrp_price": float(product.msrp_price) if product.msrp_price is not None else None,
+        "avg_rating": float(product.avg_rating) if product.avg_rating is not None else 0.0,
+        "review_count": product.review_count,
+    }
+
+
+async def _with_session(session_factory, loader, *args):
+    """Run loader(session, *args) on its own session so independent reads can run concurrently"""
+    async with session_factory() as session:
+        return await loader(session, *args)
+
+
+async def _load_affiliate_stores(db: AsyncSession, product: Product, user_region: Optional[str]) -> List[Dict]:
+    affiliate_service = EnhancedAffiliateService(db)
+    return await affiliate_service.get_affiliate_stores_for_product(
+        product=product,
+        user_region=user_region,
+        use_materialized=True
+    )
+
+
+async def _load_compared_with(db: AsyncSession, product_id: int) -> List[Dict[str, Any]]:
+    return await trending_service.get_compared_with(product_id, db=db)
+
+
+async def _load_related_products(db: AsyncSession, product: Product, limit: int) -> List[Dict[str, Any]]:
+    if limit <= 0:
+        return []
+    stmt = (
+        select(Product)
+        .options(joinedload(Product.brand), joinedload(Product.category))
+        .where(
+            Product.category_id == product.category_id,
+            Product.id != product.id,
+            Product.is_active.is_(True),
+        )
+        .order_by(desc(Product.avg_rating).nullslast(), desc(Product.review_count), asc(Product.name))
+        .limit(limit)
+    )
+    result = await db.execute(stmt)
+    return [_build_product_summary(p) for p in result.scalars().unique().all()]
+
+
+@router.get("/{slug}/page")
+async def get_product_page(
+    slug: str,
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    user_region: Optional[str] = None,
+    related_limit: int = Query(8, ge=0, le=20),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Everything the product page needs in one request: product with clean content, affiliate
+    stores, vote stats, compared-with and related products. Independent reads run concurrently
+    on separate sessions and the assembled payload is cached.
+    """
+    cache_key = f"product_page:{slug}:{user_region or 'all'}:{related_limit}"
+    page = await cache_service.get(cache_key)
+
+    if page is None:
+        stmt = (
+            select(Product)
+            .options(selectinload(Product.brand), selectinload(Product.category), selectinload(Product.prices).selectinload(ProductPrice.store))
+            .where(Product.slug == slug, Product.is_active.is_(True))
+        )
+        result = await db.execute(stmt)
+        product: Product | None = result.scalars().unique().first()
+        if not product:
+            raise HTTPException(status_code=404, detail="Product not found")
+
+        session_factory = session_factory_for(request)
+        affiliate_stores, vote_stats, compared_with, related_products = await asyncio.gather(
+            _with_session(session_factory, _load_affiliate_stores, product, user_region),
+            _with_session(session_factory, get_product_vote_stats, product.id),
+            _with_session(session_factory, _load_compared_with, product.id),
+            _with_session(session_factory, _load_related_products, product, related_limit),
+        )
+
+        page = {
+            "product": _build_product_detail(product, vote_stats),
+            "affiliate_stores": affiliate_stores,
+            "compared_with": compared_with,
+            "related_products": related_products,
+            "user_region": user_region,
+            "generated_at": datetime.utcnow().isoformat(),
+        }
+        await cache_service.set(cache_key, page, PRODUCT_PAGE_CACHE_TTL)
 
+    # Count the view after the response is sent (replaces the separate tracking call)
+    client_ip = request.client.host if request.client else None
+    background_tasks.add_task(trending_service.track_product_view, page["product"]["id"], client_ip)
 
+    response.headers["Cache-Control"] = PRODUCT_PAGE_CACHE_CONTROL
+    return page
@@ -5,7 +5,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import RedirectResponse
 
-from ..database import get_db
+from ..database import get_read_db
 from ..models import ProductPrice
 from ..services.affiliate_manager import AffiliateManager
 
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/redirect", tags=["affiliate"])
 
 
 @router.get("/{product_id}/{store_id}")
-async def redirect_affiliate(product_id: int, store_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+async def redirect_affiliate(product_id: int, store_id: int, request: Request, db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(
         select(ProductPrice).where(
             ProductPrice.product_id == product_id,
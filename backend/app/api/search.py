@@ -5,7 +5,7 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
+from ..database import get_read_db
 from ..services.search_service import search_service
 
 router = APIRouter(prefix="/search", tags=["search"])
@@ -15,7 +15,7 @@ router = APIRouter(prefix="/search", tags=["search"])
 async def search_autocomplete(
     q: str = Query(..., min_length=2, max_length=100),
     limit: int = Query(8, ge=1, le=20),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get autocomplete suggestions for product search
@@ -35,7 +35,7 @@ async def search_autocomplete(
 async def get_search_suggestions(
     q: str = Query(..., min_length=2, max_length=100),
     limit: int = Query(5, ge=1, le=10),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get search term suggestions
@@ -5,7 +5,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
+from ..database import get_read_db
 from ..services.trending_service import trending_service
 
 router = APIRouter(prefix="/trending", tags=["trending"])
@@ -15,7 +15,7 @@ router = APIRouter(prefix="/trending", tags=["trending"])
 async def get_trending_instruments(
     limit: int = Query(10, ge=1, le=50),
     category_id: Optional[int] = Query(None),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get trending musical instruments based on views and comparisons
@@ -38,7 +38,7 @@ async def get_trending_instruments(
 @router.get("/comparisons") 
 async def get_popular_comparisons(
     limit: int = Query(10, ge=1, le=20),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get most popular instrument comparisons
@@ -58,7 +58,7 @@ async def get_popular_comparisons(
 
 @router.get("/by-category")
 async def get_trending_by_category(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get trending instruments grouped by category
@@ -5,7 +5,7 @@ Admin-only API endpoints
 from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 from fastapi.responses import HTMLResponse
 from datetime import datetime, timedelta
@@ -13,13 +13,16 @@ import logging
 import json
 
 from app.database import get_db
+from app.slow_queries import slow_query_log, statement_budget
 from app.middleware.azure_auth import require_azure_admin, get_azure_user, azure_auth
 from app.blog_ai_schemas import (
     BlogGenerationTemplate, BlogGenerationTemplateCreate, BlogGenerationRequest,
     BlogGenerationResult, AIBlogPost, BlogGenerationHistory, EnhancedBlogPostProduct,
     BlogContentSection, CloneRewriteRequest
 )
-from app.services.simple_blog_generator import SimpleBlogGenerator
+from app.services.blog_generation_jobs import cancel_job, enqueue_job, get_job, job_status, list_jobs
+from app.services.blog_post_renderer import BlogPostRenderer
+from app.services.content_stats import load_content_stats, load_counter
 
 logger = logging.getLogger(__name__)
 
@@ -92,42 +95,22 @@ async def get_admin_stats(
 ):
     """Get admin dashboard statistics"""
     try:
-        # Blog post statistics - simplified structure
-        blog_stats_query = """
-        SELECT 
-            COUNT(*) as total_posts,
-            COUNT(*) FILTER (WHERE status = 'published') as published_posts,
-            COUNT(*) FILTER (WHERE generated_by_ai = true) as ai_generated_posts,
-            0 as total_views,  -- view_count column doesn't exist in simplified table
-            COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '7 days') as posts_last_week,
-            COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '30 days') as posts_last_month
-        FROM blog_posts
-        """
-        
-        result = await db.execute(text(blog_stats_query))
-        blog_stats = result.fetchone()
-        
-        # Generation statistics - simplified (no generation history table)
-        gen_stats_query = """
-        SELECT 
-            COUNT(*) FILTER (WHERE generated_by_ai = true) as total_generations,
-            COUNT(*) FILTER (WHERE generated_by_ai = true AND status = 'published') as successful_generations,
-            0 as failed_generations,  -- No failure tracking in simplified structure
-            0 as total_tokens_used,   -- No token tracking in simplified structure
-            0 as avg_generation_time  -- No timing tracking in simplified structure
-        FROM blog_posts
-        WHERE created_at >= NOW() - INTERVAL '30 days'
-        """
-        
-        result = await db.execute(text(gen_stats_query))
-        gen_stats = result.fetchone()
-        
-        # Top performing posts - simplified (no view_count tracking)
+        # Counts come from content_stats (trigger-maintained, migration 021): a few
+        # dozen rows however many posts exist
+        blog_stats = await load_content_stats(db, "blog_posts")
+        total_views = await load_counter(db, "blog_views")
+
+        # AI generations over the last 30 days; "successful" ones got published
+        generations = blog_stats.count("last_month", ai_generated=True)
+        successful_generations = blog_stats.count("last_month", status="published", ai_generated=True)
+
+        # Top performing posts by flushed view counts (walks ix_blog_post_stats_view_count)
         top_posts_query = """
-        SELECT title, slug, 0 as view_count, generated_by_ai
-        FROM blog_posts 
-        WHERE status = 'published'
-        ORDER BY published_at DESC
+        SELECT bp.title, bp.slug, s.view_count, bp.generated_by_ai
+        FROM blog_post_stats s
+        JOIN blog_posts bp ON bp.id = s.post_id
+        WHERE bp.status = 'published'
+        ORDER BY s.view_count DESC
         LIMIT 5
         """
         
@@ -136,20 +119,20 @@ async def get_admin_stats(
         
         return {
             "blog": {
-                "total_posts": blog_stats[0] or 0,
-                "published_posts": blog_stats[1] or 0,
-                "ai_generated_posts": blog_stats[2] or 0,
-                "total_views": blog_stats[3] or 0,
-                "posts_last_week": blog_stats[4] or 0,
-                "posts_last_month": blog_stats[5] or 0
+                "total_posts": blog_stats.count(),
+                "published_posts": blog_stats.count(status="published"),
+                "ai_generated_posts": blog_stats.count(ai_generated=True),
+                "total_views": total_views,
+                "posts_last_week": blog_stats.count("last_week"),
+                "posts_last_month": blog_stats.count("last_month")
             },
             "ai_generation": {
-                "total_generations": gen_stats[0] or 0,
-                "successful_generations": gen_stats[1] or 0,
-                "failed_generations": gen_stats[2] or 0,
-                "total_tokens_used": gen_stats[3] or 0,
-                "avg_generation_time_ms": int(gen_stats[4] or 0),
-                "success_rate": round((gen_stats[1] or 0) / max(gen_stats[0] or 1, 1) * 100, 1)
+                "total_generations": generations,
+                "successful_generations": successful_generations,
+                "failed_generations": 0,  # No failure tracking in simplified structure
+                "total_tokens_used": 0,   # No token tracking in simplified structure
+                "avg_generation_time_ms": 0,  # No timing tracking in simplified structure
+                "success_rate": round(successful_generations / max(generations, 1) * 100, 1)
             },
             "top_posts": top_posts,
             "last_updated": datetime.utcnow().isoformat()
@@ -187,12 +170,11 @@ async def get_admin_blog_posts(
             params['ai_generated'] = ai_generated
         
         if category:
-            where_clauses.append("COALESCE(bp.content_json->>'category', 'general') = :category")
+            where_clauses.append("bp.category_slug = :category")
             params['category'] = category
         
         if content_type:
-            # In simplified structure, use content_json->>'category' where possible
-            # Map UI values to category slugs used in content_json
+            # Map UI values to the category slugs stored in blog_posts.category_slug
             slug_map = {
                 'review': 'review',
                 'buying_guide': 'buying-guide',
@@ -206,7 +188,7 @@ async def get_admin_blog_posts(
             }
             mapped = slug_map.get(content_type)
             if mapped:
-                where_clauses.append("COALESCE(bp.content_json->>'category', 'general') = :content_category")
+                where_clauses.append("bp.category_slug = :content_category")
                 params['content_category'] = mapped
         
         if search:
@@ -243,11 +225,12 @@ async def get_admin_blog_posts(
                 THEN jsonb_array_length(bp.content_json->'tags')
                 ELSE 0 
             END as tag_count,
-            -- Calculate reading_time and view_count defaults
+            -- Calculate reading_time default; views come from blog_post_stats
             COALESCE((bp.content_json->>'word_count')::int / 200, 5) as reading_time,
-            0 as view_count,
+            COALESCE(s.view_count, 0) as view_count,
             false as featured
         FROM blog_posts bp
+        LEFT JOIN blog_post_stats s ON s.post_id = bp.id
         {where_clause}
         ORDER BY bp.created_at DESC
         LIMIT :limit OFFSET :offset
@@ -380,6 +363,29 @@ class PublishBatchRequest(BaseModel):
     ids: List[int] = Field(default_factory=list)
     strategy: str = Field(default="now", pattern="^(now|backfill)$")
     backfill_days: Optional[int] = Field(default=None, ge=1, le=90)
+    dry_run: bool = False
+
+
+async def _apply_blog_batch(
+    db: AsyncSession, statement: str, params: Dict[str, Any], ids: List[int], dry_run: bool
+) -> List[Dict[str, Any]]:
+    """
+    Run one set-based UPDATE ... RETURNING over the given post ids. If any id does not
+    exist nothing is changed (404); on dry_run the rows that would change are returned
+    and the transaction is rolled back.
+    """
+    result = await db.execute(text(statement), params)
+    rows = [dict(row._mapping) for row in result.fetchall()]
+    updated = {row["id"] for row in rows}
+    missing = [i for i in ids if i not in updated]
+    if missing or dry_run:
+        await db.rollback()
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Posts not found: {missing}")
+        return rows
+    await db.commit()
+    await BlogPostRenderer(db).invalidate(row["slug"] for row in rows)
+    return rows
 
 
 @router.post("/blog/posts/publish-batch")
@@ -388,7 +394,7 @@ async def publish_blog_posts_batch(
     admin: dict = Depends(require_azure_admin),
     db: AsyncSession = Depends(get_db)
 ):
-    """Publish multiple posts at once. Strategy:
+    """Publish multiple posts at once (one statement however many ids). Strategy:
     - now: set status=published and published_at=now for all ids
     - backfill: distribute published_at randomly over the past N days
     """
@@ -396,45 +402,37 @@ async def publish_blog_posts_batch(
         if not payload.ids:
             raise HTTPException(status_code=400, detail="No IDs provided")
 
-        # Ensure IDs exist
-        result = await db.execute(
-            text("SELECT id FROM blog_posts WHERE id = ANY(:ids)"),
-            {"ids": payload.ids},
-        )
-        existing_ids = {row[0] for row in result.fetchall()}
-        missing = [i for i in payload.ids if i not in existing_ids]
-        if missing:
-            raise HTTPException(status_code=404, detail=f"Posts not found: {missing}")
-
-        updates = []
+        ids = list(dict.fromkeys(payload.ids))
         if payload.strategy == "now":
             pub_at = datetime.utcnow()
-            for pid in payload.ids:
-                updates.append({"id": pid, "published_at": pub_at})
+            published_ats = [pub_at] * len(ids)
         else:
             # backfill
             from random import randint, choice
             now = datetime.utcnow()
             days = max(1, int(payload.backfill_days or 7))
-            for pid in payload.ids:
+            published_ats = []
+            for _ in ids:
                 delta_days = randint(0, days)
                 dt = now - timedelta(days=delta_days)
                 hour = randint(9, 21)
                 minute = choice([0, 15, 30, 45])
-                dt = dt.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                updates.append({"id": pid, "published_at": dt})
-
-        # Apply updates
-        for u in updates:
-            await db.execute(
-                text(
-                    "UPDATE blog_posts SET status = 'published', published_at = :published_at WHERE id = :id"
-                ),
-                {"published_at": u["published_at"], "id": u["id"]},
-            )
-        await db.commit()
-
-        return {"updated": len(updates), "ids": [u["id"] for u in updates]}
+                published_ats.append(dt.replace(hour=hour, minute=minute, second=0, microsecond=0))
+
+        rows = await _apply_blog_batch(
+            db,
+            """
+            UPDATE blog_posts bp
+            SET status = 'published', published_at = v.published_at
+            FROM unnest(CAST(:ids AS integer[]), CAST(:published_ats AS timestamp[])) AS v(id, published_at)
+            WHERE bp.id = v.id
+            RETURNING bp.id, bp.slug, bp.status, bp.published_at
+            """,
+            {"ids": ids, "published_ats": published_ats},
+            ids,
+            payload.dry_run,
+        )
+        return {"updated": len(rows), "ids": [row["id"] for row in rows], "posts": rows, "dry_run": payload.dry_run}
     
     except HTTPException:
         raise
@@ -448,6 +446,7 @@ class StatusBatchRequest(BaseModel):
     ids: List[int] = Field(default_factory=list)
     status: str = Field(..., pattern=r"^(draft|archived)$")
     all: bool = False
+    dry_run: bool = False
 
 
 @router.post("/blog/posts/status-batch")
@@ -461,45 +460,39 @@ async def set_status_blog_posts_batch(
         if not payload.ids and not payload.all:
             raise HTTPException(status_code=400, detail="No IDs provided and 'all' flag not set")
 
+        set_clause = (
+            "SET status = :status, "
+            "    published_at = CASE WHEN CAST(:status AS VARCHAR)='draft' THEN NULL ELSE published_at END "
+        )
         if payload.all:
             # Update all posts
             result = await db.execute(
-                text(
-                    "UPDATE blog_posts "
-                    "SET status = :status, "
-                    "    published_at = CASE WHEN CAST(:status AS VARCHAR)='draft' THEN NULL ELSE published_at END "
-                    "RETURNING id"
-                ),
+                text("UPDATE blog_posts " + set_clause + "RETURNING id, slug, status, published_at"),
                 {"status": payload.status},
             )
-            updated_ids = [row[0] for row in result.fetchall()]
-            await db.commit()
-            return {"updated": len(updated_ids), "status": payload.status, "ids": updated_ids, "all": True}
-
-        # Validate IDs exist
-        result = await db.execute(
-            text("SELECT id FROM blog_posts WHERE id = ANY(:ids)"),
-            {"ids": payload.ids},
-        )
-        existing_ids = {row[0] for row in result.fetchall()}
-        missing = [i for i in payload.ids if i not in existing_ids]
-        if missing:
-            raise HTTPException(status_code=404, detail=f"Posts not found: {missing}")
+            rows = [dict(row._mapping) for row in result.fetchall()]
+            if payload.dry_run:
+                await db.rollback()
+            else:
+                await db.commit()
+                await BlogPostRenderer(db).refresh_all()
+            return {
+                "updated": len(rows), "status": payload.status, "ids": [row["id"] for row in rows],
+                "posts": rows, "all": True, "dry_run": payload.dry_run,
+            }
 
-        # Update selected posts in a single statement
-        result = await db.execute(
-            text(
-                "UPDATE blog_posts "
-                "SET status = :status, "
-                "    published_at = CASE WHEN CAST(:status AS VARCHAR)='draft' THEN NULL ELSE published_at END "
-                "WHERE id = ANY(:ids) "
-                "RETURNING id"
-            ),
-            {"status": payload.status, "ids": payload.ids},
+        ids = list(dict.fromkeys(payload.ids))
+        rows = await _apply_blog_batch(
+            db,
+            "UPDATE blog_posts " + set_clause + "WHERE id = ANY(:ids) RETURNING id, slug, status, published_at",
+            {"status": payload.status, "ids": ids},
+            ids,
+            payload.dry_run,
         )
-        updated_ids = [row[0] for row in result.fetchall()]
-        await db.commit()
-        return {"updated": len(updated_ids), "status": payload.status, "ids": updated_ids}
+        return {
+            "updated": len(rows), "status": payload.status, "ids": [row["id"] for row in rows],
+            "posts": rows, "dry_run": payload.dry_run,
+        }
 
     except HTTPException:
         raise
@@ -512,6 +505,7 @@ async def set_status_blog_posts_batch(
 class SeoBatchRequest(BaseModel):
     ids: List[int] = Field(default_factory=list)
     noindex: bool = False
+    dry_run: bool = False
 
 
 @router.post("/blog/posts/seo-batch")
@@ -525,22 +519,18 @@ async def set_seo_flags_blog_posts_batch(
         if not payload.ids:
             raise HTTPException(status_code=400, detail="No IDs provided")
 
-        result = await db.execute(
-            text("SELECT id FROM blog_posts WHERE id = ANY(:ids)"),
-            {"ids": payload.ids},
+        ids = list(dict.fromkeys(payload.ids))
+        rows = await _apply_blog_batch(
+            db,
+            "UPDATE blog_posts SET noindex = :noindex WHERE id = ANY(:ids) RETURNING id, slug, noindex",
+            {"noindex": payload.noindex, "ids": ids},
+            ids,
+            payload.dry_run,
         )
-        existing_ids = {row[0] for row in result.fetchall()}
-        missing = [i for i in payload.ids if i not in existing_ids]
-        if missing:
-            raise HTTPException(status_code=404, detail=f"Posts not found: {missing}")
-
-        for pid in payload.ids:
-            await db.execute(
-                text("UPDATE blog_posts SET noindex = :noindex WHERE id = :id"),
-                {"noindex": payload.noindex, "id": pid},
-            )
-        await db.commit()
-        return {"updated": len(payload.ids), "noindex": payload.noindex, "ids": payload.ids}
+        return {
+            "updated": len(rows), "noindex": payload.noindex, "ids": [row["id"] for row in rows],
+            "posts": rows, "dry_run": payload.dry_run,
+        }
     
     except HTTPException:
         raise
@@ -550,104 +540,100 @@ async def set_seo_flags_blog_posts_batch(
 
 # === AI GENERATION ===
 
-@router.post("/blog/generate")
+@router.post("/blog/generate", status_code=202)
 async def generate_ai_blog_post(
     request: BlogGenerationRequest,
     admin: dict = Depends(require_azure_admin),
     db: AsyncSession = Depends(get_db)
 ):
-    """Generate a blog post using AI (admin only)"""
+    """Queue AI generation of a blog post (admin only); poll /blog/jobs/{job_id} for the outcome"""
+    if not request.title:
+        raise HTTPException(status_code=400, detail="title is required (it is the generation topic)")
     try:
-        # Get OpenAI API key
-        import os
-        openai_api_key = os.getenv('OPENAI_API_KEY')
-        if not openai_api_key:
-            raise HTTPException(status_code=500, detail="OpenAI API key not configured")
-        
-        # Initialize AI generator
-        import openai
-        openai_client = openai.AsyncClient(api_key=openai_api_key)
-        ai_generator = SimpleBlogGenerator(openai_client)
-        
-        # Generate blog post
-        blog_content = ai_generator.generate_blog_post(
-            topic=request.topic,
-            template_name=getattr(request, 'template_name', 'buying-guide'),
-            products=getattr(request, 'products', []),
-            target_words=getattr(request, 'target_words', 4000)
-        )
-        
-        # Save to database using simplified structure
-        from sqlalchemy import text
-        import json
-        insert_query = """
-        INSERT INTO blog_posts (title, slug, excerpt, seo_title, seo_description, content_json, 
-                               author_name, category, tags, featured_products, published_at, created_at, updated_at)
-        VALUES (:title, :slug, :excerpt, :seo_title, :seo_description, :content_json, 
-                :author_name, :category, :tags, :featured_products, NOW(), NOW(), NOW())
-        RETURNING id
-        """
-        
-        # Generate slug from title
-        import re
-        slug = re.sub(r'[^a-zA-Z0-9\s-]', '', blog_content['title'].lower())
-        slug = re.sub(r'\s+', '-', slug).strip('-')
-        
-        values = {
-            'title': blog_content['title'],
-            'slug': slug,
-            'excerpt': blog_content.get('excerpt', ''),
-            'seo_title': blog_content.get('seo_title', blog_content['title']),
-            'seo_description': blog_content.get('seo_description', ''),
-            'content_json': json.dumps(blog_content),
-            'author_name': 'GetYourMusicGear Team',
-            'category': blog_content.get('category', 'general'),
-            'tags': json.dumps(blog_content.get('tags', [])),
-            'featured_products': json.dumps(blog_content.get('featured_products', []))
-        }
-        
-        result = await db.execute(text(insert_query), values)
-        blog_post_id = result.fetchone()[0]
+        job = await enqueue_job(db, "generate", request.model_dump(mode="json"), admin.get('email'))
         await db.commit()
-        
-        logger.info(f"AI blog post generated by admin {admin['email']}: post_id={blog_post_id}")
-        
-        # Return result in expected format
-        from app.blog_ai_schemas import BlogGenerationResult
-        return BlogGenerationResult(
-            success=True,
-            blog_post_id=blog_post_id,
-            title=blog_content['title'],
-            slug=slug,
-            content=blog_content,
-            error_message=None
-        )
-        
-    except HTTPException:
-        raise
+        logger.info(f"AI generation job {job['id']} queued by admin {admin.get('email')}")
+        return job_status(job)
     except Exception as e:
-        logger.error(f"Failed to generate blog post: {e}")
-        raise HTTPException(status_code=500, detail="Failed to generate blog post")
+        await db.rollback()
+        logger.error(f"Failed to queue blog generation: {e}")
+        raise HTTPException(status_code=500, detail="Failed to queue blog generation")
 
-@router.post("/blog/clone-rewrite")
+@router.post("/blog/clone-rewrite", status_code=202)
 async def clone_and_rewrite_blog_post(
     request: CloneRewriteRequest,
     admin: dict = Depends(require_azure_admin),
     db: AsyncSession = Depends(get_db)
 ):
-    """Clone content from a source URL and rewrite it with AI (admin only)"""
+    """Queue cloning content from a source URL and rewriting it with AI (admin only)"""
     try:
-        import os
-        openai_api_key = os.getenv('OPENAI_API_KEY')
-        if not openai_api_key:
-            raise HTTPException(status_code=500, detail="OPENAI_API_KEY not configured")
-        # TODO: Implement clone_and_rewrite functionality for SimpleBlogGenerator
-        raise HTTPException(status_code=501, detail="Clone and rewrite functionality temporarily unavailable - use the simplified blog system instead")
-    except HTTPException:
-        raise
+        job = await enqueue_job(db, "clone_rewrite", request.model_dump(mode="json"), admin.get('email'))
+        await db.commit()
+        logger.info(f"Clone & rewrite job {job['id']} queued by admin {admin.get('email')}: {request.source_url}")
+        return job_status(job)
     except Exception as e:
-        logger.error(f"Failed to clone & rewrite blog post: {e}")
-        raise HTTPException(status_code=500, detail="Failed to clone & rewrite blog post")
+        await db.rollback()
+        logger.error(f"Failed to queue clone & rewrite: {e}")
+        raise HTTPException(status_code=500, detail="Failed to queue clone & rewrite")
+
+@router.get("/blog/jobs")
+async def get_generation_jobs(
+    status: Optional[str] = Query(None, pattern="^(pending|running|completed|failed|cancelled)$"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    admin: dict = Depends(require_azure_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """List generation jobs, newest first"""
+    jobs = await list_jobs(db, status, limit, offset)
+    return {"jobs": jobs, "pagination": {"limit": limit, "offset": offset}}
+
+@router.get("/blog/jobs/{job_id}")
+async def get_generation_job(
+    job_id: int,
+    admin: dict = Depends(require_azure_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Status of one generation job"""
+    job = await get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_status(job)
+
+@router.get("/blog/jobs/{job_id}/result")
+async def get_generation_job_result(
+    job_id: int,
+    admin: dict = Depends(require_azure_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Generated post of a completed job (409 while the job has not completed)"""
+    job = await get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return BlogGenerationResult(
+        success=True,
+        blog_post_id=job["blog_post_id"],
+        generated_title=job["result"].get("title"),
+        generated_excerpt=job["result"]["content"].get("excerpt"),
+        seo_title=job["result"]["content"].get("seo_title"),
+        seo_description=job["result"]["content"].get("seo_description"),
+        structured_content=job["result"]["content"],
+    )
+
+@router.post("/blog/jobs/{job_id}/cancel")
+async def cancel_generation_job(
+    job_id: int,
+    admin: dict = Depends(require_azure_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Cancel a job that no worker has picked up yet"""
+    if not await cancel_job(db, job_id):
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Only pending jobs can be cancelled")
+    await db.commit()
+    return {"id": job_id, "status": "cancelled"}
 
 # Duplicate endpoint removed - using the main /blog/templates endpoint above
 
@@ -753,6 +739,17 @@ async def admin_system_health(
             "timestamp": datetime.utcnow().isoformat()
         }
 
+@router.get("/system/slow-queries")
+async def admin_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    admin: dict = Depends(require_azure_admin)
+):
+    """Slow statements recorded by this worker, grouped by shape with captured plans"""
+    return {
+        **slow_query_log.summary(limit=limit),
+        "statement_timeouts_ms": statement_budget.timeouts,
+    }
+
 # === BATCH GENERATION ===
 # Batch processing is now handled by the CLI system
 # Use: python3.11 blog_generator_cli.py generate --posts 50
@@ -851,6 +848,7 @@ async def update_admin_blog_post(
         q = f"UPDATE blog_posts SET {', '.join(fields)} WHERE id = :id"
         await db.execute(text(q), params)
         await db.commit()
+        await BlogPostRenderer(db).refresh_posts(post_ids=[post_id])
         return { 'id': post_id, 'updated': list(params.keys()) }
     except HTTPException:
         raise
@@ -2,29 +2,38 @@
 API endpoints for blog system
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 from pydantic import BaseModel, Field
 import logging
 import re
 import json
+import base64
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.api.dependencies import get_api_key, require_admin, optional_admin
 from app.blog_ai_schemas import (
     BlogGenerationTemplate, BlogGenerationTemplateCreate, BlogGenerationRequest,
     BlogGenerationResult, AIBlogPost, BlogGenerationHistory, EnhancedBlogPostProduct,
     BlogContentSection
 )
-from app.services.simple_blog_generator import SimpleBlogGenerator
+from app.services.blog_generation_jobs import enqueue_job, get_job, job_status
+from app.services.blog_post_renderer import BlogPostRenderer, BLOG_LISTING_CACHE_TTL, blog_listing_cache_key
+from app.services.cache_service import cache_service
+from app.services.blog_view_counter import blog_view_counter
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Browsers/CDN revalidate single posts with If-None-Match once this expires
+BLOG_POST_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+# Related lists only change when the similarity job runs
+BLOG_RELATED_CACHE_TTL = 900
+
 # Pydantic models
 class BlogCategory(BaseModel):
     id: int
@@ -103,6 +112,18 @@ class BlogPostSummary(BaseModel):
     class Config:
         from_attributes = True
 
+
+class RelatedBlogProduct(BaseModel):
+    id: int
+    name: str
+    slug: str
+    brand_name: Optional[str]
+    score: float
+
+class RelatedContent(BaseModel):
+    posts: List[BlogPostSummary] = []
+    products: List[RelatedBlogProduct] = []
+
 class BlogPostCreate(BaseModel):
     title: str = Field(..., max_length=255)
     slug: Optional[str] = None
@@ -125,6 +146,24 @@ def generate_slug(title: str) -> str:
     slug = re.sub(r'[\s_-]+', '-', slug)
     return slug.strip('-')
 
+def tag_slug(tag_name: str) -> str:
+    """Slug for a content_json tag; matches the blog_posts_listing_fields trigger"""
+    slug = re.sub(r'[^a-z0-9\s-]', '', tag_name.lower())
+    return re.sub(r'\s+', '-', slug).strip('-')
+
+def encode_listing_cursor(published_at: datetime, post_id: int) -> str:
+    """Opaque cursor for the listing row (published_at, id) a page ended on"""
+    raw = json.dumps([published_at.isoformat(), post_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_listing_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        published_at, post_id = json.loads(raw)
+        return datetime.fromisoformat(published_at), int(post_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 def estimate_reading_time(content: str) -> int:
     """Estimate reading time in minutes (assuming 200 words per minute)"""
     word_count = len(content.split())
@@ -133,7 +172,7 @@ def estimate_reading_time(content: str) -> int:
 
 @router.get("/blog/categories", response_model=List[BlogCategory])
 async def get_blog_categories(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all blog categories"""
     
@@ -168,98 +207,113 @@ async def get_blog_categories(
 
 @router.get("/blog/posts", response_model=List[BlogPostSummary])
 async def get_blog_posts(
+    response: Response,
     category: Optional[str] = None,
     tag: Optional[str] = None,
     featured: Optional[bool] = None,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page (replaces offset)"),
     sort_by: Optional[str] = Query(None, description="Optional sort: 'views' for most read, otherwise latest"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get blog posts with filtering and pagination"""
+    """
+    Get blog posts with filtering and pagination.
+
+    Latest-first listings page by cursor: pass the X-Next-Cursor header of one page
+    to get the next; the header is absent on the last page. offset still works but
+    scans every skipped row. First pages (no cursor/offset) are cached briefly.
+    """
     
     try:
+        if cursor and sort_by == 'views':
+            raise HTTPException(status_code=400, detail="cursor is not supported with sort_by=views")
+
+        cache_key = None
+        if cursor is None and offset == 0 and featured is None:
+            cache_key = blog_listing_cache_key(category, tag_slug(tag) if tag else None, sort_by, limit)
+            cached = await cache_service.get(cache_key)
+            if cached is not None:
+                if cached["next_cursor"]:
+                    response.headers["X-Next-Cursor"] = cached["next_cursor"]
+                return cached["posts"]
+
+        # category_slug, reading_time and tag_names/tag_slugs are maintained from
+        # content_json by the blog_posts_listing_fields trigger
         where_clauses = ["bp.status = 'published'"]
         params = {}
         
         if category:
-            where_clauses.append("COALESCE(bp.content_json->>'category', 'general') = :category")
+            where_clauses.append("bp.category_slug = :category")
             params['category'] = category
             
         if tag:
-            where_clauses.append("bp.content_json->'tags' ? :tag")
-            params['tag'] = tag
+            # Accept a tag name or slug; both normalize to the stored slug
+            where_clauses.append("bp.tag_slugs @> ARRAY[CAST(:tag AS text)]")
+            params['tag'] = tag_slug(tag)
             
         if featured is not None:
             # featured column doesn't exist in simplified table, use default false
             where_clauses.append("false = :featured")
             params['featured'] = featured
+
+        if cursor:
+            # Seek past the previous page on ix_blog_posts_published_keyset/_category
+            # (published posts always have published_at, see migration 019)
+            params['cursor_published_at'], params['cursor_id'] = decode_listing_cursor(cursor)
+            where_clauses.append("(bp.published_at, bp.id) < (:cursor_published_at, :cursor_id)")
         
         where_clause = "WHERE " + " AND ".join(where_clauses)
         
-        order_clause = "ORDER BY bp.published_at DESC, bp.created_at DESC"
-        if sort_by == 'views':
-            order_clause = "ORDER BY bp.published_at DESC, bp.created_at DESC"
-
-        query = f"""
-        SELECT 
+        columns = """
             bp.id, bp.title, bp.slug, bp.excerpt, bp.featured_image,
-            bp.author_name, 
-            COALESCE((bp.content_json->>'word_count')::int / 200, 5) as reading_time,
-            0 as view_count,
+            bp.author_name, bp.reading_time,
+            {view_count} as view_count,
             false as featured,
             bp.published_at,
-            -- Create category object from content_json
-            NULL as category_id,
-            COALESCE(bp.content_json->>'category', 'general') as category_name,
-            COALESCE(bp.content_json->>'category', 'general') as category_slug,
-            'General content category' as category_description,
-            '📝' as category_icon,
-            '#6366f1' as category_color,
-            1 as category_sort_order,
-            true as category_is_active
-        FROM blog_posts bp
-        {where_clause}
-        {order_clause}
-        LIMIT :limit OFFSET :offset
+            bp.tag_names, bp.tag_slugs
         """
-        
-        params.update({'limit': limit, 'offset': offset})
-        
-        result = await db.execute(text(query), params)
-        posts = result.fetchall()
-        
-        # Get tags from content_json for each post
-        post_ids = [post[0] for post in posts]
-        
-        if post_ids:
-            # Get content_json for all posts to extract tags
-            tags_query = """
-            SELECT id, content_json->'tags' as tags_json
-            FROM blog_posts 
-            WHERE id = ANY(:post_ids)
+
+        if sort_by == 'views':
+            # Counts are flushed into blog_post_stats by blog_view_counter. Posts with a
+            # stats row are read in ix_blog_post_stats_view_count order and joined back,
+            # so only limit + offset rows are visited; posts never viewed follow by date.
+            query = f"""
+            SELECT * FROM (
+                (SELECT {columns.format(view_count='s.view_count')}, 0 AS tier
+                 FROM blog_post_stats s
+                 JOIN blog_posts bp ON bp.id = s.post_id
+                 {where_clause}
+                 ORDER BY s.view_count DESC, s.post_id
+                 LIMIT :window)
+                UNION ALL
+                (SELECT {columns.format(view_count='0')}, 1 AS tier
+                 FROM blog_posts bp
+                 {where_clause}
+                   AND NOT EXISTS (SELECT 1 FROM blog_post_stats s WHERE s.post_id = bp.id)
+                 ORDER BY bp.published_at DESC, bp.id DESC
+                 LIMIT :window)
+            ) ranked
+            ORDER BY tier, view_count DESC, CASE WHEN tier = 0 THEN id END, published_at DESC, id DESC
+            LIMIT :limit OFFSET :offset
             """
-            tags_result = await db.execute(text(tags_query), {'post_ids': post_ids})
-            tags_data = tags_result.fetchall()
-            
-            # Build tags for each post from JSON
-            tags_by_post = {}
-            for post_id, tags_json in tags_data:
-                tags_by_post[post_id] = []
-                if tags_json:
-                    import json
-                    tag_names = json.loads(tags_json) if isinstance(tags_json, str) else tags_json
-                    if isinstance(tag_names, list):
-                        for i, tag_name in enumerate(tag_names):
-                            # Create slug from tag name
-                            import re
-                            tag_slug = re.sub(r'[^a-zA-Z0-9\s-]', '', tag_name.lower())
-                            tag_slug = re.sub(r'\s+', '-', tag_slug).strip('-')
-                            tags_by_post[post_id].append(BlogTag(id=i+1, name=tag_name, slug=tag_slug))
+            params['window'] = limit + offset
         else:
-            tags_by_post = {}
+            query = f"""
+            SELECT {columns.format(view_count='COALESCE(s.view_count, 0)')}
+            FROM blog_posts bp
+            LEFT JOIN blog_post_stats s ON s.post_id = bp.id
+            {where_clause}
+            ORDER BY bp.published_at DESC, bp.id DESC
+            LIMIT :limit OFFSET :offset
+            """
         
-        return [
+        params.update({'limit': limit, 'offset': 0 if cursor else offset})
+        
+        result = await db.execute(text(query), params)
+        rows = result.fetchall()
+
+        posts = [
             BlogPostSummary(
                 id=row[0],
                 title=row[1],
@@ -271,21 +325,27 @@ async def get_blog_posts(
                 view_count=row[7],
                 featured=row[8],
                 published_at=row[9],
-                category=BlogCategory(
-                    id=row[10],
-                    name=row[11],
-                    slug=row[12],
-                    description=row[13],
-                    icon=row[14],
-                    color=row[15],
-                    sort_order=row[16],
-                    is_active=row[17]
-                ) if row[10] else None,
-                tags=tags_by_post.get(row[0], [])
-            )
-            for row in posts
+                # Listing posts have no blog_categories row (category_id is always NULL)
+                category=None,
+                tags=[
+                    BlogTag(id=i + 1, name=name, slug=slug)
+                    for i, (name, slug) in enumerate(zip(row[10] or [], row[11] or []))
+                ]
+            ).model_dump(mode="json")
+            for row in rows
         ]
 
+        next_cursor = None
+        if sort_by != 'views' and len(rows) == limit:
+            next_cursor = encode_listing_cursor(rows[-1][9], rows[-1][0])
+            response.headers["X-Next-Cursor"] = next_cursor
+
+        if cache_key:
+            await cache_service.set(cache_key, {"posts": posts, "next_cursor": next_cursor}, BLOG_LISTING_CACHE_TTL)
+        return posts
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to fetch blog posts: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch blog posts")
@@ -293,7 +353,7 @@ async def get_blog_posts(
 @router.get("/blog/tags/popular", response_model=List[BlogTag])
 async def get_popular_tags(
     limit: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get most-used tags across published posts"""
     try:
@@ -317,7 +377,7 @@ async def get_popular_tags(
 @router.get("/blog/posts/by-id/{post_id}", response_model=BlogPost)
 async def get_blog_post_by_id(
     post_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a single blog post by ID"""
     try:
@@ -327,7 +387,7 @@ async def get_blog_post_by_id(
             bp.id, bp.title, bp.slug, bp.excerpt, bp.content, bp.content_json, bp.featured_image,
             bp.author_name, bp.status, bp.seo_title, bp.seo_description,
             COALESCE((bp.content_json->>'word_count')::int / 200, 5) as reading_time,
-            0 as view_count, false as featured, bp.published_at,
+            COALESCE(s.view_count, 0) as view_count, false as featured, bp.published_at,
             bp.created_at, bp.updated_at,
             bp.noindex,
             -- Create category from content_json
@@ -340,6 +400,7 @@ async def get_blog_post_by_id(
             1 as category_sort_order,
             true as category_is_active
         FROM blog_posts bp
+        LEFT JOIN blog_post_stats s ON s.post_id = bp.id
         WHERE bp.id = :post_id
         """
         
@@ -356,10 +417,7 @@ async def get_blog_post_by_id(
             tag_names = content_json['tags']
             if isinstance(tag_names, list):
                 for i, tag_name in enumerate(tag_names):
-                    import re
-                    tag_slug = re.sub(r'[^a-zA-Z0-9\s-]', '', tag_name.lower())
-                    tag_slug = re.sub(r'\s+', '-', tag_slug).strip('-')
-                    tags.append(BlogTag(id=i+1, name=tag_name, slug=tag_slug))
+                    tags.append(BlogTag(id=i+1, name=tag_name, slug=tag_slug(tag_name)))
         
         # Extract products from content_json
         products = []
@@ -451,136 +509,102 @@ async def get_blog_post_by_id(
 @router.get("/blog/posts/{slug}", response_model=BlogPost)
 async def get_blog_post(
     slug: str,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get a single blog post by slug"""
+    """Get a single blog post by slug (served pre-rendered from cache, with ETag revalidation)"""
     try:
-        # Get the main post data using simplified structure
-        query = """
-        SELECT 
-            bp.id, bp.title, bp.slug, bp.excerpt, bp.content, bp.content_json, bp.featured_image,
-            bp.author_name, bp.status, bp.seo_title, bp.seo_description,
-            COALESCE((bp.content_json->>'word_count')::int / 200, 5) as reading_time,
-            0 as view_count, false as featured, bp.published_at,
-            bp.created_at, bp.updated_at,
-            bp.noindex,
-            -- Create category from content_json
-            NULL as category_id,
-            COALESCE(bp.content_json->>'category', 'general') as category_name,
-            COALESCE(bp.content_json->>'category', 'general') as category_slug,
-            'Content category' as category_description,
-            '📝' as category_icon,
-            '#6366f1' as category_color,
-            1 as category_sort_order,
-            true as category_is_active
-        FROM blog_posts bp
-        WHERE bp.slug = :slug AND bp.status = 'published'
-        """
-        
-        result = await db.execute(text(query), {'slug': slug})
-        row = result.fetchone()
-        
-        if not row:
+        rendered = await BlogPostRenderer(db).get(slug)
+        if rendered is None:
             raise HTTPException(status_code=404, detail="Blog post not found")
-        
-        post_id = row[0]
-        
-        # Extract tags from content_json
-        content_json = row[5]
-        tags = []
-        if content_json and 'tags' in content_json:
-            tag_names = content_json['tags']
-            if isinstance(tag_names, list):
-                for i, tag_name in enumerate(tag_names):
-                    import re
-                    tag_slug = re.sub(r'[^a-zA-Z0-9\s-]', '', tag_name.lower())
-                    tag_slug = re.sub(r'\s+', '-', tag_slug).strip('-')
-                    tags.append(BlogTag(id=i+1, name=tag_name, slug=tag_slug))
-        
-        # Extract products from content_json
-        products = []
-        if content_json and 'featured_products' in content_json:
-            try:
-                featured_product_ids = content_json['featured_products']
-                if featured_product_ids:
-                    # Load products from database
-                    product_query = """
-                    SELECT p.id, p.name, p.slug, COALESCE(p.msrp_price, 0) as price,
-                           p.avg_rating, b.name as brand_name, c.name as category_name
-                    FROM products p
-                    JOIN brands b ON p.brand_id = b.id  
-                    JOIN categories c ON p.category_id = c.id
-                    WHERE p.id = ANY(:product_ids) AND p.is_active = true
-                    """
-                    product_result = await db.execute(text(product_query), {'product_ids': featured_product_ids})
-                    product_rows = product_result.fetchall()
-                    
-                    for product_row in product_rows:
-                        products.append(BlogPostProduct(
-                            id=product_row[0],
-                            product_id=product_row[0],  # Use same ID
-                            position=0,  # Default position
-                            context=None,  # No specific context
-                            product_name=product_row[1],
-                            product_slug=product_row[2],
-                            product_brand=product_row[5]
-                        ))
-            except Exception as e:
-                logger.warning(f"Error loading products for post {post_id}: {e}")
-        
-        # Generate content from content_json for compatibility
-        content = "Content available in JSON format"  # Default fallback
-        if content_json and 'sections' in content_json:
-            content_parts = []
-            sections = content_json['sections']
-            for section in sections:
-                section_content = section.get('content', '')
-                if section_content and section_content.strip():
-                    content_parts.append(section_content.strip())
-            
-            if content_parts:
-                content = '\n\n'.join(content_parts)
-        
-        return BlogPost(
-            id=row[0],
-            title=row[1],
-            slug=row[2],
-            excerpt=row[3],
-            content=content,
-            structured_content=content_json,  # Use content_json as structured_content
-            content_json=content_json,  # Also provide content_json for frontend compatibility
-            featured_image=row[6],
-            author_name=row[7],
-            status=row[8],
-            seo_title=row[9],
-            seo_description=row[10],
-            reading_time=row[11],
-            view_count=row[12],
-            featured=row[13],
-            published_at=row[14],
-            created_at=row[15],
-            updated_at=row[16],
-            noindex=row[17] or False,
-            category=BlogCategory(
-                id=1,  # Default category ID
-                name=row[19],
-                slug=row[20],
-                description=row[21],
-                icon=row[22],
-                color=row[23],
-                sort_order=row[24],
-                is_active=row[25]
-            ) if row[19] else None,
-            tags=tags,
-            products=products
-        )
-        
+
+        if rendered.get("id"):
+            blog_view_counter.record_view(rendered["id"])
+
+        headers = {"ETag": rendered["etag"], "Cache-Control": BLOG_POST_CACHE_CONTROL}
+        if request.headers.get("if-none-match") == rendered["etag"]:
+            return Response(status_code=304, headers=headers)
+        return Response(content=rendered["body"], media_type="application/json", headers=headers)
+
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Failed to fetch blog post {slug}: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch blog post")
 
+@router.get("/blog/posts/{slug}/related", response_model=RelatedContent)
+async def get_related_content(
+    slug: str,
+    limit: int = Query(4, ge=1, le=8),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Related posts and products, precomputed by app.scripts.rebuild_blog_similarity"""
+    try:
+        cache_key = f"blog_related:{slug}:{limit}"
+        cached = await cache_service.get(cache_key)
+        if cached is not None:
+            return cached
+
+        posts_result = await db.execute(text("""
+            SELECT
+                bp.id, bp.title, bp.slug, bp.excerpt, bp.featured_image,
+                bp.author_name, bp.reading_time,
+                COALESCE(s.view_count, 0) as view_count,
+                bp.published_at, bp.tag_names, bp.tag_slugs
+            FROM blog_posts src
+            JOIN blog_post_related r ON r.post_id = src.id AND r.kind = 'post'
+            JOIN blog_posts bp ON bp.id = r.related_id AND bp.status = 'published'
+            LEFT JOIN blog_post_stats s ON s.post_id = bp.id
+            WHERE src.slug = :slug AND src.status = 'published'
+            ORDER BY r.rank
+            LIMIT :limit
+        """), {'slug': slug, 'limit': limit})
+
+        products_result = await db.execute(text("""
+            SELECT p.id, p.name, p.slug, b.name as brand_name, r.score
+            FROM blog_posts src
+            JOIN blog_post_related r ON r.post_id = src.id AND r.kind = 'product'
+            JOIN products p ON p.id = r.related_id AND p.is_active = true
+            JOIN brands b ON p.brand_id = b.id
+            WHERE src.slug = :slug AND src.status = 'published'
+            ORDER BY r.rank
+            LIMIT :limit
+        """), {'slug': slug, 'limit': limit})
+
+        related = RelatedContent(
+            posts=[
+                BlogPostSummary(
+                    id=row[0],
+                    title=row[1],
+                    slug=row[2],
+                    excerpt=row[3],
+                    featured_image=row[4],
+                    author_name=row[5],
+                    reading_time=row[6],
+                    view_count=row[7],
+                    featured=False,
+                    published_at=row[8],
+                    category=None,
+                    tags=[
+                        BlogTag(id=i + 1, name=name, slug=tag)
+                        for i, (name, tag) in enumerate(zip(row[9] or [], row[10] or []))
+                    ]
+                )
+                for row in posts_result.fetchall()
+            ],
+            products=[
+                RelatedBlogProduct(id=row[0], name=row[1], slug=row[2], brand_name=row[3], score=round(row[4], 4))
+                for row in products_result.fetchall()
+            ]
+        ).model_dump(mode="json")
+
+        await cache_service.set(cache_key, related, BLOG_RELATED_CACHE_TTL)
+        return related
+
+    except Exception as e:
+        logger.error(f"Failed to fetch related content for {slug}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch related content")
+
 @router.post("/blog/posts", response_model=dict)
 async def create_blog_post(
     post_data: BlogPostCreate,
@@ -666,6 +690,9 @@ async def create_blog_post(
             })
         
         await db.commit()
+
+        if post_data.status == 'published':
+            await BlogPostRenderer(db).refresh_posts(slugs=[slug])
         
         logger.info(f"Created blog post {post_id}: {post_data.title}")
         
@@ -684,34 +711,56 @@ async def create_blog_post(
 async def search_blog_posts(
     q: str = Query(..., min_length=2),
     limit: int = Query(10, ge=1, le=50),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Search blog posts by title and content"""
+    """
+    Full-text search over published posts, ranked by the weighted search_vector
+    (title > excerpt/tags > section bodies), with highlighted body snippets.
+    """
     
     try:
+        # Rank against the GIN-indexed vector first; build snippets only for the page of hits
         query = """
+        WITH q AS (SELECT websearch_to_tsquery('english', :q) AS query),
+        hits AS (
+            SELECT bp.id, ts_rank(bp.search_vector, q.query) AS rank
+            FROM blog_posts bp, q
+            WHERE bp.status = 'published' AND bp.search_vector @@ q.query
+            ORDER BY rank DESC, bp.published_at DESC
+            LIMIT :limit
+        )
         SELECT 
             bp.id, bp.title, bp.slug, bp.excerpt, bp.featured_image,
-            bp.author_name, 
-            COALESCE((bp.content_json->>'word_count')::int / 200, 5) as reading_time, 
-            bp.published_at,
-            COALESCE(bp.content_json->>'category', 'general') as category_name,
-            COALESCE(bp.content_json->>'category', 'general') as category_slug,
-            '#6366f1' as category_color
-        FROM blog_posts bp
-        WHERE bp.status = 'published' 
-        AND (
-            bp.title ILIKE :search_term 
-            OR bp.excerpt ILIKE :search_term 
-            OR bp.content ILIKE :search_term
-            OR bp.content_json::text ILIKE :search_term
-        )
-        ORDER BY bp.published_at DESC
-        LIMIT :limit
+            bp.author_name, bp.reading_time, bp.published_at,
+            bp.category_slug as category_name,
+            bp.category_slug,
+            '#6366f1' as category_color,
+            hits.rank,
+            ts_headline(
+                'english',
+                COALESCE(
+                    (
+                        SELECT string_agg(section->>'content', ' ')
+                        FROM jsonb_array_elements(
+                            CASE WHEN jsonb_typeof(bp.content_json->'sections') = 'array'
+                                 THEN bp.content_json->'sections' ELSE '[]'::jsonb END
+                        ) AS s(section)
+                        WHERE jsonb_typeof(section) = 'object'
+                    ),
+                    bp.content,
+                    bp.excerpt,
+                    ''
+                ),
+                q.query,
+                'StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2'
+            ) as snippet
+        FROM hits
+        JOIN blog_posts bp ON bp.id = hits.id
+        CROSS JOIN q
+        ORDER BY hits.rank DESC, bp.published_at DESC
         """
         
-        search_term = f"%{q}%"
-        result = await db.execute(text(query), {'search_term': search_term, 'limit': limit})
+        result = await db.execute(text(query), {'q': q, 'limit': limit})
         posts = result.fetchall()
         
         return {
@@ -730,7 +779,9 @@ async def search_blog_posts(
                         "name": row[8],
                         "slug": row[9],
                         "color": row[10]
-                    } if row[8] else None
+                    } if row[8] else None,
+                    "rank": float(row[11]),
+                    "snippet": row[12]
                 }
                 for row in posts
             ]
@@ -857,84 +908,37 @@ async def create_blog_generation_template(
         logger.error(f"Failed to create blog generation template: {e}")
         raise HTTPException(status_code=500, detail="Failed to create template")
 
-@router.post("/blog/generate", response_model=BlogGenerationResult)
+@router.post("/blog/generate", status_code=202)
 async def generate_blog_post(
     request: BlogGenerationRequest,
     db: AsyncSession = Depends(get_db),
     admin: dict = Depends(require_admin)
 ):
-    """Generate a blog post using AI (admin only)"""
-    
+    """Queue AI generation of a blog post (admin only); poll /blog/jobs/{job_id} for the outcome"""
+    if not request.title:
+        raise HTTPException(status_code=400, detail="title is required (it is the generation topic)")
     try:
-        # Get OpenAI API key from environment
-        import os
-        openai_api_key = os.getenv('OPENAI_API_KEY')
-        if not openai_api_key:
-            raise HTTPException(status_code=500, detail="OpenAI API key not configured")
-        
-        # Initialize AI generator
-        import openai
-        openai_client = openai.AsyncClient(api_key=openai_api_key)
-        ai_generator = SimpleBlogGenerator(openai_client)
-        
-        # Generate blog post
-        blog_content = ai_generator.generate_blog_post(
-            topic=request.topic,
-            template_name=getattr(request, 'template_name', 'buying-guide'),
-            products=getattr(request, 'products', []),
-            target_words=getattr(request, 'target_words', 4000)
-        )
-        
-        # Save to database using simplified structure
-        from sqlalchemy import text
-        insert_query = """
-        INSERT INTO blog_posts (title, slug, excerpt, seo_title, seo_description, content_json, 
-                               author_name, category, tags, featured_products, published_at, created_at, updated_at)
-        VALUES (:title, :slug, :excerpt, :seo_title, :seo_description, :content_json, 
-                :author_name, :category, :tags, :featured_products, NOW(), NOW(), NOW())
-        RETURNING id
-        """
-        
-        # Generate slug from title
-        import re
-        slug = re.sub(r'[^a-zA-Z0-9\s-]', '', blog_content['title'].lower())
-        slug = re.sub(r'\s+', '-', slug).strip('-')
-        
-        values = {
-            'title': blog_content['title'],
-            'slug': slug,
-            'excerpt': blog_content.get('excerpt', ''),
-            'seo_title': blog_content.get('seo_title', blog_content['title']),
-            'seo_description': blog_content.get('seo_description', ''),
-            'content_json': json.dumps(blog_content),
-            'author_name': 'GetYourMusicGear Team',
-            'category': blog_content.get('category', 'general'),
-            'tags': json.dumps(blog_content.get('tags', [])),
-            'featured_products': json.dumps(blog_content.get('featured_products', []))
-        }
-        
-        result = await db.execute(text(insert_query), values)
-        blog_post_id = result.fetchone()[0]
+        requested_by = f"admin key ({admin.get('ip_address')})"
+        job = await enqueue_job(db, "generate", request.model_dump(mode="json"), requested_by)
         await db.commit()
-        
-        logger.info(f"Generated and saved AI blog post {blog_post_id}")
-        
-        # Return result in expected format
-        from app.blog_ai_schemas import BlogGenerationResult
-        return BlogGenerationResult(
-            success=True,
-            blog_post_id=blog_post_id,
-            title=blog_content['title'],
-            slug=slug,
-            content=blog_content,
-            error_message=None
-        )
-        
-    except HTTPException:
-        raise
+        logger.info(f"AI generation job {job['id']} queued by {requested_by}")
+        return job_status(job)
     except Exception as e:
-        logger.error(f"Failed to generate blog post: {e}")
-        raise HTTPException(status_code=500, detail="Failed to generate blog post")
+        await db.rollback()
+        logger.error(f"Failed to queue blog generation: {e}")
+        raise HTTPException(status_code=500, detail="Failed to queue blog generation")
+
+@router.get("/blog/jobs/{job_id}")
+async def get_generation_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    admin: dict = Depends(require_admin)
+):
+    """Status of one generation job (admin only)"""
+    job = await get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_status(job)
 
 @router.get("/blog/generation-history", response_model=List[BlogGenerationHistory])
 async def get_generation_history(
@@ -1004,12 +1008,13 @@ async def get_ai_blog_post(
             bp.id, bp.title, bp.slug, bp.excerpt, bp.content, bp.content_json, bp.featured_image,
             bp.author_name, bp.status, bp.seo_title, bp.seo_description,
             COALESCE((bp.content_json->>'word_count')::int / 200, 5) as reading_time,
-            0 as view_count, false as featured, bp.published_at,
+            COALESCE(s.view_count, 0) as view_count, false as featured, bp.published_at,
             bp.created_at, bp.updated_at, NULL as category_id,
             COALESCE(bp.generated_by_ai, true) as generated_by_ai, 
             bp.generation_prompt, bp.generation_model,
             bp.generation_params, bp.ai_notes
         FROM blog_posts bp
+        LEFT JOIN blog_post_stats s ON s.post_id = bp.id
         WHERE bp.id = :post_id
         """
         
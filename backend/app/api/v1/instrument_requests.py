@@ -10,8 +10,9 @@ from datetime import datetime
 from pydantic import BaseModel, Field, validator
 import logging
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.auth import verify_api_key
+from app.services.content_stats import load_content_stats
 
 logger = logging.getLogger(__name__)
 
@@ -119,7 +120,7 @@ async def get_instrument_requests(
     category: Optional[str] = None,
     limit: int = 50,
     offset: int = 0,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     api_key: str = Depends(verify_api_key)
 ):
     """Get instrument requests with optional filtering"""
@@ -179,7 +180,7 @@ async def get_instrument_requests(
 @router.get("/instrument-requests/{request_id}", response_model=InstrumentRequestResponse)
 async def get_instrument_request(
     request_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     api_key: str = Depends(verify_api_key)
 ):
     """Get a specific instrument request"""
@@ -313,37 +314,24 @@ async def delete_instrument_request(
 
 @router.get("/instrument-requests/stats", response_model=dict)
 async def get_instrument_requests_stats(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     api_key: str = Depends(verify_api_key)
 ):
     """Get instrument requests statistics"""
     
     try:
-        query = """
-        SELECT 
-            COUNT(*) as total_requests,
-            COUNT(*) FILTER (WHERE status = 'pending') as pending_requests,
-            COUNT(*) FILTER (WHERE status = 'reviewing') as reviewing_requests,
-            COUNT(*) FILTER (WHERE status = 'approved') as approved_requests,
-            COUNT(*) FILTER (WHERE status = 'completed') as completed_requests,
-            COUNT(*) FILTER (WHERE status = 'rejected') as rejected_requests,
-            COUNT(*) FILTER (WHERE created_at >= CURRENT_DATE - INTERVAL '7 days') as requests_last_week,
-            COUNT(*) FILTER (WHERE created_at >= CURRENT_DATE - INTERVAL '30 days') as requests_last_month
-        FROM instrument_requests
-        """
-        
-        result = await db.execute(text(query))
-        row = result.fetchone()
+        # Trigger-maintained counts (migration 021) instead of scanning instrument_requests
+        stats = await load_content_stats(db, "instrument_requests")
         
         return {
-            "total_requests": row[0],
-            "pending_requests": row[1],
-            "reviewing_requests": row[2],
-            "approved_requests": row[3],
-            "completed_requests": row[4],
-            "rejected_requests": row[5],
-            "requests_last_week": row[6],
-            "requests_last_month": row[7]
+            "total_requests": stats.count(),
+            "pending_requests": stats.count(status="pending"),
+            "reviewing_requests": stats.count(status="reviewing"),
+            "approved_requests": stats.count(status="approved"),
+            "completed_requests": stats.count(status="completed"),
+            "rejected_requests": stats.count(status="rejected"),
+            "requests_last_week": stats.count("last_week"),
+            "requests_last_month": stats.count("last_month")
         }
         
     except Exception as e:
@@ -6,9 +6,10 @@ from sqlalchemy import and_, func, select, update, case
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models import Product, ProductVote
 from ..schemas import VoteRequest, VoteResponse, ProductVoteStats
+from ..services.cache_service import cache_service
 from ..utils.vote_utils import get_product_vote_stats as get_vote_stats, get_user_vote_for_product
 
 
@@ -91,6 +92,9 @@ async def vote_on_product(
     
     await db.commit()
     
+    # Cached product page bundles embed vote stats
+    await cache_service.invalidate_prefix(f"product_page:{product.slug}:")
+    
     # Get updated vote statistics
     vote_stats = await get_vote_stats(db, product_id)
     
@@ -111,7 +115,7 @@ async def vote_on_product(
 async def get_product_vote_stats(
     product_id: int,
     request: Request,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get voting statistics for a product."""
     user_ip = get_client_ip(request)
@@ -141,7 +145,7 @@ async def get_product_vote_stats(
 async def get_most_voted_products(
     limit: int = 20,
     sort_by: str = "vote_score",  # vote_score, total_votes, thumbs_up_count
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get the most voted products."""
     # Validate sort_by parameter
@@ -1,15 +1,12 @@
 from fastapi import HTTPException, Depends, Header, Request
 from typing import Optional
 import logging
-import time
-from collections import defaultdict
+import math
 from .config import settings
+from .rate_limit import rate_limiter
 
 logger = logging.getLogger(__name__)
 
-# Simple rate limiting (use Redis in production for scaling)
-rate_limit_store = defaultdict(list)
-
 def get_client_ip(request: Request) -> str:
     """Extract client IP with proper proxy header handling"""
     # Check forwarded headers first (App Service / proxy)
@@ -27,25 +24,6 @@ def get_client_ip(request: Request) -> str:
     
     return "unknown"
 
-def is_rate_limited(client_ip: str, limit: int = 100, period: int = 60) -> bool:
-    """Simple rate limiting - 100 requests per minute per IP"""
-    current_time = time.time()
-    requests = rate_limit_store[client_ip]
-    
-    # Remove old requests outside the time window
-    rate_limit_store[client_ip] = [
-        req_time for req_time in requests 
-        if current_time - req_time < period
-    ]
-    
-    # Check if limit exceeded
-    if len(rate_limit_store[client_ip]) >= limit:
-        return True
-    
-    # Add current request
-    rate_limit_store[client_ip].append(current_time)
-    return False
-
 async def verify_api_key(
     request: Request,
     x_api_key: Optional[str] = Header(None, alias="X-API-Key")
@@ -56,13 +34,14 @@ async def verify_api_key(
     """
     client_ip = get_client_ip(request)
     
-    # Rate limiting protection
-    if is_rate_limited(client_ip):
-        logger.warning(f"Rate limit exceeded for IP: {client_ip}")
+    # Rate limiting protection (limits are per route group, shared across workers via Redis)
+    allowed, retry_after = await rate_limiter.hit(client_ip, request.url.path)
+    if not allowed:
+        logger.warning(f"Rate limit exceeded for IP: {client_ip} on {request.url.path}")
         raise HTTPException(
             status_code=429,
             detail="Too many requests. Please try again later.",
-            headers={"Retry-After": "60"}
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
         )
     
     # Development mode - require API key but allow easier setup
@@ -10,6 +10,23 @@ class Settings(BaseSettings):
     # Database - Secure configuration with validation
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
     
+    # Optional read replica for read-only endpoints (get_read_db); unset means reads use the primary
+    DATABASE_REPLICA_URL: str = os.getenv("DATABASE_REPLICA_URL", "")
+    # Seconds after a client's write during which its reads stay on the primary
+    READ_YOUR_WRITES_SECONDS: int = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+    
+    def _to_async_url(self, url: str) -> str:
+        if url.startswith("postgresql://"):
+            # Convert to asyncpg format
+            base_url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+            
+            # For production, use SSL with asyncpg-compatible parameters
+            if self.ENVIRONMENT == "production" and "ssl=" not in base_url:
+                connector = "&" if "?" in base_url else "?"
+                return f"{base_url}{connector}ssl=require"
+            return base_url
+        return url
+    
     @property
     def ASYNC_DATABASE_URL(self) -> str:
         if not self.DATABASE_URL:
@@ -18,20 +35,46 @@ class Settings(BaseSettings):
             else:
                 raise ValueError("DATABASE_URL environment variable is required in production")
         
-        if self.DATABASE_URL.startswith("postgresql://"):
-            # Convert to asyncpg format
-            base_url = self.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
-            
-            # For production, use SSL with asyncpg-compatible parameters
-            if self.ENVIRONMENT == "production" and "ssl=" not in base_url:
-                connector = "&" if "?" in base_url else "?"
-                return f"{base_url}{connector}ssl=require"
-            return base_url
-        return self.DATABASE_URL
+        return self._to_async_url(self.DATABASE_URL)
+    
+    @property
+    def ASYNC_DATABASE_REPLICA_URL(self) -> str:
+        return self._to_async_url(self.DATABASE_REPLICA_URL) if self.DATABASE_REPLICA_URL else ""
     
     # Redis
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
     
+    # Rate limiting per route group, e.g. "default=100/60,search=60/60" (requests/seconds)
+    RATE_LIMIT_RULES: str = os.getenv("RATE_LIMIT_RULES", "")
+    
+    # Access logging: fraction of requests logged; 5xx and slow requests are always logged
+    ACCESS_LOG_SAMPLE_RATE: float = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "1.0"))
+    SLOW_REQUEST_MS: float = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+    # Server-Timing response header (db/app durations) and N+1 warning threshold per request
+    SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+    N_PLUS_ONE_THRESHOLD: int = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+    # Statement budgets per route group in ms, e.g. "default=5000,blog=3000,admin=60000"
+    STATEMENT_TIMEOUT_RULES: str = os.getenv("STATEMENT_TIMEOUT_RULES", "")
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "500"))
+    # Seconds between flushes of buffered blog view counts into blog_post_stats
+    BLOG_VIEW_FLUSH_SECONDS: float = float(os.getenv("BLOG_VIEW_FLUSH_SECONDS", "30"))
+    
+    # AI generation: provider ("openai" or "fake" for offline runs) and in-flight requests per process
+    OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    LLM_PROVIDER: str = os.getenv("LLM_PROVIDER", "openai")
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+    # Per-process quota for the shared LLM client (0 disables a limit) and retry policy for 429/5xx
+    LLM_REQUESTS_PER_MINUTE: float = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+    LLM_TOKENS_PER_MINUTE: float = float(os.getenv("LLM_TOKENS_PER_MINUTE", "150000"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "5"))
+    LLM_BACKOFF_BASE_SECONDS: float = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1"))
+    LLM_BACKOFF_MAX_SECONDS: float = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "60"))
+    # Generation job queue (blog_generation_jobs): worker poll interval, attempts per job and
+    # seconds after which a running job whose worker disappeared is picked up again
+    GENERATION_WORKER_POLL_SECONDS: float = float(os.getenv("GENERATION_WORKER_POLL_SECONDS", "2"))
+    GENERATION_JOB_MAX_ATTEMPTS: int = int(os.getenv("GENERATION_JOB_MAX_ATTEMPTS", "3"))
+    GENERATION_JOB_LOCK_SECONDS: int = int(os.getenv("GENERATION_JOB_LOCK_SECONDS", "900"))
+    
     # Security - Generate secure defaults, require strong values in production
     SECRET_KEY: str = os.getenv("SECRET_KEY") or secrets.token_urlsafe(64)
     API_KEY: str = os.getenv("API_KEY", "")
@@ -1,31 +1,105 @@
 from __future__ import annotations
 
+import time
+from typing import Optional
+
+from fastapi import Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql.dml import UpdateBase
 
 from .config import settings
+from .metrics import metrics
 from .models import Base
+from .query_stats import instrument_engine
+from . import slow_queries
 
 
-engine = create_async_engine(
-    settings.ASYNC_DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,
-)
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.observe_pool_checkout(time.perf_counter() - started)
+
+
+def _create_engine(url: str, pool_size: int = 10, max_overflow: int = 20):
+    db_engine = create_async_engine(
+        url,
+        echo=settings.DEBUG,
+        future=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=True,
+        poolclass=TimedQueuePool,
+    )
+    instrument_engine(db_engine, on_statement=slow_queries.slow_query_log.record)
+    slow_queries.install(db_engine)
+    return db_engine
+
+
+engine = _create_engine(settings.ASYNC_DATABASE_URL)
+# Without DATABASE_REPLICA_URL the replica is the primary and no routing happens
+replica_engine = _create_engine(settings.ASYNC_DATABASE_REPLICA_URL) if settings.ASYNC_DATABASE_REPLICA_URL else engine
 
 async_session_factory = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False, autoflush=True, autocommit=False
 )
 
 
+class RoutingSession(Session):
+    """
+    Reads go to the replica; flushes and INSERT/UPDATE/DELETE go to the primary, and
+    once a session has written, every later statement stays on the primary so it sees
+    its own changes. Raw text() writes cannot be detected - use get_db for those.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.info.get("use_primary") or self._flushing or isinstance(clause, UpdateBase):
+            self.info["use_primary"] = True
+            return engine.sync_engine
+        return replica_engine.sync_engine
+
+
+read_session_factory = async_sessionmaker(
+    class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False, autoflush=True, autocommit=False
+) if replica_engine is not engine else async_session_factory
+
+# Set on responses to unsafe requests; while it is in the future the client's reads use the primary
+READ_YOUR_WRITES_COOKIE = "db_primary_until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def session_factory_for(request: Optional[Request]) -> async_sessionmaker:
+    """Session factory for read-only work on behalf of request (replica unless pinned to primary)"""
+    if read_session_factory is async_session_factory or request is None:
+        return read_session_factory
+    try:
+        pinned_until = float(request.cookies.get(READ_YOUR_WRITES_COOKIE) or 0)
+    except ValueError:
+        pinned_until = 0
+    return async_session_factory if pinned_until > time.time() else read_session_factory
+
+
 async def init_db() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 
-async def get_db() -> AsyncSession:
+async def get_db(request: Request, response: Response) -> AsyncSession:
+    # Writes (and admin) use the primary; pin the client's next reads to it while replicas catch up
+    if replica_engine is not engine and request.method not in SAFE_METHODS:
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            str(int(time.time()) + settings.READ_YOUR_WRITES_SECONDS),
+            max_age=settings.READ_YOUR_WRITES_SECONDS,
+            httponly=True,
+            samesite="lax",
+        )
     async with async_session_factory() as session:
         try:
             yield session
@@ -36,3 +110,13 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+async def get_read_db(request: Request) -> AsyncSession:
+    """Session for read-only endpoints: replica-routed unless the client recently wrote"""
+    async with session_factory_for(request)() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
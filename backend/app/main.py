@@ -2,20 +2,22 @@ from __future__ import annotations
 
 from fastapi import FastAPI, Depends, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
 import logging
-import time
 import uuid
 
 import os
 from .config import settings
-from .database import init_db
+from .database import init_db, engine
+from .metrics import metrics
+from .services.blog_view_counter import blog_view_counter
 from .api import brands, categories, products, search, trending, compare, affiliate_stores, redirect, voting
 from .api.v1 import instrument_requests, blog, admin, docs
 from .auth import verify_api_key, optional_api_key
+from .middleware.azure_auth import require_azure_admin
+from .middleware.request_context import RequestContextMiddleware
 
 
 # Disable docs in production for security
@@ -37,46 +39,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Security headers middleware
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        
-        # Add security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        # Allow embedding docs only from configured frontend domains; deny everywhere else
-        path = request.url.path or ""
-        if path.startswith("/api/v1/docs"):
-            # Remove X-Frame-Options and set CSP frame-ancestors for allowed domains
-            if "X-Frame-Options" in response.headers:
-                del response.headers["X-Frame-Options"]
-            allowed_ancestors = [
-                f"https://{settings.DOMAIN}",
-                f"https://www.{settings.DOMAIN}"
-            ]
-            # Include known preview domains if present
-            vercel_domains = (os.getenv("ALLOWED_VERCEL_DOMAINS", "").split(","))
-            for d in vercel_domains:
-                d = d.strip()
-                if d:
-                    allowed_ancestors.append(f"https://{d}")
-            response.headers["Content-Security-Policy"] = (
-                "frame-ancestors " + " ".join(allowed_ancestors)
-            )
-        else:
-            response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        
-        # Add HSTS in production
-        if settings.ENVIRONMENT == "production":
-            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        
-        return response
-
-# Add security headers
-app.add_middleware(SecurityHeadersMiddleware)
-
 # CORS configuration
 app.add_middleware(
     CORSMiddleware,
@@ -84,24 +46,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
-# Request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    request_id = str(uuid.uuid4())[:8]
-    
-    logger.info(f"[{request_id}] {request.method} {request.url.path} - Start")
-    
-    response = await call_next(request)
-    
-    process_time = time.time() - start_time
-    logger.info(f"[{request_id}] {response.status_code} - {process_time:.3f}s")
-    
-    # Add request ID to response headers for debugging
-    response.headers["X-Request-ID"] = request_id
-    return response
+# Security headers, X-Request-ID, timing, query counts and sampled access logs (outermost, pure ASGI)
+app.add_middleware(
+    RequestContextMiddleware,
+    environment=settings.ENVIRONMENT,
+    domain=settings.DOMAIN,
+    docs_path=f"{settings.API_V1_STR}/docs",
+    frame_ancestor_domains=os.getenv("ALLOWED_VERCEL_DOMAINS", "").split(","),
+    log_sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
+    slow_request_ms=settings.SLOW_REQUEST_MS,
+    server_timing=settings.SERVER_TIMING_ENABLED,
+    n_plus_one_threshold=settings.N_PLUS_ONE_THRESHOLD,
+)
 
 # Error handling
 @app.exception_handler(HTTPException)
@@ -192,6 +151,13 @@ async def on_startup() -> None:
             logger.error(f"Database initialization failed: {e}")
             raise
 
+    blog_view_counter.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await blog_view_counter.stop()
+
 
 # Health check endpoint (no API key required)
 @app.get("/health")
@@ -199,6 +165,15 @@ async def health_check():
     return {"status": "healthy", "service": settings.PROJECT_NAME}
 
 
+# Prometheus metrics for this worker (admin only; scrapers send X-Admin-Token)
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(admin: dict = Depends(require_azure_admin)):
+    return PlainTextResponse(
+        metrics.render(engine.sync_engine.pool),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 # API routes with authentication (optional in development)
 if settings.ENVIRONMENT == "development":
     # In development, include routes without strict authentication
@@ -0,0 +1,183 @@
+"""
+In-process instrumentation exposed in Prometheus text format.
+
+Counters and histograms live per worker process; Prometheus aggregates across
+workers/instances with sum() and histogram_quantile() over the bucket series.
+Routes are labelled by their template ("/api/v1/products/{slug}"), never by the
+raw path, so label cardinality stays bounded.
+"""
+
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Request latency buckets (seconds), dense around the 10ms-1s range where API calls land
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+
+# Pool checkout wait buckets (seconds); anything above a few ms means the pool is saturated
+POOL_WAIT_BUCKETS: Tuple[float, ...] = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+# LLM call latency buckets (seconds); article generations take tens of seconds
+LLM_LATENCY_BUCKETS: Tuple[float, ...] = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 45.0, 60.0, 90.0, 120.0, 180.0, 300.0)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts are per bucket and made cumulative on render"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: Dict[str, str]) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            cumulative += bucket_count
+            lines.append(f"{name}_bucket{_labels({**labels, 'le': _format_bound(bound)})} {cumulative}")
+        cumulative += self.counts[-1]
+        lines.append(f"{name}_bucket{_labels({**labels, 'le': '+Inf'})} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labels)} {self.sum:.6f}")
+        lines.append(f"{name}_count{_labels(labels)} {self.count}")
+        return lines
+
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class Metrics:
+    """Registry for request, cache, database pool and LLM call metrics"""
+
+    def __init__(self):
+        self.request_latency: Dict[Tuple[str, str], Histogram] = {}
+        self.request_status: Dict[Tuple[str, str, str], int] = {}
+        self.in_flight = 0
+        self.cache_results: Dict[Tuple[str, str], int] = {}
+        self.pool_checkout_wait = Histogram(POOL_WAIT_BUCKETS)
+        self.llm_latency: Dict[Tuple[str, str], Histogram] = {}
+        self.llm_calls: Dict[Tuple[str, str, str], int] = {}
+        self.llm_tokens: Dict[Tuple[str, str, str], int] = {}
+        self.llm_rate_limit_wait = Histogram(LLM_LATENCY_BUCKETS)
+
+    def request_started(self) -> None:
+        self.in_flight += 1
+
+    def request_finished(self, method: str, route: Optional[str], status_code: int, duration: float) -> None:
+        self.in_flight -= 1
+        route = route or UNMATCHED_ROUTE
+        histogram = self.request_latency.get((method, route))
+        if histogram is None:
+            histogram = self.request_latency[(method, route)] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(duration)
+        status_key = (method, route, str(status_code))
+        self.request_status[status_key] = self.request_status.get(status_key, 0) + 1
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        key = (cache, "hit" if hit else "miss")
+        self.cache_results[key] = self.cache_results.get(key, 0) + 1
+
+    def observe_pool_checkout(self, seconds: float) -> None:
+        self.pool_checkout_wait.observe(seconds)
+
+    def record_llm_call(
+        self, provider: str, model: str, outcome: str, duration: float, prompt_tokens: int = 0, completion_tokens: int = 0
+    ) -> None:
+        """outcome is "ok", "retry" (failed, will be retried) or "error" (failed for good)"""
+        histogram = self.llm_latency.get((provider, model))
+        if histogram is None:
+            histogram = self.llm_latency[(provider, model)] = Histogram(LLM_LATENCY_BUCKETS)
+        histogram.observe(duration)
+        call_key = (provider, model, outcome)
+        self.llm_calls[call_key] = self.llm_calls.get(call_key, 0) + 1
+        for kind, count in (("prompt", prompt_tokens), ("completion", completion_tokens)):
+            if count:
+                token_key = (provider, model, kind)
+                self.llm_tokens[token_key] = self.llm_tokens.get(token_key, 0) + count
+
+    def observe_llm_rate_limit_wait(self, seconds: float) -> None:
+        self.llm_rate_limit_wait.observe(seconds)
+
+    def render(self, pool=None) -> str:
+        """Prometheus text exposition (format 0.0.4); pool is an SQLAlchemy QueuePool for gauges"""
+        lines: List[str] = [
+            "# HELP http_request_duration_seconds Request latency by route template",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in sorted(self.request_latency.items()):
+            lines.extend(histogram.render("http_request_duration_seconds", {"method": method, "route": route}))
+
+        lines += ["# HELP http_requests_total Responses by route template and status code",
+                  "# TYPE http_requests_total counter"]
+        for (method, route, status), count in sorted(self.request_status.items()):
+            lines.append(f"http_requests_total{_labels({'method': method, 'route': route, 'status': status})} {count}")
+
+        lines += ["# HELP http_requests_in_flight Requests currently being served by this worker",
+                  "# TYPE http_requests_in_flight gauge",
+                  f"http_requests_in_flight {self.in_flight}"]
+
+        lines += ["# HELP cache_requests_total Cache lookups by cache and result (hit/miss)",
+                  "# TYPE cache_requests_total counter"]
+        for (cache, result), count in sorted(self.cache_results.items()):
+            lines.append(f"cache_requests_total{_labels({'cache': cache, 'result': result})} {count}")
+
+        lines += ["# HELP db_pool_checkout_wait_seconds Time spent waiting for a pooled database connection",
+                  "# TYPE db_pool_checkout_wait_seconds histogram"]
+        lines.extend(self.pool_checkout_wait.render("db_pool_checkout_wait_seconds", {}))
+
+        lines += ["# HELP llm_call_duration_seconds LLM request latency by provider and model",
+                  "# TYPE llm_call_duration_seconds histogram"]
+        for (provider, model), histogram in sorted(self.llm_latency.items()):
+            lines.extend(histogram.render("llm_call_duration_seconds", {"provider": provider, "model": model}))
+
+        lines += ["# HELP llm_calls_total LLM requests by outcome (ok/retry/error)",
+                  "# TYPE llm_calls_total counter"]
+        for (provider, model, outcome), count in sorted(self.llm_calls.items()):
+            lines.append(f"llm_calls_total{_labels({'provider': provider, 'model': model, 'outcome': outcome})} {count}")
+
+        lines += ["# HELP llm_tokens_total Tokens reported by the provider by kind (prompt/completion)",
+                  "# TYPE llm_tokens_total counter"]
+        for (provider, model, kind), count in sorted(self.llm_tokens.items()):
+            lines.append(f"llm_tokens_total{_labels({'provider': provider, 'model': model, 'kind': kind})} {count}")
+
+        lines += ["# HELP llm_rate_limit_wait_seconds Time LLM calls waited for request/token budget",
+                  "# TYPE llm_rate_limit_wait_seconds histogram"]
+        lines.extend(self.llm_rate_limit_wait.render("llm_rate_limit_wait_seconds", {}))
+
+        if pool is not None:
+            lines += ["# HELP db_pool_connections Database pool connections by state",
+                      "# TYPE db_pool_connections gauge"]
+            for state, value in _pool_states(pool):
+                lines.append(f"db_pool_connections{_labels({'state': state})} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _pool_states(pool) -> Iterable[Tuple[str, int]]:
+    yield "size", pool.size()
+    yield "checked_out", pool.checkedout()
+    yield "idle", pool.checkedin()
+    yield "overflow", max(pool.overflow(), 0)
+
+
+# Global metrics registry
+metrics = Metrics()
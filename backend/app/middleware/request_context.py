@@ -0,0 +1,141 @@
+"""
+Pure ASGI request middleware: security headers, request ID, timing, query accounting,
+metrics and access logging
+"""
+
+import logging
+import random
+import time
+import uuid
+from typing import Iterable, List, Tuple
+
+from ..metrics import metrics
+from ..query_stats import query_scope
+
+logger = logging.getLogger("app.access")
+
+Header = Tuple[bytes, bytes]
+
+
+class RequestContextMiddleware:
+    """
+    Single pure-ASGI layer replacing SecurityHeadersMiddleware (BaseHTTPMiddleware) and
+    the @app.middleware("http") request logger. Headers are precomputed byte tuples and
+    appended to the response start message; no extra task or body stream is involved.
+
+    Access logs are structured (fields passed via `extra`) and sampled: every 5xx and
+    every request slower than slow_request_ms is logged, the rest at log_sample_rate.
+    Latency and status are recorded in the metrics registry under the matched route
+    template, which the router leaves in scope["route"].
+
+    SQL statements are counted per request; DB and app time go out as a Server-Timing
+    header, and statement shapes repeated n_plus_one_threshold times are logged as
+    possible N+1 queries.
+    """
+
+    def __init__(
+        self,
+        app,
+        environment: str,
+        domain: str,
+        docs_path: str,
+        frame_ancestor_domains: Iterable[str] = (),
+        log_sample_rate: float = 1.0,
+        slow_request_ms: float = 1000.0,
+        server_timing: bool = True,
+        n_plus_one_threshold: int = 5,
+    ):
+        self.app = app
+        self.docs_path = docs_path
+        self.log_sample_rate = log_sample_rate
+        self.slow_request_ms = slow_request_ms
+        self.server_timing = server_timing
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+        common: List[Header] = [
+            (b"x-content-type-options", b"nosniff"),
+            (b"x-xss-protection", b"1; mode=block"),
+            (b"referrer-policy", b"strict-origin-when-cross-origin"),
+        ]
+        if environment == "production":
+            common.append((b"strict-transport-security", b"max-age=31536000; includeSubDomains"))
+
+        # Docs may be embedded by the configured frontend domains; everything else is DENY
+        ancestors = [f"https://{domain}", f"https://www.{domain}"]
+        ancestors += [f"https://{d.strip()}" for d in frame_ancestor_domains if d.strip()]
+        self._default_headers = common + [(b"x-frame-options", b"DENY")]
+        self._docs_headers = common + [
+            (b"content-security-policy", ("frame-ancestors " + " ".join(ancestors)).encode("latin-1"))
+        ]
+        # Headers we own: drop any value set by the app so ours win (and docs lose X-Frame-Options)
+        self._owned = {name for name, _ in self._default_headers + self._docs_headers} | {
+            b"x-request-id", b"server-timing"
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        request_id = uuid.uuid4().hex[:8]
+        path = scope.get("path", "")
+        extra_headers = self._docs_headers if path.startswith(self.docs_path) else self._default_headers
+        status_code = 500
+        metrics.request_started()
+
+        with query_scope(request=scope) as query_stats:
+
+            async def send_with_headers(message):
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    headers = [h for h in message.get("headers", []) if h[0].lower() not in self._owned]
+                    headers.extend(extra_headers)
+                    headers.append((b"x-request-id", request_id.encode("ascii")))
+                    if self.server_timing:
+                        app_ms = (time.perf_counter() - start) * 1000
+                        headers.append((b"server-timing", (
+                            f'db;dur={query_stats.db_time * 1000:.1f};desc="{query_stats.count} queries", '
+                            f'app;dur={app_ms:.1f}'
+                        ).encode("ascii")))
+                    message["headers"] = headers
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_headers)
+            finally:
+                self._finish(scope, path, request_id, status_code, start, query_stats)
+
+    def _finish(self, scope, path, request_id, status_code, start, query_stats):
+        duration = time.perf_counter() - start
+        method = scope.get("method", "")
+        route = getattr(scope.get("route"), "path", None)
+        metrics.request_finished(method, route, status_code, duration)
+
+        duration_ms = duration * 1000
+        if (
+            status_code >= 500
+            or duration_ms >= self.slow_request_ms
+            or random.random() < self.log_sample_rate
+        ):
+            logger.info(
+                "%s %s %s %.1fms %dq [%s]",
+                method, path, status_code, duration_ms, query_stats.count, request_id,
+                extra={
+                    "request_id": request_id,
+                    "method": method,
+                    "path": path,
+                    "status_code": status_code,
+                    "duration_ms": round(duration_ms, 1),
+                    "queries": query_stats.count,
+                    "db_ms": round(query_stats.db_time * 1000, 1),
+                },
+            )
+
+        for shape, executions in query_stats.repeated_shapes(self.n_plus_one_threshold):
+            logger.warning(
+                "Possible N+1 in %s %s: %d executions of %s [%s]",
+                method, route or path, executions, shape[:200], request_id,
+                extra={"request_id": request_id, "route": route or path, "executions": executions, "statement": shape},
+            )
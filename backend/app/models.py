@@ -17,8 +17,9 @@ from sqlalchemy import (
     Float,
     ARRAY,
     UniqueConstraint,
+    Index,
 )
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -66,14 +67,14 @@ class Product(Base):
     brand_id: Mapped[int] = mapped_column(Integer, ForeignKey("brands.id"), nullable=False, index=True)
     category_id: Mapped[int] = mapped_column(Integer, ForeignKey("categories.id"), nullable=False, index=True)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
-    images: Mapped[dict] = mapped_column(JSON, default=dict)  # Universal images (separate for search)
+    images: Mapped[dict] = mapped_column(JSONB, default=dict)  # Universal images (separate for search)
     msrp_price: Mapped[Decimal | None] = mapped_column(Numeric(10, 2))
-    content: Mapped[dict] = mapped_column(JSON, default=dict)  # All AI-generated content (locales, models, artists, etc.)
+    content: Mapped[dict] = mapped_column(JSONB, default=dict)  # All AI-generated content (locales, models, artists, etc.)
     avg_rating: Mapped[Decimal | None] = mapped_column(Numeric(3, 2), default=0)
     review_count: Mapped[int] = mapped_column(Integer, default=0)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Product identifiers - these are important for e-commerce and inventory management
     gtin12: Mapped[str | None] = mapped_column(String(12), nullable=True, index=True)  # Global Trade Item Number (UPC)
@@ -85,7 +86,7 @@ class Product(Base):
     isbn: Mapped[str | None] = mapped_column(String(13), nullable=True, index=True)  # International Standard Book Number (for music books)
 
     # Crawler-specific fields
-    category_attributes: Mapped[dict] = mapped_column(JSON, default=dict)
+    category_attributes: Mapped[dict] = mapped_column(JSONB, default=dict)
     last_crawled: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
     # OpenAI-specific fields
@@ -314,3 +315,33 @@ class ProductVote(Base):
     __table_args__ = (UniqueConstraint('product_id', 'user_ip', name='uq_product_user_vote'),)
 
 
+# Materialized affiliate URLs - regenerated when store_links or store affiliate config change
+class ProductAffiliateUrl(Base):
+    __tablename__ = "product_affiliate_urls"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    product_id: Mapped[int] = mapped_column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False, index=True)
+    store_id: Mapped[int] = mapped_column(Integer, ForeignKey("affiliate_stores.id", ondelete="CASCADE"), nullable=False, index=True)
+    original_url: Mapped[str | None] = mapped_column(Text, nullable=True)  # Product URL from content.store_links (None = store fallback)
+    affiliate_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    generated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+    __table_args__ = (UniqueConstraint('product_id', 'store_id', name='uq_product_store_affiliate_url'),)
+
+
+# Normalized specification index built from Product.content['specifications']
+class ProductSpec(Base):
+    __tablename__ = "product_specs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    product_id: Mapped[int] = mapped_column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False, index=True)
+    spec_key: Mapped[str] = mapped_column(String(100), nullable=False)  # Canonical key (see services/spec_index.py)
+    raw_key: Mapped[str] = mapped_column(String(255), nullable=False)  # Key as it appears in content
+    value_text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    numeric_value: Mapped[float | None] = mapped_column(Float, nullable=True)  # Normalized to the base unit
+    unit: Mapped[str | None] = mapped_column(String(10), nullable=True)  # Base unit: kg, mm, W, Hz
+
+    __table_args__ = (
+        UniqueConstraint('product_id', 'spec_key', name='uq_product_spec_key'),
+        Index('ix_product_specs_key_numeric', 'spec_key', 'numeric_value'),
+    )
@@ -0,0 +1,127 @@
+"""
+Per-request SQL accounting through SQLAlchemy cursor events.
+
+RequestContextMiddleware opens a QueryStats scope for each request; every
+statement executed while it is active (including in tasks spawned from the
+request) adds to its count, DB time and statement-shape histogram. Shapes that
+repeat within one request are reported as possible N+1 patterns.
+
+Scopes nest, so tests can wrap requests and assert on the total:
+
+    with max_queries(4):
+        await client.get("/api/v1/compare?ids=1,2")
+"""
+
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+
+_PLACEHOLDER_RE = re.compile(r"\$\d+|%\(\w+\)s|\b\d+\b")
+_PLACEHOLDER_LIST_RE = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_current_stats: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so the same query with different parameters compares equal"""
+    shape = _PLACEHOLDER_RE.sub("?", statement)
+    shape = _PLACEHOLDER_LIST_RE.sub("?...", shape)
+    return _WHITESPACE_RE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """Query count, DB time and statement shapes for one scope"""
+
+    __slots__ = ("count", "db_time", "shapes", "parent", "request")
+
+    def __init__(self, parent: Optional["QueryStats"] = None, request: Optional[Dict[str, Any]] = None):
+        self.count = 0
+        self.db_time = 0.0
+        self.shapes: Counter = Counter()
+        self.parent = parent
+        # ASGI scope of the request being served, inherited by nested scopes
+        self.request = request if request is not None else (parent.request if parent else None)
+
+    def record(self, statement: str, duration: float) -> None:
+        shape = statement_shape(statement)
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.db_time += duration
+            stats.shapes[shape] += 1
+            stats = stats.parent
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed at least `threshold` times, most frequent first"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+def current_request() -> Optional[Dict[str, Any]]:
+    """ASGI scope of the request whose statements are currently being counted, if any"""
+    stats = _current_stats.get()
+    return stats.request if stats is not None else None
+
+
+def detach_query_scope() -> None:
+    """Stop attributing statements to the inherited scope (for tasks outliving a request)"""
+    _current_stats.set(None)
+
+
+@contextmanager
+def query_scope(request: Optional[Dict[str, Any]] = None) -> Iterator[QueryStats]:
+    """Collect statistics for statements executed inside the block (nested scopes roll up)"""
+    stats = QueryStats(parent=_current_stats.get(), request=request)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def max_queries(limit: int) -> Iterator[QueryStats]:
+    """Assert that the block executes at most `limit` statements"""
+    with query_scope() as stats:
+        yield stats
+    if stats.count > limit:
+        repeated = "; ".join(f"{n}x {shape[:120]}" for shape, n in stats.repeated_shapes(2)[:3])
+        raise AssertionError(f"Expected at most {limit} queries, got {stats.count}. Repeated: {repeated or 'none'}")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute does not run for failed statements
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+StatementObserver = Callable[[str, Any, float, Optional[QueryStats]], None]
+
+
+def instrument_engine(engine, on_statement: Optional[StatementObserver] = None) -> None:
+    """
+    Attach the cursor hooks to an (async or sync) engine. on_statement, when given,
+    is called with (statement, parameters, duration, active QueryStats) for every statement.
+    """
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_started"].pop()
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(statement, duration)
+        if on_statement is not None:
+            on_statement(statement, parameters, duration, stats)
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
@@ -0,0 +1,169 @@
+"""
+Fixed-memory rate limiting (GCRA) shared across workers through Redis.
+
+Each client/route-group pair is a single "theoretical arrival time" value, so
+memory does not grow with request volume. Redis holds the state when REDIS_URL
+is configured (one atomic script call per request); otherwise - or if Redis
+errors - an in-process LRU-bounded table is used.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import redis.asyncio as redis
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    limit: int  # requests allowed per period (also the burst size)
+    period: int  # seconds
+
+    @property
+    def interval(self) -> float:
+        return self.period / self.limit
+
+
+# Default limits per route group; override with RATE_LIMIT_RULES="search=30/60,default=200/60"
+DEFAULT_RATE_LIMITS: Dict[str, RateLimit] = {
+    "default": RateLimit(100, 60),
+    "search": RateLimit(60, 60),
+    "compare": RateLimit(60, 60),
+    "voting": RateLimit(20, 60),
+    "redirect": RateLimit(120, 60),
+}
+
+# Path prefix (below API_V1_STR) -> route group
+ROUTE_GROUPS: List[Tuple[str, str]] = [
+    ("/search", "search"),
+    ("/compare", "compare"),
+    ("/voting", "voting"),
+    ("/redirect", "redirect"),
+]
+
+# KEYS[1] = limiter key; ARGV = now, emission interval, period (seconds)
+# Returns {allowed (1/0), retry_after seconds as string}
+GCRA_SCRIPT = """
+local tat = tonumber(redis.call('GET', KEYS[1]))
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local period = tonumber(ARGV[3])
+if not tat or tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if now < allow_at then
+    return {0, tostring(allow_at - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, '0'}
+"""
+
+
+def parse_rate_limit_rules(rules: str) -> Dict[str, RateLimit]:
+    """Parse "group=limit/period,..." into RateLimit objects; invalid or non-positive entries are skipped"""
+    parsed: Dict[str, RateLimit] = {}
+    for rule in (rules or "").split(","):
+        if "=" not in rule:
+            continue
+        group, spec = rule.split("=", 1)
+        try:
+            limit, period = (int(part) for part in spec.strip().split("/", 1))
+            if limit <= 0 or period <= 0:
+                raise ValueError("limit and period must be positive")
+            parsed[group.strip()] = RateLimit(limit, period)
+        except ValueError:
+            logger.warning(f"Ignoring invalid rate limit rule: {rule!r}")
+    return parsed
+
+
+class RateLimiter:
+    """GCRA rate limiter with a Redis backend and an in-process LRU fallback"""
+
+    def __init__(self, limits: Optional[Dict[str, RateLimit]] = None, max_local_keys: int = 10000):
+        self.limits = {**DEFAULT_RATE_LIMITS, **(limits or {})}
+        self.max_local_keys = max_local_keys
+        self._local: "OrderedDict[str, float]" = OrderedDict()
+
+        self.redis_client = None
+        self.redis_available = False
+        self._redis_init_attempted = False
+        self._script = None
+
+    async def _get_redis_client(self):
+        if not self._redis_init_attempted:
+            await self._init_redis()
+        return self.redis_client if self.redis_available else None
+
+    async def _init_redis(self):
+        self._redis_init_attempted = True
+        redis_url = settings.REDIS_URL
+        if not redis_url or redis_url == "redis://localhost:6379":
+            logger.info("REDIS_URL not configured - rate limiting is per worker")
+            return
+        try:
+            self.redis_client = redis.from_url(
+                redis_url,
+                decode_responses=True,
+                socket_connect_timeout=5,
+                socket_timeout=2,
+            )
+            await self.redis_client.ping()
+            self._script = self.redis_client.register_script(GCRA_SCRIPT)
+            self.redis_available = True
+        except Exception as e:
+            logger.warning(f"Rate limiter Redis unavailable, using in-process limits: {e}")
+            self.redis_client = None
+            self.redis_available = False
+
+    def route_group(self, path: str) -> str:
+        """Map a request path to its rate limit group"""
+        if path.startswith(settings.API_V1_STR):
+            path = path[len(settings.API_V1_STR):]
+        for prefix, group in ROUTE_GROUPS:
+            if path.startswith(prefix):
+                return group
+        return "default"
+
+    def _check_local(self, key: str, rate: RateLimit, now: float) -> Tuple[bool, float]:
+        tat = self._local.get(key)
+        if tat is None or tat < now:
+            tat = now
+        new_tat = tat + rate.interval
+        allow_at = new_tat - rate.period
+        if now < allow_at:
+            self._local.move_to_end(key)
+            return False, allow_at - now
+
+        self._local[key] = new_tat
+        self._local.move_to_end(key)
+        # Evict least recently seen clients; an evicted client simply starts with a full burst
+        while len(self._local) > self.max_local_keys:
+            self._local.popitem(last=False)
+        return True, 0.0
+
+    async def hit(self, client_id: str, path: str) -> Tuple[bool, float]:
+        """Record a request; returns (allowed, retry_after_seconds)"""
+        group = self.route_group(path)
+        rate = self.limits.get(group, self.limits["default"])
+        key = f"ratelimit:{group}:{client_id}"
+        now = time.time()
+
+        if await self._get_redis_client():
+            try:
+                allowed, retry_after = await self._script(keys=[key], args=[now, rate.interval, rate.period])
+                return bool(int(allowed)), float(retry_after)
+            except Exception as e:
+                logger.warning(f"Rate limiter Redis call failed, using in-process limits: {e}")
+
+        return self._check_local(key, rate, now)
+
+
+rate_limiter = RateLimiter(parse_rate_limit_rules(settings.RATE_LIMIT_RULES))
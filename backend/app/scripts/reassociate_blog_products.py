@@ -11,10 +11,15 @@ Usage:
   python -m app.scripts.reassociate_blog_products --dry-run       # show changes only
   python -m app.scripts.reassociate_blog_products --limit 100     # process first 100 posts
   python -m app.scripts.reassociate_blog_products --commit        # apply updates
+  python -m app.scripts.reassociate_blog_products --use-related   # prefer the precomputed TF-IDF matches
 
 Notes:
 - Uses raw SQL via async_session_factory for portability.
+- Products are loaded once into an inverted index (app.services.product_matcher);
+  each post is matched with index lookups instead of a query per post.
 - Safe defaults: dry-run by default. Use --commit to write.
+- --use-related reads blog_post_related (app.scripts.rebuild_blog_similarity) and
+  only falls back to keyword SQL for posts without precomputed products.
 """
 
 import asyncio
@@ -27,6 +32,7 @@ from sqlalchemy import text
 from sqlalchemy.exc import ProgrammingError
 
 from ..database import async_session_factory
+from ..services.product_matcher import ProductIndex
 
 
 BRAND_KEYWORDS = [
@@ -84,66 +90,52 @@ def extract_keywords(
     return brands, cats
 
 
-async def load_products(session, brands: List[str], categories: List[str], limit: int = 12) -> List[Dict[str, Any]]:
-    where_clauses = [
-        "p.is_active = true",
-        "(p.name is not null and p.name != '')",
-    ]
-    params: Dict[str, Any] = {}
-
-    if brands:
-        where_clauses.append("lower(b.name) = ANY(:brands)")
-        params['brands'] = brands
-
-    if categories:
-        where_clauses.append("c.slug = ANY(:cats)")
-        params['cats'] = categories
-
-    where_sql = " AND ".join(where_clauses)
-    sql = f"""
+async def load_product_index(session) -> ProductIndex:
+    """All active products, best rated first, indexed once for the whole run"""
+    result = await session.execute(text(
+        """
         SELECT p.id, p.slug, p.name, p.avg_rating, p.review_count, COALESCE(p.msrp_price,0) as price,
-               b.name as brand, c.slug as category_slug
+               b.name as brand_name, c.name as category_name, c.slug as category_slug
         FROM products p
         JOIN brands b ON p.brand_id=b.id
         JOIN categories c ON p.category_id=c.id
-        WHERE {where_sql}
+        WHERE p.is_active = true AND (p.name is not null and p.name != '')
         ORDER BY (p.avg_rating IS NOT NULL) DESC, p.avg_rating DESC NULLS LAST, p.review_count DESC NULLS LAST
-        LIMIT :limit
-    """
-    params['limit'] = limit
-    result = await session.execute(text(sql), params)
-    return [dict(row._mapping) for row in result.fetchall()]
+        """
+    ))
+    return ProductIndex(dict(row._mapping) for row in result.fetchall())
 
 
-async def select_relevant_products(session, post: Dict[str, Any], max_count: int = 5) -> List[int]:
+def select_relevant_products(index: ProductIndex, post: Dict[str, Any], max_count: int = 5) -> List[int]:
     cj = post.get('content_json') or {}
     category_value = cj.get('category') if isinstance(cj, dict) else None
     tags = cj.get('tags') if isinstance(cj, dict) else None
     sections = cj.get('sections') if isinstance(cj, dict) else None
     brands, cats = extract_keywords(post['title'], category_value, tags=tags, sections=sections)
-    candidates = await load_products(session, brands, cats, limit=24)
 
+    # Products matching both brand and category rank first, then brand-only, then category-only
+    candidates = [product for product, _ in index.search(brands=brands, categories=cats, limit=max_count)]
     if not candidates:
         # fallback: popular products overall
-        result = await session.execute(text(
-            """
-            SELECT p.id FROM products p
-            WHERE p.is_active = true AND (p.name is not null and p.name != '')
-            ORDER BY p.review_count DESC NULLS LAST, p.avg_rating DESC NULLS LAST
-            LIMIT 24
-            """
-        ))
-        candidates = [{'id': r[0]} for r in result.fetchall()]
-
-    # De-duplicate and cap
-    ids: List[int] = []
-    for c in candidates:
-        pid = int(c['id'])
-        if pid not in ids:
-            ids.append(pid)
-        if len(ids) >= max_count:
-            break
-    return ids
+        candidates = index.top(max_count)
+    return [int(c['id']) for c in candidates]
+
+
+async def load_related_products(session, max_count: int = 5) -> Dict[int, List[int]]:
+    """Precomputed product matches per post from blog_post_related, best first"""
+    result = await session.execute(text(
+        """
+        SELECT r.post_id, r.related_id
+        FROM blog_post_related r
+        JOIN products p ON p.id = r.related_id AND p.is_active = true
+        WHERE r.kind = 'product' AND r.rank <= :max_count
+        ORDER BY r.post_id, r.rank
+        """
+    ), {'max_count': max_count})
+    related: Dict[int, List[int]] = {}
+    for post_id, product_id in result.fetchall():
+        related.setdefault(post_id, []).append(product_id)
+    return related
 
 
 async def get_posts(session, limit: int | None = None) -> List[Dict[str, Any]]:
@@ -198,14 +190,18 @@ async def update_post_products(session, post_id: int, product_ids: List[int]):
     )
 
 
-async def run(dry_run: bool = True, limit: int | None = None):
+async def run(dry_run: bool = True, limit: int | None = None, use_related: bool = False):
     async with async_session_factory() as session:
         posts = await get_posts(session, limit)
         print(f"Found {len(posts)} published posts to process")
 
+        related = await load_related_products(session, max_count=5) if use_related else {}
+        index = await load_product_index(session)
+        print(f"Indexed {len(index)} active products")
+
         changes = 0
         for post in posts:
-            new_ids = await select_relevant_products(session, post, max_count=5)
+            new_ids = related.get(int(post['id'])) or select_relevant_products(index, post, max_count=5)
             slug = post.get('slug')
             print(f"- {post['title']} (/{slug}) -> products {new_ids}")
             if not dry_run:
@@ -223,9 +219,10 @@ def main():
     parser = argparse.ArgumentParser(description="Re-associate blog posts with relevant products")
     parser.add_argument('--commit', action='store_true', help='Apply changes (otherwise dry-run)')
     parser.add_argument('--limit', type=int, default=None, help='Limit number of posts processed')
+    parser.add_argument('--use-related', action='store_true', help='Use precomputed related products where available')
     args = parser.parse_args()
 
-    asyncio.run(run(dry_run=not args.commit, limit=args.limit))
+    asyncio.run(run(dry_run=not args.commit, limit=args.limit, use_related=args.use_related))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Recompute related posts and related products for published blog posts.
+
+Incremental by default: only posts whose title, tags or sections changed since
+the last run (and new posts) are re-vectorized and re-ranked. Run --full
+periodically and after large product imports. GET /blog/posts/{slug}/related
+serves the stored results.
+
+Usage:
+  python -m app.scripts.rebuild_blog_similarity            # new/changed posts only
+  python -m app.scripts.rebuild_blog_similarity --full     # recompute everything
+  python -m app.scripts.rebuild_blog_similarity --top-k 12
+"""
+
+import asyncio
+import argparse
+import time
+
+from ..database import async_session_factory
+from ..services.blog_similarity import BlogSimilarityService, DEFAULT_TOP_K
+from ..services.cache_service import cache_service
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Rebuild related posts/products for blog posts')
+    parser.add_argument('--full', action='store_true', help='Recompute every post, not only changed ones')
+    parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K, help='Neighbours stored per post and kind')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    async with async_session_factory() as session:
+        service = BlogSimilarityService(session, top_k=args.top_k)
+        stats = await service.rebuild(full=args.full)
+
+    if stats['post_lists_written'] or args.full:
+        await cache_service.invalidate_prefix('blog_related:')
+    await cache_service.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Recomputed {stats['recomputed']}/{stats['posts']} posts against {stats['products']} products "
+        f"({stats['post_lists_written']} related-post lists written, {stats['vocabulary']} terms) in {elapsed:.1f}s"
+    )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
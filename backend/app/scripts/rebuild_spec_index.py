@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Rebuild the normalized specification index (product_specs) from Product.content.
+
+Ingest (openai/products_filled_parser.py, process_ratings_append_results.py)
+indexes products as it writes them; run this to backfill, or after editing
+specifications outside those paths. /products spec filters and /compare spec
+alignment read from this index.
+
+Usage:
+  python -m app.scripts.rebuild_spec_index                         # all products
+  python -m app.scripts.rebuild_spec_index --since 2025-09-01      # products updated since a date
+  python -m app.scripts.rebuild_spec_index --product-ids 10,11,12
+"""
+
+import asyncio
+import argparse
+import time
+from datetime import datetime
+
+from sqlalchemy import select
+
+from ..database import async_session_factory
+from ..models import Product
+from ..services.spec_index import SpecIndexService
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Rebuild the product spec index')
+    parser.add_argument('--product-ids', type=str, default=None, help='Comma-separated product IDs')
+    parser.add_argument('--since', type=str, default=None, help='Only products updated on/after YYYY-MM-DD')
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    async with async_session_factory() as session:
+        product_ids = None
+        if args.product_ids:
+            product_ids = [int(pid) for pid in args.product_ids.split(',') if pid.strip()]
+        elif args.since:
+            since = datetime.strptime(args.since, '%Y-%m-%d')
+            result = await session.execute(select(Product.id).where(Product.updated_at >= since))
+            product_ids = [row[0] for row in result.all()]
+
+        service = SpecIndexService(session)
+        stats = await service.reindex_products(product_ids=product_ids, batch_size=args.batch_size)
+
+    elapsed = time.perf_counter() - started
+    print(f"Indexed {stats['products_indexed']} products ({stats['spec_rows']} spec rows) in {elapsed:.1f}s")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Bulk-regenerate materialized affiliate URLs (product_affiliate_urls).
+
+The openai ingest scripts materialize each product's URLs as they write it; run
+this after store_links are changed any other way or store affiliate configuration
+is changed outside the API. Products are walked by keyset and each batch is
+written with one multi-row upsert.
+
+Usage:
+  python -m app.scripts.regenerate_affiliate_urls                  # all products, all stores
+  python -m app.scripts.regenerate_affiliate_urls --store-id 3     # one store only
+  python -m app.scripts.regenerate_affiliate_urls --product-ids 10,11,12
+"""
+
+import asyncio
+import argparse
+import time
+
+from ..database import async_session_factory
+from ..services.enhanced_affiliate_service import EnhancedAffiliateService
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Regenerate materialized affiliate URLs')
+    parser.add_argument('--store-id', type=int, default=None)
+    parser.add_argument('--product-ids', type=str, default=None, help='Comma-separated product IDs')
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    product_ids = None
+    if args.product_ids:
+        product_ids = [int(pid) for pid in args.product_ids.split(',') if pid.strip()]
+
+    started = time.perf_counter()
+    async with async_session_factory() as session:
+        service = EnhancedAffiliateService(session)
+        written = await service.regenerate_affiliate_urls(
+            product_ids=product_ids,
+            store_id=args.store_id,
+            batch_size=args.batch_size,
+        )
+    elapsed = time.perf_counter() - started
+    print(f"Regenerated {written} affiliate URLs in {elapsed:.1f}s")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
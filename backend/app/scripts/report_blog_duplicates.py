@@ -7,10 +7,13 @@ Heuristics:
 - Also strip common lead phrases ("the hidden truth about", "why", "inside") to catch near-duplicates
 - Group posts that share a normalized key
 - Pick canonical per group: published_at desc, then highest content_json.word_count, then created_at desc
+- --near: group by content instead (MinHash/LSH over shingled titles and sections,
+  scored by Jaccard; see app.services.blog_near_duplicates)
 
 Usage:
   .venv/bin/python -m backend.app.scripts.report_blog_duplicates --limit 200   # optional
   .venv/bin/python -m backend.app.scripts.report_blog_duplicates --json > dupes.json
+  .venv/bin/python -m backend.app.scripts.report_blog_duplicates --near --threshold 0.5
 """
 
 import asyncio
@@ -22,6 +25,7 @@ from typing import Any, Dict, List
 from sqlalchemy import text
 
 from ..database import async_session_factory
+from ..services.blog_near_duplicates import DEFAULT_THRESHOLD, NearDuplicateIndex, jaccard
 
 
 LEAD_PHRASES = [
@@ -88,12 +92,53 @@ def pick_canonical(group: List[Dict[str, Any]]) -> Dict[str, Any]:
     return sorted(group, key=score, reverse=True)[0]
 
 
+async def near_duplicate_report(threshold: float) -> List[Dict[str, Any]]:
+    """Content-level groups; alternates carry their Jaccard similarity to the canonical"""
+    async with async_session_factory() as session:
+        index = await NearDuplicateIndex.from_database(session, threshold)
+
+    report: List[Dict[str, Any]] = []
+    for group in index.duplicate_groups():
+        items = [index.posts[post_id] for post_id in group]
+        canonical = pick_canonical(items)
+        canonical_shingles = index.shingles[canonical['id']]
+        alternates = [
+            {
+                'id': item['id'], 'title': item['title'], 'slug': item['slug'],
+                'jaccard': round(jaccard(canonical_shingles, index.shingles[item['id']]), 3),
+            }
+            for item in items if item['id'] != canonical['id']
+        ]
+        report.append({
+            'key': canonical['title'],
+            'canonical': {'id': canonical['id'], 'title': canonical['title'], 'slug': canonical['slug']},
+            'alternates': sorted(alternates, key=lambda a: a['jaccard'], reverse=True),
+            'count': len(items),
+        })
+    return report
+
+
 async def main():
     parser = argparse.ArgumentParser(description='Report likely duplicate blog posts')
     parser.add_argument('--limit', type=int, default=None)
     parser.add_argument('--json', action='store_true', help='Output JSON only')
+    parser.add_argument('--near', action='store_true', help='Detect near-duplicate content instead of matching titles')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='Jaccard threshold for --near')
     args = parser.parse_args()
 
+    if args.near:
+        report = await near_duplicate_report(args.threshold)
+        if args.json:
+            print(json.dumps({'duplicate_groups': report}, default=str))
+            return
+        print(f"Near-duplicate groups (jaccard >= {args.threshold}): {len(report)}\n")
+        for grp in sorted(report, key=lambda x: x['count'], reverse=True)[:50]:
+            print(f"- {grp['canonical']['title']} /{grp['canonical']['slug']} (x{grp['count']})")
+            for alt in grp['alternates']:
+                print(f"  {alt['jaccard']:.2f}  {alt['title']} /{alt['slug']}")
+            print()
+        return
+
     posts = await fetch_posts(args.limit)
     groups: Dict[str, List[Dict[str, Any]]] = {}
     for p in posts:
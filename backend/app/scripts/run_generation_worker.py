@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Process queued AI blog generation jobs (POST /admin/blog/generate, POST /blog/generate and
+/admin/blog/clone-rewrite enqueue them into blog_generation_jobs).
+
+Run as many worker processes as the provider quota allows; jobs are claimed
+with SKIP LOCKED so workers never share a job. SIGINT/SIGTERM finish the jobs
+in flight and exit.
+
+Usage:
+  python -m app.scripts.run_generation_worker                  # poll forever
+  python -m app.scripts.run_generation_worker --concurrency 4  # jobs in flight per process
+  python -m app.scripts.run_generation_worker --drain          # run due jobs, then exit
+  LLM_PROVIDER=fake python -m app.scripts.run_generation_worker --drain   # offline
+"""
+
+import asyncio
+import argparse
+import logging
+import signal
+
+from ..services.blog_generation_jobs import BlogGenerationWorker
+from ..services.cache_service import cache_service
+from ..services.llm_client import RateLimitedLLMClient
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Run the AI blog generation job worker')
+    parser.add_argument('--concurrency', type=int, default=1, help='Jobs processed concurrently by this process')
+    parser.add_argument('--drain', action='store_true', help='Exit once no job is due instead of polling')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    worker = BlogGenerationWorker(concurrency=args.concurrency)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    processed = await worker.run(drain=args.drain)
+    await cache_service.close()
+    print(f"Worker {worker.worker_id} processed {processed} jobs ({worker.provider.name} provider)")
+    if isinstance(worker.provider, RateLimitedLLMClient):
+        print(worker.provider.summary())
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,389 @@
+"""
+Postgres-backed job queue for AI blog generation (table blog_generation_jobs).
+
+The admin API only enqueues; worker processes (app.scripts.run_generation_worker)
+claim due jobs with FOR UPDATE SKIP LOCKED, so any number of workers can poll
+the same table without handing out a job twice. A failed attempt goes back to
+pending with exponential backoff until max_attempts; a running job whose lock
+is older than GENERATION_JOB_LOCK_SECONDS (worker crashed or was killed) is
+claimed again by the next poll. Workers refresh the lock while a job runs, and
+the post is saved in the same transaction that completes the job.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import socket
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..database import async_session_factory
+from .blog_post_renderer import BlogPostRenderer
+from .llm_client import get_llm_client
+from .llm_providers import LLMProvider
+from .simple_blog_generator import SimpleBlogGenerator
+
+logger = logging.getLogger(__name__)
+
+JOB_KINDS = ("generate", "clone_rewrite")
+JOB_STATUSES = ("pending", "running", "completed", "failed", "cancelled")
+RETRY_BASE_SECONDS = 30
+SOURCE_TEXT_LIMIT = 12000
+
+JOB_COLUMNS = """
+    id, kind, status, payload, result, error_message, attempts, max_attempts, blog_post_id,
+    requested_by, locked_by, run_after, started_at, finished_at, created_at, updated_at
+"""
+
+CLAIM_SQL = text("""
+    UPDATE blog_generation_jobs j
+    SET status = 'running', attempts = j.attempts + 1, locked_by = :worker, locked_at = NOW(),
+        started_at = COALESCE(j.started_at, NOW()), updated_at = NOW()
+    WHERE j.id = (
+        SELECT id FROM blog_generation_jobs
+        WHERE (status = 'pending' AND run_after <= NOW())
+           OR (status = 'running' AND locked_at < NOW() - make_interval(secs => :lock_seconds)
+               AND attempts < max_attempts)
+        ORDER BY run_after, id
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING j.id, j.kind, j.payload, j.attempts, j.max_attempts, j.requested_by
+""")
+
+# Workers refresh the lock of a job they are running; see BlogGenerationWorker._heartbeat
+HEARTBEAT_SQL = text("""
+    UPDATE blog_generation_jobs SET locked_at = NOW()
+    WHERE id = :id AND locked_by = :worker AND status = 'running'
+""")
+
+# Running jobs whose worker vanished on their last attempt are not retried
+REAP_SQL = text("""
+    UPDATE blog_generation_jobs
+    SET status = 'failed', error_message = 'Worker stopped responding', finished_at = NOW(), updated_at = NOW()
+    WHERE status = 'running' AND locked_at < NOW() - make_interval(secs => :lock_seconds)
+      AND attempts >= max_attempts
+""")
+
+
+async def enqueue_job(db: AsyncSession, kind: str, payload: Dict[str, Any], requested_by: Optional[str] = None) -> Dict[str, Any]:
+    """Insert a pending job; the caller commits"""
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    result = await db.execute(
+        text(f"""
+            INSERT INTO blog_generation_jobs (kind, payload, requested_by, max_attempts)
+            VALUES (:kind, CAST(:payload AS JSONB), :requested_by, :max_attempts)
+            RETURNING {JOB_COLUMNS}
+        """),
+        {
+            "kind": kind,
+            "payload": json.dumps(payload),
+            "requested_by": requested_by,
+            "max_attempts": settings.GENERATION_JOB_MAX_ATTEMPTS,
+        },
+    )
+    return dict(result.fetchone()._mapping)
+
+
+def job_status(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Job fields shown while polling (payload and result bodies excluded)"""
+    return {
+        key: job[key] for key in (
+            "id", "kind", "status", "attempts", "max_attempts", "blog_post_id", "error_message",
+            "requested_by", "started_at", "finished_at", "created_at"
+        )
+    }
+
+
+async def get_job(db: AsyncSession, job_id: int) -> Optional[Dict[str, Any]]:
+    result = await db.execute(text(f"SELECT {JOB_COLUMNS} FROM blog_generation_jobs WHERE id = :id"), {"id": job_id})
+    row = result.fetchone()
+    return dict(row._mapping) if row else None
+
+
+async def list_jobs(db: AsyncSession, status: Optional[str] = None, limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
+    """Newest first, without payload/result bodies"""
+    where = "WHERE status = :status" if status else ""
+    result = await db.execute(
+        text(f"""
+            SELECT id, kind, status, error_message, attempts, max_attempts, blog_post_id,
+                   requested_by, started_at, finished_at, created_at
+            FROM blog_generation_jobs
+            {where}
+            ORDER BY created_at DESC, id DESC
+            LIMIT :limit OFFSET :offset
+        """),
+        {"status": status, "limit": limit, "offset": offset},
+    )
+    return [dict(row._mapping) for row in result.fetchall()]
+
+
+async def cancel_job(db: AsyncSession, job_id: int) -> bool:
+    """Cancel a job that has not started yet; the caller commits"""
+    result = await db.execute(
+        text("""
+            UPDATE blog_generation_jobs
+            SET status = 'cancelled', finished_at = NOW(), updated_at = NOW()
+            WHERE id = :id AND status = 'pending'
+        """),
+        {"id": job_id},
+    )
+    return result.rowcount > 0
+
+
+def _slugify(title: str) -> str:
+    slug = re.sub(r'[^a-zA-Z0-9\s-]', '', title.lower())
+    slug = re.sub(r'\s+', '-', slug)
+    return re.sub(r'-+', '-', slug).strip('-')[:100] or "post"
+
+
+def _html_to_text(html: str) -> str:
+    html = re.sub(r'(?is)<(script|style|noscript|nav|footer|header)\b.*?</\1>', ' ', html)
+    body = re.sub(r'(?s)<[^>]+>', ' ', html)
+    return re.sub(r'\s+', ' ', body).strip()
+
+
+class BlogGenerationWorker:
+    """Claims and runs generation jobs; concurrency is the number of jobs in flight in this process"""
+
+    def __init__(self, provider: Optional[LLMProvider] = None, concurrency: int = 1, poll_interval: Optional[float] = None):
+        self.provider = provider or get_llm_client()
+        self.generator = SimpleBlogGenerator(provider=self.provider)
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval if poll_interval is not None else settings.GENERATION_WORKER_POLL_SECONDS
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self, drain: bool = False) -> int:
+        """Poll until stop(), or with drain until no job is due; returns jobs processed"""
+        processed = 0
+
+        async def loop() -> None:
+            nonlocal processed
+            while not self._stopping.is_set():
+                job = await self.claim()
+                if job is None:
+                    if drain:
+                        return
+                    try:
+                        await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                processed += 1
+                await self.process(job)
+
+        await asyncio.gather(*(loop() for _ in range(self.concurrency)))
+        return processed
+
+    async def claim(self) -> Optional[Dict[str, Any]]:
+        async with async_session_factory() as session:
+            await session.execute(REAP_SQL, {"lock_seconds": settings.GENERATION_JOB_LOCK_SECONDS})
+            result = await session.execute(
+                CLAIM_SQL, {"worker": self.worker_id, "lock_seconds": settings.GENERATION_JOB_LOCK_SECONDS}
+            )
+            row = result.fetchone()
+            await session.commit()
+            return dict(row._mapping) if row else None
+
+    async def process(self, job: Dict[str, Any]) -> None:
+        logger.info(f"Running generation job {job['id']} ({job['kind']}, attempt {job['attempts']}/{job['max_attempts']})")
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            try:
+                if job["kind"] == "clone_rewrite":
+                    content = await self._clone_rewrite(job["payload"])
+                else:
+                    content = await self._generate(job["payload"])
+            finally:
+                heartbeat.cancel()
+            await self._complete(job, content)
+        except Exception as e:
+            logger.warning(f"Generation job {job['id']} failed: {e}")
+            await self._fail(job, str(e))
+
+    async def _heartbeat(self, job: Dict[str, Any]) -> None:
+        """Refresh locked_at while the job runs, so a generation slower than the lock timeout is not claimed again"""
+        interval = settings.GENERATION_JOB_LOCK_SECONDS / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with async_session_factory() as session:
+                    await session.execute(HEARTBEAT_SQL, {"id": job["id"], "worker": self.worker_id})
+                    await session.commit()
+            except Exception as e:
+                logger.warning(f"Heartbeat for generation job {job['id']} failed: {e}")
+
+    async def _load_inputs(self, payload: Dict[str, Any]) -> Tuple[str, List[Dict[str, Any]]]:
+        """Template name for template_id and the active products among product_ids"""
+        async with async_session_factory() as session:
+            template_name = "buying-guide"
+            if payload.get("template_id"):
+                result = await session.execute(
+                    text("SELECT name FROM blog_templates WHERE id = :id"), {"id": payload["template_id"]}
+                )
+                template_name = result.scalar() or template_name
+            products: List[Dict[str, Any]] = []
+            if payload.get("product_ids"):
+                result = await session.execute(
+                    text("""
+                        SELECT id, name, slug, COALESCE(msrp_price, 0) AS price, avg_rating AS rating
+                        FROM products
+                        WHERE id = ANY(:ids) AND is_active = true
+                    """),
+                    {"ids": payload["product_ids"]},
+                )
+                products = [dict(row._mapping) for row in result.fetchall()]
+        return template_name, products
+
+    async def _generate(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        template_name, products = await self._load_inputs(payload)
+        return await self.generator.generate_blog_post(
+            topic=payload["title"],
+            template_name=template_name,
+            products=products,
+            target_words=payload.get("target_word_count", 4000),
+            instructions=payload.get("custom_prompt_additions"),
+        )
+
+    async def _clone_rewrite(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch source_url and have the model rewrite its text as a new article"""
+        async with httpx.AsyncClient(timeout=20.0, follow_redirects=True) as client:
+            response = await client.get(payload["source_url"])
+            response.raise_for_status()
+        html = response.text
+        page_title = re.search(r'(?is)<title[^>]*>(.*?)</title>', html)
+        source_text = _html_to_text(html)[:SOURCE_TEXT_LIMIT]
+        if not source_text:
+            raise ValueError("Source page has no readable text")
+
+        instructions = (
+            "Rewrite the source article below as an original article for our readers. Do not copy sentences; "
+            "keep facts accurate and add practical buying advice.\n\nSOURCE ARTICLE:\n" + source_text
+        )
+        if payload.get("custom_instructions"):
+            instructions += "\n\n" + payload["custom_instructions"]
+
+        _, products = await self._load_inputs(payload)
+        topic = payload.get("title") or (page_title.group(1).strip() if page_title else payload["source_url"])
+        return await self.generator.generate_blog_post(
+            topic=topic,
+            template_name="news-feature",
+            products=products,
+            target_words=payload.get("target_word_count", 800),
+            instructions=instructions,
+        )
+
+    async def _insert_post(self, session: AsyncSession, content: Dict[str, Any], payload: Dict[str, Any], kind: str) -> Dict[str, Any]:
+        """Insert the generated post in the caller's transaction"""
+        status = "published" if payload.get("auto_publish") else "draft"
+        base_slug = _slugify(content["title"])
+        result = await session.execute(
+            text("SELECT slug FROM blog_posts WHERE slug = :slug OR slug LIKE :prefix"),
+            {"slug": base_slug, "prefix": f"{base_slug}-%"},
+        )
+        taken = {row[0] for row in result.fetchall()}
+        slug, counter = base_slug, 1
+        while slug in taken:
+            slug = f"{base_slug}-{counter}"
+            counter += 1
+
+        result = await session.execute(
+            text("""
+                INSERT INTO blog_posts (
+                    title, slug, excerpt, content_json, seo_title, seo_description,
+                    status, generated_by_ai, generation_model, generation_params,
+                    author_name, created_at, updated_at
+                ) VALUES (
+                    :title, :slug, :excerpt, CAST(:content_json AS JSONB), :seo_title, :seo_description,
+                    :status, true, :generation_model, CAST(:generation_params AS JSONB),
+                    :author_name, NOW(), NOW()
+                )
+                RETURNING id
+            """),
+            {
+                "title": content["title"],
+                "slug": slug,
+                "excerpt": content.get("excerpt", ""),
+                "content_json": json.dumps(content),
+                "seo_title": content.get("seo_title", content["title"]),
+                "seo_description": content.get("seo_description", content.get("excerpt", "")),
+                "status": status,
+                "generation_model": self.generator.model if self.provider.name == "openai" else self.provider.name,
+                "generation_params": json.dumps({"job_kind": kind, **payload.get("generation_params", {})}),
+                "author_name": "GetYourMusicGear Team",
+            },
+        )
+        return {"id": result.scalar(), "slug": slug, "status": status}
+
+    async def _complete(self, job: Dict[str, Any], content: Dict[str, Any]) -> None:
+        """
+        Save the post and mark the job completed in one transaction, so a crash or an
+        expired lock can never leave a saved post behind a job that runs again. Nothing
+        is written unless this worker still holds the job (as in _fail).
+        """
+        async with async_session_factory() as session:
+            result = await session.execute(
+                text("SELECT id FROM blog_generation_jobs WHERE id = :id AND locked_by = :worker AND status = 'running' FOR UPDATE"),
+                {"id": job["id"], "worker": self.worker_id},
+            )
+            if result.fetchone() is None:
+                await session.rollback()
+                logger.warning(f"Generation job {job['id']} is no longer held by {self.worker_id}; discarding its result")
+                return
+
+            post = await self._insert_post(session, content, job["payload"], job["kind"])
+            job_result = {
+                "blog_post_id": post["id"],
+                "slug": post["slug"],
+                "status": post["status"],
+                "title": content["title"],
+                "word_count": content.get("word_count"),
+                "content": content,
+            }
+            await session.execute(
+                text("""
+                    UPDATE blog_generation_jobs
+                    SET status = 'completed', result = CAST(:result AS JSONB), blog_post_id = :post_id,
+                        error_message = NULL, locked_by = NULL, locked_at = NULL,
+                        finished_at = NOW(), updated_at = NOW()
+                    WHERE id = :id
+                """),
+                {"id": job["id"], "result": json.dumps(job_result, default=str), "post_id": post["id"]},
+            )
+            await session.commit()
+            if post["status"] == "published":
+                await BlogPostRenderer(session).refresh_posts([post["id"]])
+        logger.info(f"Generation job {job['id']} completed: post {post['id']} ({post['slug']})")
+
+    async def _fail(self, job: Dict[str, Any], error: str) -> None:
+        retry = job["attempts"] < job["max_attempts"]
+        async with async_session_factory() as session:
+            await session.execute(
+                text("""
+                    UPDATE blog_generation_jobs
+                    SET status = CASE WHEN :retry THEN 'pending' ELSE 'failed' END,
+                        run_after = NOW() + make_interval(secs => :delay),
+                        finished_at = CASE WHEN :retry THEN NULL ELSE NOW() END,
+                        error_message = :error, locked_by = NULL, locked_at = NULL, updated_at = NOW()
+                    WHERE id = :id AND locked_by = :worker
+                """),
+                {
+                    "id": job["id"],
+                    "worker": self.worker_id,
+                    "retry": retry,
+                    "delay": RETRY_BASE_SECONDS * 2 ** (job["attempts"] - 1),
+                    "error": error[:2000],
+                },
+            )
+            await session.commit()
@@ -0,0 +1,184 @@
+"""
+Content-level near-duplicate detection for blog posts with MinHash and LSH.
+
+Each post becomes a set of word shingles over its title, section titles and
+section bodies. A MinHash signature estimates the Jaccard similarity of two
+such sets; LSH banding puts signatures that agree on a whole band into the
+same bucket, so only posts sharing a bucket are compared. With the defaults
+(128 permutations, 32 bands of 4 rows) the LSH threshold (1/bands)^(1/rows) is
+about 0.42, and pairs at Jaccard 0.6 become candidates with ~99% probability.
+Candidates are then scored with the exact Jaccard of their shingle sets.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+LSH_BANDS = 32
+DEFAULT_THRESHOLD = 0.6
+
+# Universal hashing (a*x + b) mod p over 32-bit shingle hashes; p < 2^31 keeps
+# a*x below 2^63, so the arithmetic stays inside uint64
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def post_text(title: Optional[str], content_json: Any) -> str:
+    parts = [title or ""]
+    sections = content_json.get("sections") if isinstance(content_json, dict) else None
+    for section in sections if isinstance(sections, list) else []:
+        if isinstance(section, dict):
+            parts.append(str(section.get("title") or ""))
+            parts.append(str(section.get("content") or ""))
+    return " ".join(parts)
+
+
+def shingles(value: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """32-bit hashes of the word n-grams of value (the whole text when it is shorter than size)"""
+    tokens = _TOKEN_RE.findall(value.lower())
+    if not tokens:
+        return set()
+    grams = (" ".join(tokens[i:i + size]) for i in range(max(1, len(tokens) - size + 1)))
+    return {int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=4).digest(), "little") for gram in grams}
+
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """Fixed family of NUM_PERM hash permutations; equal seeds give comparable signatures"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self._a = rng.randint(1, int(_MERSENNE_PRIME), size=num_perm).astype(np.uint64)[:, None]
+        self._b = rng.randint(0, int(_MERSENNE_PRIME), size=num_perm).astype(np.uint64)[:, None]
+
+    def signature(self, shingle_set: Set[int]) -> np.ndarray:
+        if not shingle_set:
+            return np.full(self.num_perm, int(_MERSENNE_PRIME), dtype=np.uint64)
+        values = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set))[None, :]
+        return ((self._a * values + self._b) % _MERSENNE_PRIME).min(axis=1)
+
+
+class LshIndex:
+    """Band buckets over MinHash signatures"""
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = LSH_BANDS):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(bands)]
+
+    def _band_keys(self, signature: np.ndarray) -> Iterable[Tuple[int, bytes]]:
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def add(self, key: int, signature: np.ndarray) -> None:
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band][band_key].append(key)
+
+    def query(self, signature: np.ndarray) -> Set[int]:
+        candidates: Set[int] = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        return candidates
+
+    def candidate_pairs(self) -> Set[Tuple[int, int]]:
+        pairs: Set[Tuple[int, int]] = set()
+        for buckets in self._buckets:
+            for keys in buckets.values():
+                if len(keys) < 2:
+                    continue
+                for i, first in enumerate(keys):
+                    for second in keys[i + 1:]:
+                        pairs.add((first, second) if first < second else (second, first))
+        return pairs
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index of blog posts keyed by post id"""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = NUM_PERM, bands: int = LSH_BANDS):
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm)
+        self.lsh = LshIndex(num_perm, bands)
+        self.shingles: Dict[int, Set[int]] = {}
+        self.posts: Dict[int, Dict[str, Any]] = {}
+
+    @classmethod
+    async def from_database(
+        cls, session: AsyncSession, threshold: float = DEFAULT_THRESHOLD, statuses: Optional[List[str]] = None
+    ) -> "NearDuplicateIndex":
+        """Index every post (or only the given statuses)"""
+        sql = "SELECT id, title, slug, status, content_json, published_at, created_at FROM blog_posts"
+        params: Dict[str, Any] = {}
+        if statuses:
+            sql += " WHERE status = ANY(:statuses)"
+            params["statuses"] = statuses
+        result = await session.execute(text(sql), params)
+        index = cls(threshold)
+        for row in result.fetchall():
+            post = dict(row._mapping)
+            index.add(post["id"], post["title"], post["content_json"], post)
+        return index
+
+    def add(self, post_id: int, title: Optional[str], content_json: Any, info: Optional[Dict[str, Any]] = None) -> None:
+        shingle_set = shingles(post_text(title, content_json))
+        self.shingles[post_id] = shingle_set
+        self.posts[post_id] = info or {"id": post_id, "title": title}
+        if shingle_set:
+            self.lsh.add(post_id, self.hasher.signature(shingle_set))
+
+    def find_similar(self, title: Optional[str], content_json: Any) -> List[Tuple[int, float]]:
+        """Indexed posts at or above the threshold for unsaved content, most similar first"""
+        shingle_set = shingles(post_text(title, content_json))
+        if not shingle_set:
+            return []
+        matches = []
+        for post_id in self.lsh.query(self.hasher.signature(shingle_set)):
+            score = jaccard(shingle_set, self.shingles[post_id])
+            if score >= self.threshold:
+                matches.append((post_id, score))
+        return sorted(matches, key=lambda match: match[1], reverse=True)
+
+    def duplicate_pairs(self) -> List[Tuple[int, int, float]]:
+        """(post_id, post_id, jaccard) for every indexed pair at or above the threshold"""
+        pairs = []
+        for first, second in self.lsh.candidate_pairs():
+            score = jaccard(self.shingles[first], self.shingles[second])
+            if score >= self.threshold:
+                pairs.append((first, second, score))
+        return sorted(pairs, key=lambda pair: pair[2], reverse=True)
+
+    def duplicate_groups(self) -> List[List[int]]:
+        """Connected components of the duplicate pairs (posts that are transitively near-duplicates)"""
+        parent: Dict[int, int] = {}
+
+        def find(key: int) -> int:
+            parent.setdefault(key, key)
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        for first, second, _ in self.duplicate_pairs():
+            parent[find(first)] = find(second)
+
+        groups: Dict[int, List[int]] = defaultdict(list)
+        for key in parent:
+            groups[find(key)].append(key)
+        return [sorted(members) for members in groups.values() if len(members) > 1]
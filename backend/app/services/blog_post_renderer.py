@@ -0,0 +1,203 @@
+"""
+Pre-rendered public blog post payloads.
+
+A published post is rendered once (tags, featured products, concatenated section
+content) into the JSON body served by GET /blog/posts/{slug}, together with an
+ETag, and kept in the two-tier cache under blog_post:{slug}. Admin writes call
+refresh_posts() to drop and re-render the affected slugs, so post reads are a
+cache lookup.
+
+First pages of GET /blog/posts are cached under blog_posts:{...} for a short
+TTL; the same refreshes drop them so a newly published post shows up at once.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .cache_service import cache_service
+
+logger = logging.getLogger(__name__)
+
+# Admin endpoints refresh entries on write; the TTL bounds staleness for posts
+# changed outside the API (batch processor, maintenance scripts)
+BLOG_POST_CACHE_TTL = 3600
+
+
+# First listing pages per category/tag/sort; short because view counts change underneath
+BLOG_LISTING_CACHE_TTL = 60
+BLOG_LISTING_CACHE_PREFIX = "blog_posts:"
+
+
+def blog_post_cache_key(slug: str) -> str:
+    return f"blog_post:{slug}"
+
+
+def blog_listing_cache_key(category: Optional[str], tag: Optional[str], sort_by: Optional[str], limit: int) -> str:
+    return f"{BLOG_LISTING_CACHE_PREFIX}{category or '*'}:{tag or '*'}:{sort_by or 'latest'}:{limit}"
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+class BlogPostRenderer:
+    """Builds and caches the public payload for published blog posts"""
+
+    def __init__(self, db_session: AsyncSession):
+        self.db = db_session
+
+    async def render(self, slug: str) -> Optional[Dict[str, Any]]:
+        """Render a published post into {"id", "etag", "body"}; None when not found or unpublished"""
+        result = await self.db.execute(
+            text("""
+            SELECT
+                bp.id, bp.title, bp.slug, bp.excerpt, bp.content_json, bp.featured_image,
+                bp.author_name, bp.status, bp.seo_title, bp.seo_description,
+                bp.reading_time, bp.published_at, bp.created_at, bp.updated_at,
+                bp.noindex, bp.category_slug, bp.tag_names, bp.tag_slugs,
+                COALESCE(s.view_count, 0) AS view_count
+            FROM blog_posts bp
+            LEFT JOIN blog_post_stats s ON s.post_id = bp.id
+            WHERE bp.slug = :slug AND bp.status = 'published'
+            """),
+            {"slug": slug},
+        )
+        row = result.fetchone()
+        if not row:
+            return None
+
+        content_json = row.content_json or {}
+        products = await self._load_products(row.id, content_json.get("featured_products"))
+
+        # Section bodies joined for clients that render plain content
+        content = "Content available in JSON format"
+        sections = content_json.get("sections")
+        if isinstance(sections, list):
+            parts = [
+                section.get("content", "").strip()
+                for section in sections
+                if isinstance(section, dict) and (section.get("content") or "").strip()
+            ]
+            if parts:
+                content = "\n\n".join(parts)
+
+        payload = {
+            "id": row.id,
+            "title": row.title,
+            "slug": row.slug,
+            "excerpt": row.excerpt,
+            "content": content,
+            "structured_content": None,  # Deprecated alias; content_json carries the same document
+            "content_json": content_json,
+            "featured_image": row.featured_image,
+            "category": {
+                "id": 1,
+                "name": row.category_slug,
+                "slug": row.category_slug,
+                "description": "Content category",
+                "icon": "📝",
+                "color": "#6366f1",
+                "sort_order": 1,
+                "is_active": True,
+            },
+            "author_name": row.author_name,
+            "status": row.status,
+            "seo_title": row.seo_title,
+            "seo_description": row.seo_description,
+            "reading_time": row.reading_time,
+            "view_count": row.view_count,  # as of render time
+            "featured": False,
+            "noindex": row.noindex or False,
+            "published_at": _iso(row.published_at),
+            "created_at": _iso(row.created_at),
+            "updated_at": _iso(row.updated_at),
+            "tags": [
+                {"id": i + 1, "name": name, "slug": slug}
+                for i, (name, slug) in enumerate(zip(row.tag_names or [], row.tag_slugs or []))
+            ],
+            "products": products,
+        }
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str)
+        etag = '"' + hashlib.md5(body.encode("utf-8")).hexdigest() + '"'
+        return {"id": row.id, "etag": etag, "body": body}
+
+    async def _load_products(self, post_id: int, product_ids: Any) -> List[Dict[str, Any]]:
+        if not product_ids or not isinstance(product_ids, list):
+            return []
+        try:
+            result = await self.db.execute(
+                text("""
+                SELECT p.id, p.name, p.slug, b.name as brand_name
+                FROM products p
+                JOIN brands b ON p.brand_id = b.id
+                WHERE p.id = ANY(:product_ids) AND p.is_active = true
+                """),
+                {"product_ids": [int(pid) for pid in product_ids]},
+            )
+        except Exception as e:
+            logger.warning(f"Error loading products for post {post_id}: {e}")
+            return []
+        return [
+            {
+                "id": row[0],
+                "product_id": row[0],
+                "position": 0,
+                "context": None,
+                "product_name": row[1],
+                "product_slug": row[2],
+                "product_brand": row[3],
+            }
+            for row in result.fetchall()
+        ]
+
+    async def get(self, slug: str) -> Optional[Dict[str, Any]]:
+        """Cached rendered post, rendering and caching it on a miss"""
+        key = blog_post_cache_key(slug)
+        rendered = await cache_service.get(key)
+        if rendered is None:
+            rendered = await self.render(slug)
+            if rendered is None:
+                return None
+            await cache_service.set(key, rendered, BLOG_POST_CACHE_TTL)
+        return rendered
+
+    async def refresh_posts(self, post_ids: Optional[Iterable[int]] = None, slugs: Iterable[str] = ()) -> int:
+        """
+        Drop cached payloads (and listing pages) for the given posts and pre-render the
+        ones that are published. Call after the write is committed. Returns the number re-rendered.
+        """
+        slugs = set(slugs)
+        ids = list(post_ids or [])
+        if ids:
+            result = await self.db.execute(text("SELECT slug FROM blog_posts WHERE id = ANY(:ids)"), {"ids": ids})
+            slugs.update(row[0] for row in result.fetchall())
+
+        await cache_service.invalidate_prefix(BLOG_LISTING_CACHE_PREFIX)
+
+        rendered_count = 0
+        for slug in slugs:
+            await cache_service.delete(blog_post_cache_key(slug))
+            rendered = await self.render(slug)
+            if rendered is not None:
+                await cache_service.set(blog_post_cache_key(slug), rendered, BLOG_POST_CACHE_TTL)
+                rendered_count += 1
+        return rendered_count
+
+    async def invalidate(self, slugs: Iterable[str]) -> None:
+        """
+        Drop cached payloads for slugs and the listing pages without re-rendering, for
+        bulk writes; posts render again on their next read.
+        """
+        await cache_service.delete(*[blog_post_cache_key(slug) for slug in set(slugs)])
+        await cache_service.invalidate_prefix(BLOG_LISTING_CACHE_PREFIX)
+
+    async def refresh_all(self) -> None:
+        """Invalidate every cached post and listing page (bulk operations over all posts)"""
+        await cache_service.invalidate_prefix("blog_post:")
+        await cache_service.invalidate_prefix(BLOG_LISTING_CACHE_PREFIX)
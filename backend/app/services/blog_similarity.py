@@ -0,0 +1,314 @@
+"""
+Precomputed "related posts" and "related products" for blog posts.
+
+Published posts (title, tags, section titles and bodies) and active products
+(name, brand, category) are vectorized into one TF-IDF space with SciPy sparse
+matrices, so post-post and post-product similarity are both a sparse product of
+L2-normalized rows. The top-K neighbours of each post are stored in
+blog_post_related and served by GET /blog/posts/{slug}/related.
+
+Incremental runs recompute only posts whose text fingerprint changed (or that
+are new), and merge their fresh scores into the stored lists of the other posts
+so a new post can show up as their neighbour. Stored lists that pointed at a
+changed or unpublished post are re-ranked against the whole corpus, so they are
+refilled instead of shrinking. Scores of untouched rows keep the IDF of the run
+that wrote them; run with full=True periodically (and after large product
+imports, since products only enter lists of recomputed posts).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_TOP_K = 8
+# Pairs below this cosine share little more than common vocabulary
+MIN_SCORE = 0.05
+# Rows per sparse product; a chunk of scores is chunk_size x corpus size float32
+CHUNK_SIZE = 256
+
+# Term weights per field before sublinear TF scaling
+TITLE_WEIGHT = 3
+TAG_WEIGHT = 2
+BRAND_WEIGHT = 2
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:['-][a-z0-9]+)*")
+_STOPWORDS = frozenset("""
+a about after all also an and any are as at be because been best but by can could do does for from get
+has have how i if in into is it its just like more most much my new no not of on one or our out over
+so some than that the their them then there these they this to up us use was we what when which while
+who why will with without you your
+""".split())
+
+
+def tokenize(value: Any) -> List[str]:
+    if not value:
+        return []
+    return [token for token in _TOKEN_RE.findall(str(value).lower()) if token not in _STOPWORDS and len(token) > 1]
+
+
+def post_terms(title: Optional[str], tags: Optional[Iterable[str]], content_json: Any) -> Counter:
+    terms: Counter = Counter()
+    for token in tokenize(title):
+        terms[token] += TITLE_WEIGHT
+    for tag in tags or []:
+        for token in tokenize(tag):
+            terms[token] += TAG_WEIGHT
+    sections = content_json.get("sections") if isinstance(content_json, dict) else None
+    for section in sections if isinstance(sections, list) else []:
+        if isinstance(section, dict):
+            terms.update(tokenize(section.get("title")))
+            terms.update(tokenize(section.get("content")))
+    return terms
+
+
+def product_terms(name: Optional[str], brand: Optional[str], category: Optional[str]) -> Counter:
+    terms = Counter(tokenize(name))
+    terms.update(tokenize(category))
+    for token in tokenize(brand):
+        terms[token] += BRAND_WEIGHT
+    return terms
+
+
+def terms_fingerprint(terms: Counter) -> str:
+    """Stable hash of a term bag; changes only when the vectorized text does"""
+    digest = hashlib.md5()
+    for term, count in sorted(terms.items()):
+        digest.update(f"{term}:{count};".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class TfidfSpace:
+    """L2-normalized TF-IDF rows (sublinear TF, smoothed IDF) for a list of term bags"""
+
+    def __init__(self, documents: Sequence[Counter]):
+        vocabulary: Dict[str, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        counts: List[float] = []
+        for row, terms in enumerate(documents):
+            for term, count in terms.items():
+                rows.append(row)
+                cols.append(vocabulary.setdefault(term, len(vocabulary)))
+                counts.append(count)
+
+        shape = (len(documents), len(vocabulary))
+        tf = sparse.csr_matrix((np.asarray(counts, dtype=np.float32), (rows, cols)), shape=shape)
+        tf.data = 1.0 + np.log(tf.data)
+
+        document_frequency = np.bincount(tf.indices, minlength=shape[1])
+        idf = (np.log((1.0 + shape[0]) / (1.0 + document_frequency)) + 1.0).astype(np.float32)
+        weighted = tf @ sparse.diags(idf)
+
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        self.matrix = (sparse.diags((1.0 / norms).astype(np.float32)) @ weighted).tocsr()
+        self.vocabulary = vocabulary
+
+
+def top_k(scores: np.ndarray, k: int, min_score: float = MIN_SCORE) -> List[Tuple[int, float]]:
+    """Indices and scores of the k highest entries at or above min_score, best first"""
+    if scores.size == 0 or k <= 0:
+        return []
+    k = min(k, scores.size)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return [(int(i), float(scores[i])) for i in candidates if scores[i] >= min_score]
+
+
+class BlogSimilarityService:
+    """Computes and stores top-K related posts and products per published post"""
+
+    def __init__(self, db_session: AsyncSession, top_k: int = DEFAULT_TOP_K):
+        self.db = db_session
+        self.top_k = top_k
+
+    async def _load_posts(self) -> List[Dict[str, Any]]:
+        result = await self.db.execute(text("""
+            SELECT id, title, tag_names, content_json
+            FROM blog_posts
+            WHERE status = 'published'
+            ORDER BY id
+        """))
+        return [dict(row._mapping) for row in result.fetchall()]
+
+    async def _load_products(self) -> List[Dict[str, Any]]:
+        result = await self.db.execute(text("""
+            SELECT p.id, p.name, b.name AS brand, c.name AS category
+            FROM products p
+            JOIN brands b ON p.brand_id = b.id
+            JOIN categories c ON p.category_id = c.id
+            WHERE p.is_active = true
+            ORDER BY p.id
+        """))
+        return [dict(row._mapping) for row in result.fetchall()]
+
+    async def _load_fingerprints(self) -> Dict[int, str]:
+        result = await self.db.execute(text("SELECT post_id, doc_hash FROM blog_post_similarity_state"))
+        return {row[0]: row[1] for row in result.fetchall()}
+
+    async def _load_related(self, kind: str) -> Dict[int, List[Tuple[int, float]]]:
+        result = await self.db.execute(
+            text("SELECT post_id, related_id, score FROM blog_post_related WHERE kind = :kind ORDER BY post_id, rank"),
+            {"kind": kind},
+        )
+        related: Dict[int, List[Tuple[int, float]]] = {}
+        for post_id, related_id, score in result.fetchall():
+            related.setdefault(post_id, []).append((related_id, score))
+        return related
+
+    async def rebuild(self, full: bool = False, chunk_size: int = CHUNK_SIZE) -> Dict[str, int]:
+        """Recompute changed posts (every post when full) and store the results; commits"""
+        posts = await self._load_posts()
+        if not posts:
+            return {"posts": 0, "products": 0, "recomputed": 0, "post_lists_written": 0, "vocabulary": 0}
+        products = await self._load_products()
+
+        documents = [post_terms(p["title"], p["tag_names"], p["content_json"]) for p in posts]
+        fingerprints = [terms_fingerprint(terms) for terms in documents]
+        stored_fingerprints = {} if full else await self._load_fingerprints()
+        changed = [i for i, post in enumerate(posts) if stored_fingerprints.get(post["id"]) != fingerprints[i]]
+
+        space = TfidfSpace(documents + [product_terms(p["name"], p["brand"], p["category"]) for p in products])
+        post_matrix = space.matrix[:len(posts)]
+        product_matrix = space.matrix[len(posts):]
+        post_ids = [post["id"] for post in posts]
+        product_ids = [product["id"] for product in products]
+
+        related_posts: Dict[int, List[Tuple[int, float]]] = {}
+        related_products: Dict[int, List[Tuple[int, float]]] = {}
+        for start in range(0, len(changed), chunk_size):
+            chunk = changed[start:start + chunk_size]
+            post_scores = (post_matrix[chunk] @ post_matrix.T).toarray()
+            post_scores[np.arange(len(chunk)), chunk] = -1.0  # never related to itself
+            product_scores = (post_matrix[chunk] @ product_matrix.T).toarray() if products else None
+            for row, index in enumerate(chunk):
+                post_id = post_ids[index]
+                related_posts[post_id] = [(post_ids[j], score) for j, score in top_k(post_scores[row], self.top_k)]
+                related_products[post_id] = (
+                    [(product_ids[j], score) for j, score in top_k(product_scores[row], self.top_k)]
+                    if product_scores is not None else []
+                )
+
+        if not full:
+            related_posts.update(await self._merge_into_unchanged(posts, post_matrix, changed, chunk_size))
+
+        await self._write("post", related_posts)
+        await self._write("product", related_products)
+        await self._write_fingerprints({post_ids[i]: fingerprints[i] for i in changed})
+        # Unpublished posts lose their lists and their fingerprint, so republishing one
+        # recomputes it even when its text is unchanged
+        await self.db.execute(
+            text("""
+                WITH dropped_state AS (
+                    DELETE FROM blog_post_similarity_state WHERE NOT (post_id = ANY(:ids))
+                )
+                DELETE FROM blog_post_related WHERE NOT (post_id = ANY(:ids))
+            """),
+            {"ids": post_ids},
+        )
+        await self.db.commit()
+
+        return {
+            "posts": len(posts),
+            "products": len(products),
+            "recomputed": len(changed),
+            "post_lists_written": len(related_posts),
+            "vocabulary": len(space.vocabulary),
+        }
+
+    async def _merge_into_unchanged(
+        self, posts: List[Dict[str, Any]], post_matrix, changed: List[int], chunk_size: int
+    ) -> Dict[int, List[Tuple[int, float]]]:
+        """
+        Stored lists of unchanged posts with fresh scores against the changed posts merged in.
+        Lists that referenced a changed or unpublished post are re-ranked against every post
+        instead, since dropping that entry would leave a slot the stored list cannot refill.
+        Only lists that differ are returned.
+        """
+        post_ids = [post["id"] for post in posts]
+        published = set(post_ids)
+        changed_ids = [post_ids[i] for i in changed]
+        changed_set = set(changed_ids)
+        changed_matrix = post_matrix[changed]
+        stored = await self._load_related("post")
+        unchanged = [i for i, post_id in enumerate(post_ids) if post_id not in changed_set]
+        stale = [
+            i for i in unchanged
+            if any(rid not in published or rid in changed_set for rid, _ in stored.get(post_ids[i], []))
+        ]
+        stale_set = set(stale)
+        mergeable = [i for i in unchanged if i not in stale_set]
+
+        updated: Dict[int, List[Tuple[int, float]]] = {}
+        for start in range(0, len(mergeable), chunk_size):
+            chunk = mergeable[start:start + chunk_size]
+            scores = (post_matrix[chunk] @ changed_matrix.T).toarray() if changed else None
+            for row, index in enumerate(chunk):
+                post_id = post_ids[index]
+                current = stored.get(post_id, [])
+                merged = list(current)
+                if scores is not None:
+                    merged += [(changed_ids[j], float(scores[row, j])) for j in np.flatnonzero(scores[row] >= MIN_SCORE)]
+                merged = sorted(merged, key=lambda pair: pair[1], reverse=True)[:self.top_k]
+                if merged != current:
+                    updated[post_id] = merged
+
+        for start in range(0, len(stale), chunk_size):
+            chunk = stale[start:start + chunk_size]
+            scores = (post_matrix[chunk] @ post_matrix.T).toarray()
+            scores[np.arange(len(chunk)), chunk] = -1.0
+            for row, index in enumerate(chunk):
+                updated[post_ids[index]] = [(post_ids[j], score) for j, score in top_k(scores[row], self.top_k)]
+        return updated
+
+    async def _write(self, kind: str, related: Dict[int, List[Tuple[int, float]]]) -> None:
+        if not related:
+            return
+        await self.db.execute(
+            text("DELETE FROM blog_post_related WHERE kind = :kind AND post_id = ANY(:ids)"),
+            {"kind": kind, "ids": list(related)},
+        )
+        post_ids: List[int] = []
+        ranks: List[int] = []
+        related_ids: List[int] = []
+        scores: List[float] = []
+        for post_id, neighbours in related.items():
+            for rank, (related_id, score) in enumerate(neighbours, start=1):
+                post_ids.append(post_id)
+                ranks.append(rank)
+                related_ids.append(related_id)
+                scores.append(round(score, 6))
+        if not post_ids:
+            return
+        await self.db.execute(
+            text("""
+                INSERT INTO blog_post_related (post_id, kind, rank, related_id, score, computed_at)
+                SELECT v.post_id, :kind, v.rank, v.related_id, v.score, NOW()
+                FROM unnest(
+                    CAST(:post_ids AS integer[]), CAST(:ranks AS smallint[]),
+                    CAST(:related_ids AS integer[]), CAST(:scores AS double precision[])
+                ) AS v(post_id, rank, related_id, score)
+            """),
+            {"kind": kind, "post_ids": post_ids, "ranks": ranks, "related_ids": related_ids, "scores": scores},
+        )
+
+    async def _write_fingerprints(self, fingerprints: Dict[int, str]) -> None:
+        if not fingerprints:
+            return
+        await self.db.execute(
+            text("""
+                INSERT INTO blog_post_similarity_state (post_id, doc_hash, computed_at)
+                SELECT v.post_id, v.doc_hash, NOW()
+                FROM unnest(CAST(:post_ids AS integer[]), CAST(:hashes AS varchar[])) AS v(post_id, doc_hash)
+                ON CONFLICT (post_id) DO UPDATE SET doc_hash = EXCLUDED.doc_hash, computed_at = EXCLUDED.computed_at
+            """),
+            {"post_ids": list(fingerprints), "hashes": list(fingerprints.values())},
+        )
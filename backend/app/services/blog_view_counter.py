@@ -0,0 +1,97 @@
+"""
+Buffered blog post view counting.
+
+Views are counted in-process and flushed every BLOG_VIEW_FLUSH_SECONDS into
+blog_post_stats with one additive bulk upsert, so serving a post never writes
+to the database and blog_posts rows are never touched. Each worker flushes its
+own buffer; upserts add to the stored count, so workers need no coordination.
+Views buffered when a worker dies without shutting down are lost, which is
+acceptable for a popularity signal.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from typing import Optional
+
+from sqlalchemy import text
+
+from ..config import settings
+from ..database import async_session_factory
+
+logger = logging.getLogger(__name__)
+
+# Rows for deleted posts are skipped by the join instead of failing the batch; the
+# flushed total is also added to the all-time blog_views row of content_stats (a
+# delete trigger on blog_post_stats takes deleted posts' views back out)
+FLUSH_SQL = text("""
+WITH v AS (
+    SELECT v.post_id, v.views
+    FROM unnest(CAST(:post_ids AS integer[]), CAST(:views AS bigint[])) AS v(post_id, views)
+    JOIN blog_posts bp ON bp.id = v.post_id
+),
+upserted AS (
+    INSERT INTO blog_post_stats (post_id, view_count, last_viewed_at, updated_at)
+    SELECT post_id, views, NOW(), NOW() FROM v
+    ON CONFLICT (post_id) DO UPDATE SET
+        view_count = blog_post_stats.view_count + EXCLUDED.view_count,
+        last_viewed_at = EXCLUDED.last_viewed_at,
+        updated_at = EXCLUDED.updated_at
+)
+INSERT INTO content_stats (entity, bucket_day, status, ai_generated, count)
+SELECT 'blog_views', '-infinity'::date, 'all', false, SUM(views) FROM v HAVING SUM(views) > 0
+ON CONFLICT (entity, bucket_day, status, ai_generated) DO UPDATE SET count = content_stats.count + EXCLUDED.count
+""")
+
+
+class BlogViewCounter:
+    """In-process view buffer with a periodic bulk flush into blog_post_stats"""
+
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        self._pending: Counter = Counter()
+        self._task: Optional[asyncio.Task] = None
+
+    def record_view(self, post_id: int) -> None:
+        """Count one view; no I/O happens here"""
+        self._pending[post_id] += 1
+
+    async def flush(self) -> int:
+        """Write buffered views; on failure they are put back for the next flush. Returns posts written."""
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, Counter()
+        post_ids = list(pending)
+        try:
+            async with async_session_factory() as session:
+                await session.execute(FLUSH_SQL, {"post_ids": post_ids, "views": [pending[pid] for pid in post_ids]})
+                await session.commit()
+        except Exception as e:
+            self._pending.update(pending)
+            logger.warning(f"Blog view flush failed ({len(post_ids)} posts, will retry): {e}")
+            return 0
+        return len(post_ids)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write whatever is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+# Global view counter
+blog_view_counter = BlogViewCounter(settings.BLOG_VIEW_FLUSH_SECONDS)
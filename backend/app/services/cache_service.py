@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import redis.asyncio as redis
+
+from ..config import settings
+from ..metrics import metrics
+
+
+class CacheService:
+    """Two-tier response cache: a small in-process LRU in front of Redis.
+
+    The local tier absorbs hot keys without a network round trip; Redis shares
+    entries across workers. Local entries live at most `local_ttl` seconds so
+    invalidations issued by another worker converge quickly. Cached values are
+    shared objects - callers must not mutate what `get` returns.
+    """
+
+    def __init__(self, local_max_entries: int = 2048, local_ttl: int = 30):
+        self.redis_client = None
+        self.redis_available = False
+        self._redis_init_attempted = False
+
+        self.local_max_entries = local_max_entries
+        self.local_ttl = local_ttl
+        self._local: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+        # Hit/miss counters per key namespace (text before the first ':')
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    async def _get_redis_client(self):
+        """Get Redis client with error handling"""
+        if not self._redis_init_attempted:
+            await self._init_redis()
+
+        return self.redis_client if self.redis_available else None
+
+    async def _init_redis(self):
+        """Initialize Redis connection using REDIS_URL"""
+        self._redis_init_attempted = True
+
+        try:
+            redis_url = settings.REDIS_URL
+            if not redis_url or redis_url == "redis://localhost:6379":
+                print("⚠️ REDIS_URL not configured - response cache is in-process only")
+                self.redis_available = False
+                return
+
+            self.redis_client = redis.from_url(
+                redis_url,
+                decode_responses=True,
+                socket_connect_timeout=10,
+                socket_timeout=10,
+                retry_on_timeout=True,
+                health_check_interval=30
+            )
+
+            await self.redis_client.ping()
+            self.redis_available = True
+            print("✅ Redis connected for response cache")
+
+        except Exception as e:
+            print(f"❌ Response cache Redis connection failed: {e}")
+            self.redis_available = False
+            self.redis_client = None
+
+    def _record(self, key: str, outcome: str) -> None:
+        namespace = key.split(":", 1)[0]
+        counters = self.stats.setdefault(namespace, {"hits": 0, "misses": 0})
+        counters[outcome] += 1
+        metrics.record_cache(namespace, outcome == "hits")
+
+    def _local_get(self, key: str) -> Optional[Any]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._local.pop(key, None)
+            return None
+        self._local.move_to_end(key)
+        return value
+
+    def _local_set(self, key: str, value: Any, ttl: int) -> None:
+        self._local[key] = (time.monotonic() + min(ttl, self.local_ttl), value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_max_entries:
+            self._local.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss"""
+        value = self._local_get(key)
+        if value is not None:
+            self._record(key, "hits")
+            return value
+
+        redis_client = await self._get_redis_client()
+        if redis_client:
+            try:
+                cached = await redis_client.get(key)
+                if cached:
+                    value = json.loads(cached)
+                    ttl = await redis_client.ttl(key)
+                    self._local_set(key, value, ttl if ttl and ttl > 0 else self.local_ttl)
+                    self._record(key, "hits")
+                    return value
+            except Exception as e:
+                print(f"⚠️ Cache get failed for {key}: {e}")
+
+        self._record(key, "misses")
+        return None
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        """Store a JSON-serializable value in both tiers"""
+        self._local_set(key, value, ttl)
+
+        redis_client = await self._get_redis_client()
+        if redis_client:
+            try:
+                await redis_client.setex(key, ttl, json.dumps(value, default=str))
+            except Exception as e:
+                print(f"⚠️ Cache set failed for {key}: {e}")
+
+    async def delete(self, *keys: str) -> None:
+        """Remove keys from both tiers (one Redis round trip however many keys)"""
+        if not keys:
+            return
+        for key in keys:
+            self._local.pop(key, None)
+
+        redis_client = await self._get_redis_client()
+        if redis_client:
+            try:
+                await redis_client.delete(*keys)
+            except Exception as e:
+                print(f"⚠️ Cache delete failed for {', '.join(keys[:5])}: {e}")
+
+    async def invalidate_prefix(self, prefix: str) -> None:
+        """Remove every key starting with prefix from both tiers"""
+        for key in [k for k in self._local if k.startswith(prefix)]:
+            self._local.pop(key, None)
+
+        redis_client = await self._get_redis_client()
+        if redis_client:
+            try:
+                keys = [key async for key in redis_client.scan_iter(match=f"{prefix}*", count=500)]
+                if keys:
+                    await redis_client.delete(*keys)
+            except Exception as e:
+                print(f"⚠️ Cache invalidation failed for {prefix}*: {e}")
+
+    async def close(self):
+        """Close Redis connection"""
+        if self.redis_client:
+            await self.redis_client.close()
+
+
+# Global response cache instance
+cache_service = CacheService()
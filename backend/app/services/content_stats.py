@@ -0,0 +1,57 @@
+"""
+Reads of the trigger-maintained content_stats table (migration 021).
+
+Triggers on blog_posts and instrument_requests keep one all-time row per
+(status, ai_generated) key plus one row per created_at day, so dashboard
+counts come from a few dozen rows whatever the size of the source tables.
+"""
+
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+WINDOWS = ("total", "last_week", "last_month")
+
+
+class ContentStats:
+    """Counts for one entity by (status, ai_generated), all-time and over the last 7/30 days"""
+
+    def __init__(self, rows: Dict[Tuple[str, bool], Dict[str, int]]):
+        self.rows = rows
+
+    def count(self, window: str = "total", status: Optional[str] = None, ai_generated: Optional[bool] = None) -> int:
+        return sum(
+            counts[window]
+            for (row_status, row_ai), counts in self.rows.items()
+            if (status is None or row_status == status) and (ai_generated is None or row_ai == ai_generated)
+        )
+
+
+async def load_content_stats(db: AsyncSession, entity: str) -> ContentStats:
+    """Windows are whole days: last_week covers CURRENT_DATE - 7 onwards, last_month CURRENT_DATE - 30"""
+    result = await db.execute(
+        text("""
+            SELECT status, ai_generated,
+                   COALESCE(SUM(count) FILTER (WHERE bucket_day = '-infinity'), 0) AS total,
+                   COALESCE(SUM(count) FILTER (WHERE bucket_day >= CURRENT_DATE - 7), 0) AS last_week,
+                   COALESCE(SUM(count) FILTER (WHERE bucket_day >= CURRENT_DATE - 30), 0) AS last_month
+            FROM content_stats
+            WHERE entity = :entity AND (bucket_day = '-infinity' OR bucket_day >= CURRENT_DATE - 30)
+            GROUP BY status, ai_generated
+        """),
+        {"entity": entity},
+    )
+    return ContentStats({
+        (row.status, row.ai_generated): {window: int(getattr(row, window)) for window in WINDOWS}
+        for row in result.fetchall()
+    })
+
+
+async def load_counter(db: AsyncSession, entity: str) -> int:
+    """All-time value of a plain counter row (e.g. blog_views)"""
+    result = await db.execute(
+        text("SELECT COALESCE(SUM(count), 0) FROM content_stats WHERE entity = :entity AND bucket_day = '-infinity'"),
+        {"entity": entity},
+    )
+    return int(result.scalar() or 0)
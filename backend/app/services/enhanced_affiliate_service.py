@@ -5,9 +5,13 @@ from typing import Dict, List, Optional
 from urllib.parse import urlencode, urlparse, parse_qs, urlunparse
 
 from sqlalchemy import select, and_, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models import AffiliateStore, Product, BrandExclusivity
+from ..models import AffiliateStore, Product, BrandExclusivity, ProductAffiliateUrl
+
+# Max rows per multi-row upsert (keeps bind parameters well under asyncpg's 32767 limit)
+AFFILIATE_URL_UPSERT_CHUNK = 4000
 
 
 class EnhancedAffiliateService:
@@ -20,7 +24,8 @@ class EnhancedAffiliateService:
         self, 
         product: Product, 
         user_region: Optional[str] = None,
-        store_links: Optional[Dict] = None
+        store_links: Optional[Dict] = None,
+        use_materialized: bool = False
     ) -> List[Dict]:
         """
         Get affiliate stores for a product with advanced filtering:
@@ -28,7 +33,15 @@ class EnhancedAffiliateService:
         - Regional preferences
         - Store link availability
         - Automatic affiliate URL generation
+
+        With use_materialized=True (and no explicit store_links) the store links come from
+        the product content and affiliate URLs are looked up in product_affiliate_urls;
+        URLs are only rebuilt for rows that are missing or stale.
         """
+        materialized: Dict[int, ProductAffiliateUrl] = {}
+        if use_materialized and store_links is None:
+            store_links = self.store_links_from_content(product.content)
+            materialized = await self._load_materialized_urls(product.id)
         
         # Get all active stores with affiliate programs
         query = select(AffiliateStore).where(
@@ -82,8 +95,12 @@ class EnhancedAffiliateService:
                 has_store_link
             )
             
-            # Generate affiliate URL
-            affiliate_url = self._generate_affiliate_url(store, original_url, product)
+            # Use the materialized affiliate URL when fresh, otherwise generate it
+            cached = materialized.get(store.id)
+            if cached is not None and self._is_materialized_url_fresh(cached, store, original_url):
+                affiliate_url = cached.affiliate_url
+            else:
+                affiliate_url = self._generate_affiliate_url(store, original_url, product)
             
             eligible_stores.append({
                 "id": store.id,
@@ -111,6 +128,117 @@ class EnhancedAffiliateService:
         
         return eligible_stores
     
+    @staticmethod
+    def store_links_from_content(content: Optional[Dict]) -> Dict[str, Dict]:
+        """Build store_links (keyed by lowercased store name, i.e. store slug) from product content"""
+        store_links = {}
+        if content and isinstance(content.get('store_links'), dict):
+            for store_name, url in content['store_links'].items():
+                if isinstance(url, str) and url:
+                    store_links[store_name.lower()] = {'product_url': url}
+        return store_links
+    
+    async def _load_materialized_urls(self, product_id: int) -> Dict[int, ProductAffiliateUrl]:
+        """Load materialized affiliate URLs for a product keyed by store ID"""
+        query = select(ProductAffiliateUrl).where(ProductAffiliateUrl.product_id == product_id)
+        result = await self.db.execute(query)
+        return {row.store_id: row for row in result.scalars().all()}
+    
+    def _is_materialized_url_fresh(
+        self,
+        row: ProductAffiliateUrl,
+        store: AffiliateStore,
+        original_url: Optional[str]
+    ) -> bool:
+        """A materialized URL is stale if the product link changed or the store config changed after it was generated"""
+        if row.original_url != original_url:
+            return False
+        if store.updated_at and row.generated_at and row.generated_at < store.updated_at:
+            return False
+        return True
+    
+    async def regenerate_affiliate_urls(
+        self,
+        product_ids: Optional[List[int]] = None,
+        store_id: Optional[int] = None,
+        batch_size: int = 500
+    ) -> int:
+        """
+        Materialize affiliate URLs into product_affiliate_urls.
+        Walks products by keyset (id > last_id) and writes each batch with one multi-row upsert.
+        Restrict to specific products and/or a single store; returns the number of rows written.
+        """
+        stores = await self._materialized_stores(store_id)
+        if not stores:
+            return 0
+        
+        written = 0
+        last_id = 0
+        while True:
+            query = (
+                select(Product.id, Product.content)
+                .where(Product.id > last_id)
+                .order_by(Product.id)
+                .limit(batch_size)
+            )
+            if product_ids is not None:
+                query = query.where(Product.id.in_(product_ids))
+            rows = (await self.db.execute(query)).all()
+            if not rows:
+                break
+            
+            written += await self._upsert_affiliate_urls(rows, stores)
+            last_id = rows[-1][0]
+        
+        await self.db.commit()
+        return written
+    
+    async def materialize_product_urls(self, product_id: int, content: Optional[Dict]) -> int:
+        """
+        Rewrite one product's materialized affiliate URLs from its content, in the caller's
+        transaction. Ingest calls this right after writing Product.content so a changed
+        store link never leaves a stale row behind.
+        """
+        stores = await self._materialized_stores()
+        if not stores:
+            return 0
+        return await self._upsert_affiliate_urls([(product_id, content)], stores)
+    
+    async def _materialized_stores(self, store_id: Optional[int] = None) -> List[AffiliateStore]:
+        store_query = select(AffiliateStore).where(AffiliateStore.has_affiliate_program.is_(True))
+        if store_id is not None:
+            store_query = store_query.where(AffiliateStore.id == store_id)
+        return list((await self.db.execute(store_query)).scalars().all())
+    
+    async def _upsert_affiliate_urls(self, products, stores: List[AffiliateStore]) -> int:
+        """One upsert per AFFILIATE_URL_UPSERT_CHUNK rows for (product_id, content) pairs x stores"""
+        generated_at = datetime.utcnow()
+        values = []
+        for product_id, content in products:
+            store_links = self.store_links_from_content(content)
+            for store in stores:
+                original_url = store_links.get(store.slug, {}).get('product_url')
+                values.append({
+                    "product_id": product_id,
+                    "store_id": store.id,
+                    "original_url": original_url,
+                    "affiliate_url": self._generate_affiliate_url(store, original_url, None),
+                    "generated_at": generated_at,
+                })
+        
+        for start in range(0, len(values), AFFILIATE_URL_UPSERT_CHUNK):
+            stmt = pg_insert(ProductAffiliateUrl).values(values[start:start + AFFILIATE_URL_UPSERT_CHUNK])
+            stmt = stmt.on_conflict_do_update(
+                constraint='uq_product_store_affiliate_url',
+                set_={
+                    "original_url": stmt.excluded.original_url,
+                    "affiliate_url": stmt.excluded.affiliate_url,
+                    "generated_at": stmt.excluded.generated_at,
+                }
+            )
+            await self.db.execute(stmt)
+        return len(values)
+    
     def _is_store_available_in_region(self, store: AffiliateStore, user_region: Optional[str]) -> bool:
         """Check if store is available in user's region"""
         if not user_region:
@@ -150,7 +278,7 @@ class EnhancedAffiliateService:
         
         return score
     
-    def _generate_affiliate_url(self, store: AffiliateStore, original_url: Optional[str], product: Product) -> Optional[str]:
+    def _generate_affiliate_url(self, store: AffiliateStore, original_url: Optional[str], product: Optional[Product]) -> Optional[str]:
         """Generate affiliate URL for the store"""
         if not store.affiliate_id:
             return original_url
@@ -391,5 +519,9 @@ class EnhancedAffiliateService:
         if priority is not None:
             store.priority = priority
         
+        store.updated_at = datetime.utcnow()
         await self.db.commit()
+        
+        # Re-materialize this store's affiliate URLs with the new configuration
+        await self.regenerate_affiliate_urls(store_id=store.id)
         return store
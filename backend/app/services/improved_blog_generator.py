@@ -13,16 +13,26 @@ from datetime import datetime
 import asyncio
 from sqlalchemy import text
 from ..database import async_session_factory
+from .llm_client import RateLimitedLLMClient, get_llm_client
+from .llm_providers import LLMProvider, OpenAIProvider
+from .product_matcher import ProductIndex
 
 logger = logging.getLogger(__name__)
 
 class ImprovedBlogGenerator:
     
-    def __init__(self, openai_client=None):
-        self.openai_client = openai_client
+    model = "gpt-4-1106-preview"
+    
+    def __init__(self, openai_client=None, provider: Optional[LLMProvider] = None):
+        # An explicit provider wins and a bare AsyncOpenAI client is wrapped; otherwise
+        # calls go through the shared rate-limited client (LLM_PROVIDER), resolved on first use
+        if provider is None and openai_client is not None:
+            provider = RateLimitedLLMClient(OpenAIProvider(openai_client))
+        self.provider = provider
         self.templates = {}
         self.products_by_category = {}
         self.all_products = []
+        self.product_index = ProductIndex([])
     
     async def initialize(self):
         """Initialize the service by loading templates and products"""
@@ -77,6 +87,7 @@ class ImprovedBlogGenerator:
             self.products_by_category[category_slug].append(product)
         
         self.all_products = products
+        self.product_index = ProductIndex(products)
         print(f"Loaded {len(products)} products across {len(self.products_by_category)} categories")
         
         # Show product distribution
@@ -159,20 +170,14 @@ class ImprovedBlogGenerator:
         
         # Add direct category matches
         for category_slug in relevant_categories:
-            if category_slug in self.products_by_category:
-                # Take top-rated products from this category
-                category_products = self.products_by_category[category_slug][:10]
-                relevant_products.extend(category_products)
-        
-        # Brand-specific matching
-        for product in self.all_products[:50]:  # Check top 50 products
-            brand_name = product['brand_name'].lower()
-            product_name = product['name'].lower()
-            
-            # Check if brand or product name is mentioned in topic
-            if any(keyword in brand_name or keyword in product_name for keyword in keywords):
-                if product not in relevant_products:
-                    relevant_products.append(product)
+            # Take top-rated products from this category
+            relevant_products.extend(self.product_index.top(10, [category_slug]))
+        
+        # Brand-specific matching: brands among the keywords and products named in the topic,
+        # looked up in the product index
+        for product, _ in self.product_index.search(text=topic, brands=keywords, limit=max_products):
+            if product not in relevant_products:
+                relevant_products.append(product)
         
         # If we don't have enough relevant products, use template-based fallbacks
         if len(relevant_products) < max_products:
@@ -267,7 +272,7 @@ Description: {product.get('description', 'High-quality musical instrument')[:100
         prompt = self._build_enhanced_prompt(topic, template_name, relevant_products, target_words)
         
         # Call AI model
-        response = self._call_ai_model(prompt)
+        response = await self._call_ai_model(prompt)
         
         # Parse and validate response
         try:
@@ -382,40 +387,22 @@ Respond with JSON only:"""
 
         return prompt
     
-    def _call_ai_model(self, prompt: str) -> str:
+    async def _call_ai_model(self, prompt: str) -> str:
         """Call the AI model to generate content"""
-        if self.openai_client:
-            try:
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-4-1106-preview",
-                    messages=[
-                        {"role": "system", "content": "You are an expert music journalist and gear reviewer. Always respond with valid JSON only. Focus on the specific products provided."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=8000,
-                    temperature=0.7
-                )
-                return response.choices[0].message.content
-            except Exception as e:
-                logger.error(f"OpenAI API error: {e}")
-                raise
-        
-        # Fallback mock response for testing
-        return json.dumps({
-            "title": "Sample Article",
-            "excerpt": "A sample article excerpt.",
-            "seo_title": "Sample Article - Music Gear Guide",
-            "seo_description": "Learn about music gear in this comprehensive guide.",
-            "sections": [
-                {
-                    "type": "intro",
-                    "content": "This is a sample introduction..."
-                }
-            ],
-            "tags": ["sample", "test"],
-            "category": "general",
-            "featured_products": []
-        })
+        provider = self.provider or get_llm_client()
+        try:
+            return await provider.complete(
+                [
+                    {"role": "system", "content": "You are an expert music journalist and gear reviewer. Always respond with valid JSON only. Focus on the specific products provided."},
+                    {"role": "user", "content": prompt}
+                ],
+                model=self.model,
+                max_tokens=8000,
+                temperature=0.7
+            )
+        except Exception as e:
+            logger.error(f"AI provider error ({provider.name}): {e}")
+            raise
     
     def _validate_and_enhance_content(self, content: Dict, products: List[Dict]) -> Dict:
         """Validate and enhance the generated content"""
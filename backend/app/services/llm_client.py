@@ -0,0 +1,162 @@
+"""
+Rate-limited concurrent LLM client shared by the blog generators and scripts.
+
+Calls wait on two token buckets sized to the account quota, requests per minute
+(LLM_REQUESTS_PER_MINUTE) and tokens per minute (LLM_TOKENS_PER_MINUTE), so
+many concurrent generations run as fast as the quota allows without tripping
+it. A call is charged its prompt estimate plus max_tokens up front, which is
+how the API's limiter counts it. At most LLM_MAX_CONCURRENCY calls are in
+flight. 429s, 5xx and connection errors are retried with full-jitter
+exponential backoff (honouring Retry-After). A 429 also pauses every caller
+of the client until the backoff ends. Buckets are per process: split the quota
+when several processes generate at once.
+"""
+
+import asyncio
+import random
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+from ..config import settings
+from ..metrics import metrics
+from .llm_providers import LLMProvider, LLMProviderError, LLMResult, estimate_tokens, get_llm_provider
+
+
+class TokenBucket:
+    """Holds up to per_minute units, refilled continuously at per_minute per 60s"""
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        # Waiters queue on the lock, so a large request is not starved by small ones
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount (capped at capacity) is available"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    async def acquire(self, amount: float) -> float:
+        """Take amount, waiting as needed; returns seconds waited"""
+        waited = 0.0
+        async with self._lock:
+            while True:
+                delay = self.wait_time(amount)
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+                waited += delay
+            # Requests larger than the bucket would never fit; they drain it instead
+            self.tokens -= min(amount, self.capacity)
+        return waited
+
+
+class RateLimitedLLMClient(LLMProvider):
+    """LLMProvider wrapper adding quota buckets, bounded concurrency, retries and metrics"""
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+        backoff_max: Optional[float] = None,
+    ):
+        self.provider = provider
+        self.name = provider.name
+        rpm = settings.LLM_REQUESTS_PER_MINUTE if requests_per_minute is None else requests_per_minute
+        tpm = settings.LLM_TOKENS_PER_MINUTE if tokens_per_minute is None else tokens_per_minute
+        # A limit of 0 disables that bucket
+        self.request_bucket = TokenBucket(rpm) if rpm > 0 else None
+        self.token_bucket = TokenBucket(tpm) if tpm > 0 else None
+        self.max_concurrency = max_concurrency or settings.LLM_MAX_CONCURRENCY
+        self.max_retries = settings.LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = settings.LLM_BACKOFF_BASE_SECONDS if backoff_base is None else backoff_base
+        self.backoff_max = settings.LLM_BACKOFF_MAX_SECONDS if backoff_max is None else backoff_max
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._cooldown_until = 0.0
+        self.stats: Counter = Counter()
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        return max(delay, retry_after or 0.0)
+
+    async def _wait_for_capacity(self, estimated_tokens: int) -> None:
+        started = time.monotonic()
+        while self._cooldown_until > time.monotonic():
+            await asyncio.sleep(self._cooldown_until - time.monotonic())
+        if self.request_bucket is not None:
+            await self.request_bucket.acquire(1)
+        if self.token_bucket is not None:
+            await self.token_bucket.acquire(estimated_tokens)
+        waited = time.monotonic() - started
+        metrics.observe_llm_rate_limit_wait(waited)
+        self.stats["wait_seconds"] += waited
+
+    async def chat(self, messages: List[Dict[str, str]], model: str, max_tokens: int = 8000, temperature: float = 0.7) -> LLMResult:
+        estimated_tokens = sum(estimate_tokens(m["content"]) for m in messages) + max_tokens
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                await self._wait_for_capacity(estimated_tokens)
+                started = time.perf_counter()
+                try:
+                    result = await self.provider.chat(messages, model, max_tokens, temperature)
+                except LLMProviderError as e:
+                    duration = time.perf_counter() - started
+                    if not e.retryable or attempt >= self.max_retries:
+                        metrics.record_llm_call(self.name, model, "error", duration)
+                        self.stats["failures"] += 1
+                        raise
+                    metrics.record_llm_call(self.name, model, "retry", duration)
+                    self.stats["retries"] += 1
+                    delay = self._backoff(attempt, e.retry_after)
+                    if e.status_code == 429:
+                        self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+                except Exception:
+                    metrics.record_llm_call(self.name, model, "error", time.perf_counter() - started)
+                    self.stats["failures"] += 1
+                    raise
+                else:
+                    duration = time.perf_counter() - started
+                    metrics.record_llm_call(self.name, model, "ok", duration, result.prompt_tokens, result.completion_tokens)
+                    self.stats["calls"] += 1
+                    self.stats["prompt_tokens"] += result.prompt_tokens
+                    self.stats["completion_tokens"] += result.completion_tokens
+                    self.stats["call_seconds"] += duration
+                    return result
+            # Back off outside the semaphore so other calls keep their slots
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def summary(self) -> str:
+        calls = self.stats["calls"]
+        average = self.stats["call_seconds"] / calls if calls else 0.0
+        return (
+            f"{calls} LLM calls ({self.stats['retries']} retries, {self.stats['failures']} failed), "
+            f"{self.stats['prompt_tokens']} prompt + {self.stats['completion_tokens']} completion tokens, "
+            f"avg {average:.1f}s per call, {self.stats['wait_seconds']:.1f}s waiting for quota"
+        )
+
+
+_client: Optional[RateLimitedLLMClient] = None
+
+
+def get_llm_client() -> RateLimitedLLMClient:
+    """Process-wide client around the LLM_PROVIDER provider, created on first use"""
+    global _client
+    if _client is None:
+        _client = RateLimitedLLMClient(get_llm_provider())
+    return _client
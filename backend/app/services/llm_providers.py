@@ -0,0 +1,137 @@
+"""
+Async chat-completion providers used by the blog generators.
+
+Providers make exactly one request and report token usage; rate limiting,
+concurrency and retries live in app.services.llm_client, which wraps them.
+OpenAIProvider awaits the AsyncOpenAI client, so a generation never blocks the
+event loop. FakeProvider answers locally with a valid article JSON so the
+generators and the generation job queue can run without an API key.
+"""
+
+import asyncio
+import json
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from ..config import settings
+
+_TOPIC_RE = re.compile(r"^Topic:\s*(.+)$", re.MULTILINE)
+
+
+@dataclass
+class LLMResult:
+    text: str
+    prompt_tokens: int
+    completion_tokens: int
+
+
+class LLMProviderError(Exception):
+    """Provider failure; retryable for 429s, 5xx and connection errors"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None, retryable: bool = False):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.retryable = retryable or status_code == 429 or (status_code is not None and status_code >= 500)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) used before the provider reports usage"""
+    return len(text) // 4 + 1
+
+
+class LLMProvider:
+    """Single chat completion"""
+
+    name = "base"
+
+    async def chat(self, messages: List[Dict[str, str]], model: str, max_tokens: int = 8000, temperature: float = 0.7) -> LLMResult:
+        raise NotImplementedError
+
+    async def complete(self, messages: List[Dict[str, str]], model: str, max_tokens: int = 8000, temperature: float = 0.7) -> str:
+        return (await self.chat(messages, model, max_tokens, temperature)).text
+
+
+class OpenAIProvider(LLMProvider):
+    name = "openai"
+
+    def __init__(self, client=None):
+        if client is None:
+            import openai
+            if not settings.OPENAI_API_KEY:
+                raise ValueError("OPENAI_API_KEY not configured")
+            # Retries are done by the rate-limited client, which knows about the quota
+            client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY, max_retries=0)
+        self.client = client
+
+    async def chat(self, messages: List[Dict[str, str]], model: str, max_tokens: int = 8000, temperature: float = 0.7) -> LLMResult:
+        import openai
+        try:
+            response = await self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+        except openai.APIStatusError as e:
+            retry_after = e.response.headers.get("retry-after") if e.response is not None else None
+            raise LLMProviderError(
+                str(e), status_code=e.status_code, retry_after=float(retry_after) if retry_after else None
+            ) from e
+        except (openai.APIConnectionError, openai.APITimeoutError) as e:
+            raise LLMProviderError(str(e), retryable=True) from e
+
+        usage = response.usage
+        text = response.choices[0].message.content
+        if usage is None:
+            return LLMResult(text, sum(estimate_tokens(m["content"]) for m in messages), estimate_tokens(text or ""))
+        return LLMResult(text, usage.prompt_tokens, usage.completion_tokens)
+
+
+class FakeProvider(LLMProvider):
+    """Offline provider: a small valid article built from the prompt's "Topic:" line"""
+
+    name = "fake"
+
+    def __init__(self, delay: float = 0.0, fail_times: int = 0, fail_status: int = 429):
+        self.delay = delay
+        # The first fail_times calls raise LLMProviderError(fail_status), to exercise retries
+        self.fail_times = fail_times
+        self.fail_status = fail_status
+        self.calls = 0
+
+    async def chat(self, messages: List[Dict[str, str]], model: str, max_tokens: int = 8000, temperature: float = 0.7) -> LLMResult:
+        self.calls += 1
+        call = self.calls
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if call <= self.fail_times:
+            raise LLMProviderError(f"FakeProvider failure {call}/{self.fail_times}", status_code=self.fail_status)
+
+        prompt = messages[-1]["content"] if messages else ""
+        topics = _TOPIC_RE.findall(prompt)
+        topic = topics[-1].strip() if topics else "Sample Article"
+        text = json.dumps({
+            "title": topic,
+            "excerpt": f"A sample article about {topic}.",
+            "seo_title": f"{topic} - Music Gear Guide",
+            "seo_description": f"Learn about {topic} in this comprehensive guide.",
+            "sections": [
+                {
+                    "type": "intro",
+                    "content": f"This is a sample introduction to {topic}..."
+                }
+            ],
+            "tags": ["sample", "test"],
+            "category": "general",
+            "featured_products": []
+        })
+        return LLMResult(text, sum(estimate_tokens(m["content"]) for m in messages), estimate_tokens(text))
+
+
+def get_llm_provider() -> LLMProvider:
+    """Provider selected by LLM_PROVIDER ("openai" or "fake")"""
+    if settings.LLM_PROVIDER == "fake":
+        return FakeProvider()
+    return OpenAIProvider()
@@ -0,0 +1,166 @@
+"""
+Inverted index for matching blog topics to products.
+
+Built once per run from the loaded product rows; a topic is then scored with a
+handful of dict lookups instead of substring tests against every product.
+Postings map normalized name tokens, full-text tokens (name, brand and category
+name), brand names and category slugs to product ids. Products keep the order
+they were loaded in, which callers use as the popularity ranking that breaks
+score ties and drives fallbacks.
+"""
+
+import re
+from collections import defaultdict
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Relevance weights (a brand match outranks a named model, which outranks a category)
+BRAND_WEIGHT = 3.0
+NAME_WEIGHT = 2.0
+CATEGORY_WEIGHT = 1.0
+KEYWORD_WEIGHT = 1.0
+# Each additional topic word found in a product name
+EXTRA_NAME_TOKEN_WEIGHT = 0.25
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset({
+    "the", "and", "for", "with", "your", "best", "guide", "review", "from", "into", "what", "that",
+    "this", "over", "under", "vs", "versus", "complete", "ultimate", "top", "how", "why", "when",
+})
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    return _TOKEN_RE.findall((value or "").lower())
+
+
+def terms(value: Optional[str]) -> List[str]:
+    """Tokens with a plural "s" dropped, so "guitar" and "guitars" share a posting"""
+    return [
+        token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token
+        for token in tokenize(value)
+    ]
+
+
+def name_terms(value: Optional[str]) -> Set[str]:
+    """Topic words that can identify a product: longer than 3 characters or containing a digit (model numbers)"""
+    return {
+        token for token in terms(value)
+        if token not in _STOPWORDS and (len(token) > 3 or any(ch.isdigit() for ch in token))
+    }
+
+
+class ProductIndex:
+    """Inverted index over product rows keyed by product id"""
+
+    def __init__(
+        self,
+        products: Iterable[Dict[str, Any]],
+        brand_key: str = "brand_name",
+        category_key: str = "category_slug",
+        category_name_key: str = "category_name",
+    ):
+        self.products: Dict[Any, Dict[str, Any]] = {}
+        self.rank: Dict[Any, int] = {}
+        self.name_postings: Dict[str, Set[Any]] = defaultdict(set)
+        self.text_postings: Dict[str, Set[Any]] = defaultdict(set)
+        self.brand_postings: Dict[str, Set[Any]] = defaultdict(set)
+        self.category_postings: Dict[str, List[Any]] = defaultdict(list)
+
+        for product in products:
+            product_id = product["id"]
+            if product_id in self.products:
+                continue
+            self.rank[product_id] = len(self.products)
+            self.products[product_id] = product
+            brand = " ".join(tokenize(product.get(brand_key)))
+            name_tokens = terms(product.get("name"))
+            for token in name_tokens:
+                self.name_postings[token].add(product_id)
+            for token in set(name_tokens) | set(terms(product.get(brand_key))) | set(terms(product.get(category_name_key))):
+                self.text_postings[token].add(product_id)
+            if brand:
+                self.brand_postings[brand].add(product_id)
+            category = (product.get(category_key) or "").lower()
+            if category:
+                self.category_postings[category].append(product_id)
+
+        self._brand_cache: Dict[str, Set[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def brand_ids(self, brand: str) -> Set[Any]:
+        """Products whose brand name contains brand as whole words ("akai" matches "AKAI Professional")"""
+        query = " ".join(tokenize(brand))
+        if query not in self._brand_cache:
+            ids: Set[Any] = set()
+            if query:
+                padded = f" {query} "
+                for name, brand_ids in self.brand_postings.items():
+                    if padded in f" {name} ":
+                        ids |= brand_ids
+            self._brand_cache[query] = ids
+        return self._brand_cache[query]
+
+    def keyword_ids(self, keyword: str) -> Set[Any]:
+        """Products whose name, brand or category name contain every word of keyword"""
+        tokens = terms(keyword)
+        if not tokens:
+            return set()
+        postings = sorted((self.text_postings.get(token, set()) for token in tokens), key=len)
+        return set.intersection(*postings) if postings[0] else set()
+
+    def category_ids(self, category: str, limit: Optional[int] = None) -> List[Any]:
+        """Products in a category slug, most popular first"""
+        ids = self.category_postings.get(category.lower(), [])
+        return ids[:limit] if limit is not None else ids
+
+    def score(
+        self,
+        text: Optional[str] = None,
+        brands: Iterable[str] = (),
+        categories: Iterable[str] = (),
+        keywords: Iterable[str] = (),
+    ) -> Dict[Any, float]:
+        """Relevance per matching product id: brands, topic words in product names, categories and keywords"""
+        scores: Dict[Any, float] = defaultdict(float)
+        for product_id in set().union(*(self.brand_ids(brand) for brand in brands)):
+            scores[product_id] += BRAND_WEIGHT
+
+        name_hits: Dict[Any, int] = defaultdict(int)
+        for term in name_terms(text):
+            for product_id in self.name_postings.get(term, ()):
+                name_hits[product_id] += 1
+        for product_id, hits in name_hits.items():
+            scores[product_id] += NAME_WEIGHT + EXTRA_NAME_TOKEN_WEIGHT * (hits - 1)
+
+        for product_id in set().union(*(set(self.category_ids(category)) for category in categories)):
+            scores[product_id] += CATEGORY_WEIGHT
+        for product_id in set().union(*(self.keyword_ids(keyword) for keyword in keywords)):
+            scores[product_id] += KEYWORD_WEIGHT
+        return scores
+
+    def search(
+        self,
+        text: Optional[str] = None,
+        brands: Iterable[str] = (),
+        categories: Iterable[str] = (),
+        keywords: Iterable[str] = (),
+        limit: Optional[int] = None,
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """(product, score) best first; ties go to the more popular product"""
+        scores = self.score(text, brands, categories, keywords)
+        ranked = sorted(scores, key=lambda product_id: (-scores[product_id], self.rank[product_id]))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(self.products[product_id], scores[product_id]) for product_id in ranked]
+
+    def top(self, limit: int, categories: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Most popular products overall, or within the given category slugs"""
+        if categories is None:
+            return list(islice(self.products.values(), limit))
+        ids = sorted(
+            set().union(*(set(self.category_ids(category)) for category in categories)),
+            key=self.rank.__getitem__,
+        )
+        return [self.products[product_id] for product_id in ids[:limit]]
@@ -14,6 +14,7 @@ import asyncio
 
 from ..models import Product, Brand, Category, ProductPrice, AffiliateStore
 from ..config import settings
+from ..metrics import metrics
 
 
 class SearchService:
@@ -100,6 +101,7 @@ class SearchService:
         if redis_client:
             try:
                 cached_result = await redis_client.get(cache_key)
+                metrics.record_cache("search", bool(cached_result))
                 if cached_result:
                     print(f"🎯 Cache hit for search: {query}")
                     return json.loads(cached_result)
@@ -281,6 +283,7 @@ class SearchService:
         # Try cache first
         redis_client = await self._get_redis_client()
         cached_suggestions = await redis_client.get(cache_key)
+        metrics.record_cache("search_suggestions", bool(cached_suggestions))
         if cached_suggestions:
             return json.loads(cached_suggestions)
 
@@ -13,11 +13,13 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import async_session_factory
+from .product_matcher import ProductIndex
 
 class SimpleBlogBatchGenerator:
     def __init__(self):
         self.templates = []
         self.products = []
+        self.product_index = ProductIndex([])
         self.blog_ideas = []
     
     async def initialize(self):
@@ -59,6 +61,7 @@ class SimpleBlogBatchGenerator:
         """
         result = await session.execute(text(query))
         self.products = [dict(row._mapping) for row in result.fetchall()]
+        self.product_index = ProductIndex(self.products)
         print(f"Loaded {len(self.products)} available products")
     
     def _generate_blog_ideas(self):
@@ -304,8 +307,6 @@ class SimpleBlogBatchGenerator:
     
     def _select_relevant_products(self, template_name: str, topic: str, max_products: int = 5) -> List[Dict]:
         """Select products relevant to the topic with smart fallbacks"""
-        relevant_products = []
-        
         # Extract keywords from topic
         topic_lower = topic.lower()
         
@@ -352,99 +353,52 @@ class SimpleBlogBatchGenerator:
             'audio-technica': 'Audio-Technica'
         }
         
-        # Find direct keyword matches
+        # Keywords, categories and brands named in the topic; the index scores every
+        # product they touch without scanning the catalogue
+        topic_keywords = [keyword for keyword in product_keywords if keyword in topic_lower]
         matched_categories = set()
-        for keyword, categories in product_keywords.items():
-            if keyword in topic_lower:
-                matched_categories.update(categories)
-        
-        # Find products matching topic keywords, categories, or brands
-        for product in self.products:
-            product_text = f"{product['name']} {product['brand_name']} {product['category_name']}".lower()
-            category_slug = product.get('category_slug', '').lower()
-            brand_name = product['brand_name'].lower()
-            
-            # Direct keyword match in topic
-            topic_match = any(keyword in topic_lower for keyword in product_keywords.keys() if keyword in product_text)
-            
-            # Category match
-            category_match = category_slug in matched_categories
-            
-            # Brand match (exact brand name in topic)
-            brand_match = any(brand_key in topic_lower and brand_value.lower() in brand_name 
-                            for brand_key, brand_value in brand_keywords.items())
-            
-            # Specific product name match (for reviews)
-            product_name_match = any(word in product['name'].lower() for word in topic_lower.split() 
-                                   if len(word) > 3)  # Only match words longer than 3 chars
-            
-            if topic_match or category_match or brand_match or product_name_match:
-                score = 0
-                if brand_match: score += 3  # Highest priority for brand match
-                if product_name_match: score += 2  # High priority for specific product
-                if category_match: score += 1  # Medium priority for category
-                if topic_match: score += 1  # Base score
-                
-                relevant_products.append(({
-                    'id': str(product['id']),
-                    'name': f"{product['brand_name']} {product['name']}",
-                    'price': f"${product['price']:.0f}" if product['price'] else "Check Price",
-                    'category': product['category_name'],
-                    'rating': product['rating'] or 4.0,
-                    'slug': product['slug']
-                }, score))
+        for keyword in topic_keywords:
+            matched_categories.update(product_keywords[keyword])
+        brands = [brand_value for brand_key, brand_value in brand_keywords.items() if brand_key in topic_lower]
         
-        # Sort by relevance score (highest first)
-        relevant_products.sort(key=lambda x: x[1], reverse=True)
-        relevant_products = [product[0] for product in relevant_products]  # Remove scores
+        # Brand match scores highest, then specific product name words, then category/keyword
+        matches = self.product_index.search(
+            text=topic, brands=brands, categories=matched_categories, keywords=topic_keywords, limit=max_products
+        )
+        relevant_products = [self._prompt_product(product) for product, _ in matches]
         
         # If no specific matches, use strategic fallbacks based on template type
         if not relevant_products:
-            top_products = sorted(self.products, key=lambda x: x['rating'] or 0, reverse=True)
-            
-            # Template-specific fallbacks
-            if template_name == 'artist-spotlight':
-                # For artist posts, show iconic instruments (guitars, keyboards, drums)
-                preferred_categories = ['electric-guitars', 'acoustic-guitars', 'keyboards', 'drums']
-                fallback_products = [p for p in top_products if p.get('category_slug') in preferred_categories]
-            elif template_name == 'instrument-history':
-                # For history posts, show classic instruments
+            # Products are loaded best-rated first, so index order is the rating order
+            if template_name in ('artist-spotlight', 'instrument-history'):
+                # For artist and history posts, show iconic/classic instruments
                 preferred_categories = ['electric-guitars', 'acoustic-guitars', 'keyboards', 'drums']
-                fallback_products = [p for p in top_products if p.get('category_slug') in preferred_categories]
+                fallback_products = self.product_index.top(len(self.product_index), preferred_categories)
             elif template_name == 'news-feature':
                 # For news, show trending/popular products
-                fallback_products = top_products[:15]  # Top rated across all categories
+                fallback_products = self.product_index.top(15)  # Top rated across all categories
             else:
                 # General fallback - mix of popular instruments
-                fallback_products = top_products[:20]
+                fallback_products = self.product_index.top(20)
             
             if not fallback_products:
-                fallback_products = top_products[:20]
+                fallback_products = self.product_index.top(20)
             
-            relevant_products = [{
-                'id': str(p['id']),
-                'name': f"{p['brand_name']} {p['name']}",
-                'price': f"${p['price']:.0f}" if p['price'] else "Check Price",
-                'category': p['category_name'],
-                'rating': p['rating'] or 4.0
-            } for p in random.sample(fallback_products, min(max_products, len(fallback_products)))]
+            relevant_products = [
+                self._prompt_product(p)
+                for p in random.sample(fallback_products, min(max_products, len(fallback_products)))
+            ]
         
         # Ensure we have enough products
         if len(relevant_products) < max_products:
             # Add high-quality fallback products from popular categories
             fallback_categories = ['electric-guitars', 'digital-pianos', 'midi-master-keyboards', 'electric-basses']
+            selected_ids = {rp['id'] for rp in relevant_products}
             for category in fallback_categories:
-                category_products = [p for p in self.products if p.get('category_slug') == category]
-                for product in category_products[:5]:  # Top 5 from each category
-                    if not any(rp['id'] == str(product['id']) for rp in relevant_products):
-                        relevant_products.append({
-                            'id': str(product['id']),
-                            'name': f"{product['brand_name']} {product['name']}",
-                            'price': f"${product['price']:.0f}" if product['price'] else "Check Price",
-                            'category': product['category_name'],
-                            'rating': product['rating'] or 4.0,
-                            'slug': product['slug']
-                        })
+                for product_id in self.product_index.category_ids(category, 5):  # Top 5 from each category
+                    if str(product_id) not in selected_ids:
+                        relevant_products.append(self._prompt_product(self.product_index.products[product_id]))
+                        selected_ids.add(str(product_id))
                         if len(relevant_products) >= max_products:
                             break
                 if len(relevant_products) >= max_products:
@@ -452,6 +406,17 @@ class SimpleBlogBatchGenerator:
         
         return relevant_products[:max_products]
     
+    def _prompt_product(self, product: Dict) -> Dict:
+        """Product fields passed to the generation prompt"""
+        return {
+            'id': str(product['id']),
+            'name': f"{product['brand_name']} {product['name']}",
+            'price': f"${product['price']:.0f}" if product['price'] else "Check Price",
+            'category': product['category_name'],
+            'rating': product['rating'] or 4.0,
+            'slug': product['slug']
+        }
+    
     def _build_generation_request(self, custom_id: str, topic: str, template: Dict, 
                                 products: List[Dict], target_words: int) -> Dict:
         """Build OpenAI batch API request"""
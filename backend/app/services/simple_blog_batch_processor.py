@@ -6,27 +6,69 @@ Processes OpenAI batch results and saves to simplified blog structure
 
 import json
 import logging
+import time
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import async_session_factory
+from .blog_near_duplicates import DEFAULT_THRESHOLD, NearDuplicateIndex
 
 logger = logging.getLogger(__name__)
 
+# Posts written per transaction; one multi-row INSERT per chunk
+DEFAULT_CHUNK_SIZE = 200
+
+AUTHOR_NAME = "GetYourMusicGear Team"
+
+BULK_INSERT_SQL = text("""
+    INSERT INTO blog_posts (
+        title, slug, excerpt, content_json, seo_title, seo_description,
+        author_name, status, published_at, created_at, updated_at
+    )
+    SELECT t.title, t.slug, t.excerpt, CAST(t.content_json AS JSONB), t.seo_title, t.seo_description,
+           :author_name, 'draft', NULL, :now, :now
+    FROM unnest(
+        CAST(:titles AS text[]), CAST(:slugs AS text[]), CAST(:excerpts AS text[]),
+        CAST(:contents AS text[]), CAST(:seo_titles AS text[]), CAST(:seo_descriptions AS text[])
+    ) AS t(title, slug, excerpt, content_json, seo_title, seo_description)
+    RETURNING id, slug
+""")
+
+
+def describe_duplicate(duplicate: Dict[str, Any]) -> str:
+    """What a skipped item duplicated: a stored post, or an earlier line of the same batch file"""
+    if "batch_line" in duplicate:
+        return f"line {duplicate['batch_line']} ({duplicate['batch_custom_id']})"
+    return f"post {duplicate['post_id']}"
+
+
 class SimpleBlogBatchProcessor:
     
-    def __init__(self):
+    def __init__(self, duplicate_threshold: Optional[float] = DEFAULT_THRESHOLD, chunk_size: int = DEFAULT_CHUNK_SIZE):
         self.processed_count = 0
         self.error_count = 0
         self.errors = []
+        self.chunk_size = chunk_size
+        # Items whose content is a near-duplicate (MinHash Jaccard >= threshold) of an
+        # existing post, or of one saved earlier in the batch, are skipped; None disables
+        self.duplicate_threshold = duplicate_threshold
+        self.duplicate_index: Optional[NearDuplicateIndex] = None
+        self.skipped_duplicates = []
+        # Every slug in blog_posts plus those allocated in this run, and the next
+        # suffix to try per base slug
+        self.taken_slugs: Set[str] = set()
+        self._slug_suffixes: Dict[str, int] = {}
     
     async def process_batch_file(self, batch_file_path: str, 
                                dry_run: bool = False) -> Dict[str, Any]:
         """
         Process OpenAI batch results file and save blog posts
         
+        Lines are parsed, validated and given unique slugs as they are read; every
+        chunk_size accepted posts are written with one INSERT in one transaction.
+        
         Args:
             batch_file_path: Path to JSONL batch results file
             dry_run: If True, validate but don't save to database
@@ -38,85 +80,208 @@ class SimpleBlogBatchProcessor:
         self.processed_count = 0
         self.error_count = 0
         self.errors = []
+        self.skipped_duplicates = []
+        started = time.perf_counter()
         
         logger.info(f"Processing batch file: {batch_file_path}")
+
+        async with async_session_factory() as session:
+            result = await session.execute(text("SELECT slug FROM blog_posts"))
+            self.taken_slugs = {row[0] for row in result.fetchall()}
+            self._slug_suffixes = {}
+            if self.duplicate_threshold is not None:
+                self.duplicate_index = await NearDuplicateIndex.from_database(session, self.duplicate_threshold)
         
+        chunk: List[Dict[str, Any]] = []
         try:
             with open(batch_file_path, 'r') as file:
                 for line_num, line in enumerate(file, 1):
+                    if not line.strip():
+                        continue
                     try:
                         batch_item = json.loads(line.strip())
-                        await self._process_batch_item(batch_item, dry_run)
-                        self.processed_count += 1
-                        
-                        if self.processed_count % 10 == 0:
-                            logger.info(f"Processed {self.processed_count} items...")
-                            
+                        item = self._prepare_batch_item(batch_item, line_num)
                     except Exception as e:
-                        self.error_count += 1
-                        error_msg = f"Line {line_num}: {str(e)}"
-                        self.errors.append(error_msg)
-                        logger.error(error_msg)
+                        self._record_error(line_num, e)
+                        continue
+                    if item is None:
+                        continue
+                    chunk.append(item)
+                    if len(chunk) >= self.chunk_size:
+                        await self._write_chunk(chunk, dry_run, started)
+                        chunk = []
+            if chunk:
+                await self._write_chunk(chunk, dry_run, started)
         
         except FileNotFoundError:
             raise ValueError(f"Batch file not found: {batch_file_path}")
         
+        elapsed = time.perf_counter() - started
         summary = {
             "processed_count": self.processed_count,
             "error_count": self.error_count,
             "errors": self.errors[:10],  # Limit to first 10 errors
-            "success_rate": (self.processed_count / (self.processed_count + self.error_count)) * 100 if (self.processed_count + self.error_count) > 0 else 0
+            "skipped_duplicates": self.skipped_duplicates,
+            "success_rate": (self.processed_count / (self.processed_count + self.error_count)) * 100 if (self.processed_count + self.error_count) > 0 else 0,
+            "elapsed_seconds": round(elapsed, 2),
+            "posts_per_second": round(self.processed_count / elapsed, 1) if elapsed > 0 else 0.0
         }
         
         logger.info(f"Processing complete: {summary}")
         return summary
     
-    async def _process_batch_item(self, batch_item: Dict, dry_run: bool = False):
-        """Process individual batch result item"""
+    def _record_error(self, line_num: int, error: Exception):
+        self.error_count += 1
+        error_msg = f"Line {line_num}: {str(error)}"
+        self.errors.append(error_msg)
+        logger.error(error_msg)
+    
+    def _prepare_batch_item(self, batch_item: Dict, line_num: int) -> Optional[Dict[str, Any]]:
+        """Parse, validate, de-duplicate and slug one batch result; None when it is skipped as a near-duplicate"""
         
-        # Extract the response content
         try:
-            response = batch_item.get('response', {})
-            choices = response.get('body', {}).get('choices', [])
-            
-            if not choices:
-                raise ValueError("No choices in response")
-            
-            content = choices[0].get('message', {}).get('content', '')
-            
-            if not content:
-                raise ValueError("Empty content in response")
-            
-            # Parse the JSON content
-            try:
-                blog_content = json.loads(content)
-            except json.JSONDecodeError as e:
-                # Try to extract JSON if wrapped in markdown
-                if '```json' in content:
-                    start = content.find('```json') + 7
-                    end = content.rfind('```')
-                    if end > start:
-                        content = content[start:end].strip()
-                        blog_content = json.loads(content)
-                    else:
-                        raise e
-                else:
-                    raise e
+            blog_content = self._parse_batch_item(batch_item)
             
             # Validate required fields
             self._validate_blog_content(blog_content)
             
-            # Generate slug from title
-            slug = self._generate_slug(blog_content['title'])
+            duplicate = self.check_near_duplicate(blog_content)
+            if duplicate:
+                self.skipped_duplicates.append({"custom_id": batch_item.get('custom_id'), **duplicate})
+                logger.warning(
+                    f"Skipping '{blog_content['title']}': near-duplicate of {describe_duplicate(duplicate)} "
+                    f"(jaccard {duplicate['jaccard']})"
+                )
+                return None
+            
+            slug = self._allocate_slug(self._generate_slug(blog_content['title']))
             
-            # Save to database if not dry run
-            if not dry_run:
-                await self._save_blog_post(blog_content, slug)
+            custom_id = batch_item.get('custom_id')
+            info = {"id": None, "title": blog_content['title'], "slug": slug, "custom_id": custom_id, "line": line_num}
+            if self.duplicate_index is not None:
+                # Later items in the batch are checked against this one too; info["id"]
+                # is filled in once its chunk is written
+                self.duplicate_index.add(-(len(self.duplicate_index.posts) + 1), blog_content['title'], blog_content, info)
+            return {"custom_id": custom_id, "content": blog_content, "slug": slug, "info": info, "line_num": line_num}
                 
         except Exception as e:
             custom_id = batch_item.get('custom_id', 'unknown')
             raise ValueError(f"Failed to process item {custom_id}: {str(e)}")
     
+    def _parse_batch_item(self, batch_item: Dict) -> Dict:
+        """Extract the blog JSON from a batch response line"""
+        response = batch_item.get('response', {})
+        choices = response.get('body', {}).get('choices', [])
+        
+        if not choices:
+            raise ValueError("No choices in response")
+        
+        content = choices[0].get('message', {}).get('content', '')
+        
+        if not content:
+            raise ValueError("Empty content in response")
+        
+        # Parse the JSON content
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError as e:
+            # Try to extract JSON if wrapped in markdown
+            if '```json' in content:
+                start = content.find('```json') + 7
+                end = content.rfind('```')
+                if end > start:
+                    return json.loads(content[start:end].strip())
+            raise e
+    
+    def _allocate_slug(self, slug: str) -> str:
+        """First free slug, slug-1, slug-2, ... against the preloaded slug set"""
+        if slug in self.taken_slugs:
+            counter = self._slug_suffixes.get(slug, 1)
+            while f"{slug}-{counter}" in self.taken_slugs:
+                counter += 1
+            self._slug_suffixes[slug] = counter + 1
+            slug = f"{slug}-{counter}"
+        self.taken_slugs.add(slug)
+        return slug
+    
+    def check_near_duplicate(self, content: Dict) -> Optional[Dict[str, Any]]:
+        """Closest indexed post at or above duplicate_threshold, or None"""
+        if self.duplicate_index is None:
+            return None
+        matches = self.duplicate_index.find_similar(content.get('title'), content)
+        if not matches:
+            return None
+        post_id, score = matches[0]
+        post = self.duplicate_index.posts.get(post_id, {})
+        duplicate = {"post_id": post.get('id', post_id), "title": post.get('title'), "slug": post.get('slug'), "jaccard": round(score, 3)}
+        if "line" in post:
+            # Earlier item of this batch: it has no id until its chunk is written (never in
+            # dry runs), so it is identified by its custom_id and line instead
+            duplicate.update({"batch_custom_id": post['custom_id'], "batch_line": post['line']})
+        return duplicate
+
+    async def _write_chunk(self, chunk: List[Dict[str, Any]], dry_run: bool, started: float):
+        """Insert a chunk in one statement; if it fails, retry row by row to pin the failing lines"""
+        if dry_run:
+            self.processed_count += len(chunk)
+        else:
+            try:
+                await self._bulk_insert(chunk)
+                self.processed_count += len(chunk)
+            except Exception as e:
+                logger.warning(f"Bulk insert of lines {chunk[0]['line_num']}-{chunk[-1]['line_num']} failed, retrying per line: {e}")
+                await self._insert_rows(chunk)
+        
+        elapsed = time.perf_counter() - started
+        logger.info(f"Processed {self.processed_count} posts ({self.processed_count / elapsed:.1f} posts/s)")
+    
+    def _row_values(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        content = item['content']
+        title = content['title']
+        excerpt = content.get('excerpt', title[:200])
+        return {
+            "title": title,
+            "slug": item['slug'],
+            "excerpt": excerpt,
+            "content_json": json.dumps(content),
+            "seo_title": content.get('seo_title', title),
+            "seo_description": content.get('seo_description', excerpt),
+        }
+    
+    async def _bulk_insert(self, chunk: List[Dict[str, Any]]):
+        rows = [self._row_values(item) for item in chunk]
+        async with async_session_factory() as session:
+            try:
+                result = await session.execute(BULK_INSERT_SQL, {
+                    "titles": [row['title'] for row in rows],
+                    "slugs": [row['slug'] for row in rows],
+                    "excerpts": [row['excerpt'] for row in rows],
+                    "contents": [row['content_json'] for row in rows],
+                    "seo_titles": [row['seo_title'] for row in rows],
+                    "seo_descriptions": [row['seo_description'] for row in rows],
+                    "author_name": AUTHOR_NAME,
+                    "now": datetime.utcnow(),
+                })
+                ids_by_slug = {row.slug: row.id for row in result.fetchall()}
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+        for item in chunk:
+            item['info']['id'] = ids_by_slug.get(item['slug'])
+    
+    async def _insert_rows(self, chunk: List[Dict[str, Any]]):
+        """Per-line fallback: each row in its own savepoint so one bad line does not sink the chunk"""
+        async with async_session_factory() as session:
+            for item in chunk:
+                try:
+                    async with session.begin_nested():
+                        item['info']['id'] = await self._save_blog_post(session, item)
+                    self.processed_count += 1
+                except Exception as e:
+                    self._record_error(item['line_num'], ValueError(f"Failed to save item {item['custom_id']}: {e}"))
+            await session.commit()
+    
     def _validate_blog_content(self, content: Dict):
         """Validate blog content structure"""
         
@@ -166,80 +331,22 @@ class SimpleBlogBatchProcessor:
         # Limit length
         return slug[:100]
     
-    async def _save_blog_post(self, content: Dict, slug: str):
-        """Save blog post to simplified database structure"""
-        
-        async with async_session_factory() as session:
-            try:
-                # Prepare data
-                title = content['title']
-                excerpt = content.get('excerpt', title[:200])
-                seo_title = content.get('seo_title', title)
-                seo_description = content.get('seo_description', excerpt)
-                category = content.get('category', 'general')
-                
-                # Check if slug already exists
-                result = await session.execute(
-                    text("SELECT id FROM blog_posts WHERE slug = :slug"),
-                    {"slug": slug}
+    async def _save_blog_post(self, session: AsyncSession, item: Dict[str, Any]) -> int:
+        """Insert one prepared post in the caller's transaction; returns the new post id"""
+        result = await session.execute(
+            text("""
+                INSERT INTO blog_posts (
+                    title, slug, excerpt, content_json, seo_title, seo_description,
+                    author_name, status, published_at, created_at, updated_at
+                ) VALUES (
+                    :title, :slug, :excerpt, CAST(:content_json AS JSONB), :seo_title, :seo_description,
+                    :author_name, 'draft', NULL, :now, :now
                 )
-                
-                if result.fetchone():
-                    # Generate unique slug
-                    counter = 1
-                    original_slug = slug
-                    while True:
-                        new_slug = f"{original_slug}-{counter}"
-                        result = await session.execute(
-                            text("SELECT id FROM blog_posts WHERE slug = :slug"),
-                            {"slug": new_slug}
-                        )
-                        if not result.fetchone():
-                            slug = new_slug
-                            break
-                        counter += 1
-                
-                # Calculate reading time (rough estimate: 200 words per minute)
-                word_count = self._estimate_word_count(content)
-                reading_time = max(1, round(word_count / 200))
-                
-                # Insert blog post
-                insert_query = text("""
-                    INSERT INTO blog_posts (
-                        title, slug, excerpt, content_json, seo_title, seo_description,
-                        author_name, status, published_at, created_at, updated_at
-                    ) VALUES (
-                        :title, :slug, :excerpt, :content_json, :seo_title, :seo_description,
-                        :author_name, :status, :published_at, :created_at, :updated_at
-                    )
-                    RETURNING id
-                """)
-                
-                now = datetime.utcnow()
-                
-                result = await session.execute(insert_query, {
-                    "title": title,
-                    "slug": slug,
-                    "excerpt": excerpt,
-                    "content_json": json.dumps(content),
-                    "seo_title": seo_title,
-                    "seo_description": seo_description,
-                    "author_name": "GetYourMusicGear Team",
-                    "status": "draft",  # Always create as draft for review
-                    "published_at": None,
-                    "created_at": now,
-                    "updated_at": now
-                })
-                
-                blog_post_id = result.fetchone()[0]
-                
-                await session.commit()
-                
-                logger.info(f"Saved blog post: {title} (ID: {blog_post_id}, Slug: {slug})")
-                
-            except Exception as e:
-                await session.rollback()
-                raise e
+                RETURNING id
+            """),
+            {**self._row_values(item), "author_name": AUTHOR_NAME, "now": datetime.utcnow()}
+        )
+        return result.scalar()
     
     async def get_processing_stats(self) -> Dict[str, Any]:
         """Get current processing statistics"""
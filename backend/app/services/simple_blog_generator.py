@@ -10,13 +10,21 @@ from datetime import datetime
 import asyncio
 from sqlalchemy import text
 from ..database import async_session_factory
+from .llm_client import RateLimitedLLMClient, get_llm_client
+from .llm_providers import LLMProvider, OpenAIProvider
 
 logger = logging.getLogger(__name__)
 
 class SimpleBlogGenerator:
     
-    def __init__(self, openai_client=None):
-        self.openai_client = openai_client
+    model = "gpt-4.1"
+    
+    def __init__(self, openai_client=None, provider: Optional[LLMProvider] = None):
+        # An explicit provider wins and a bare AsyncOpenAI client is wrapped; otherwise
+        # calls go through the shared rate-limited client (LLM_PROVIDER), resolved on first use
+        if provider is None and openai_client is not None:
+            provider = RateLimitedLLMClient(OpenAIProvider(openai_client))
+        self.provider = provider
         self.templates = {}
     
     async def _load_templates(self):
@@ -40,6 +48,7 @@ class SimpleBlogGenerator:
         template_name: str = "buying-guide",
         products: List[Dict] = None,
         target_words: int = 4000,
+        instructions: Optional[str] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -50,6 +59,7 @@ class SimpleBlogGenerator:
             template_name: Template type (buying-guide, review, comparison, artist-spotlight, instrument-history, gear-tips, news-feature)
             products: List of products to include
             target_words: Target word count (3000-5000)
+            instructions: Extra instructions (or source material) added before the topic
             
         Returns:
             Generated blog post content as dict
@@ -62,10 +72,10 @@ class SimpleBlogGenerator:
             products = []
             
         # Build the generation prompt
-        prompt = self._build_prompt(topic, template_name, products, target_words)
+        prompt = self._build_prompt(topic, template_name, products, target_words, instructions)
         
         # Call AI model (placeholder for actual implementation)
-        response = self._call_ai_model(prompt)
+        response = await self._call_ai_model(prompt)
         
         # Parse and validate response
         try:
@@ -75,7 +85,9 @@ class SimpleBlogGenerator:
             logger.error(f"Failed to parse AI response as JSON: {e}")
             raise ValueError("AI response is not valid JSON")
     
-    def _build_prompt(self, topic: str, template_name: str, products: List[Dict], target_words: int) -> str:
+    def _build_prompt(
+        self, topic: str, template_name: str, products: List[Dict], target_words: int, instructions: Optional[str] = None
+    ) -> str:
         """Build the AI generation prompt using database templates"""
         
         # Get template from database (loaded templates)
@@ -145,7 +157,7 @@ RULES FOR PRODUCTS (if products are provided below):
 - Use EXACT product ids and slugs from the list.
 - Include 2-4 total product spotlights in the article. You may use multiple product_spotlight sections OR a single product_spotlight with multiple products inside the "products" array.
 - featured_products MUST be the array of the product ids you included (2-5 ids).
-- Build affiliate_url and store_url using the exact slug: /products/{slug}.
+- Build affiliate_url and store_url using the exact slug: /products/{{slug}}.
 
 If NO products are provided, omit any product_spotlight sections and return featured_products as an empty array.
 
@@ -163,45 +175,29 @@ CRITICAL: Respond with JSON only. No text before or after."""
                 product_context += f"- id: {pid} | name: {name} | slug: {slug} | price: {price} | rating: {rating}\n"
             prompt += product_context
 
+        if instructions:
+            prompt += f"\n\nADDITIONAL INSTRUCTIONS:\n{instructions}"
+
         prompt += f"\n\nTopic: {topic}\nTarget words: {target_words}\n\nRespond with JSON only:"
         
         return prompt
     
-    def _call_ai_model(self, prompt: str) -> str:
+    async def _call_ai_model(self, prompt: str) -> str:
         """Call the AI model to generate content"""
-        # Placeholder - replace with actual OpenAI API call
-        if self.openai_client:
-            try:
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-4.1",
-                    messages=[
-                        {"role": "system", "content": "You are an expert music journalist and gear reviewer. Always respond with valid JSON only."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=8000,
-                    temperature=0.7
-                )
-                return response.choices[0].message.content
-            except Exception as e:
-                logger.error(f"OpenAI API error: {e}")
-                raise
-        
-        # Fallback mock response for testing
-        return json.dumps({
-            "title": "Sample Article",
-            "excerpt": "A sample article excerpt.",
-            "seo_title": "Sample Article - Music Gear Guide",
-            "seo_description": "Learn about music gear in this comprehensive guide.",
-            "sections": [
-                {
-                    "type": "intro",
-                    "content": "This is a sample introduction..."
-                }
-            ],
-            "tags": ["sample", "test"],
-            "category": "general",
-            "featured_products": []
-        })
+        provider = self.provider or get_llm_client()
+        try:
+            return await provider.complete(
+                [
+                    {"role": "system", "content": "You are an expert music journalist and gear reviewer. Always respond with valid JSON only."},
+                    {"role": "user", "content": prompt}
+                ],
+                model=self.model,
+                max_tokens=8000,
+                temperature=0.7
+            )
+        except Exception as e:
+            logger.error(f"AI provider error ({provider.name}): {e}")
+            raise
     
     def _validate_and_enhance_content(self, content: Dict, products: List[Dict]) -> Dict:
         """Validate and enhance the generated content"""
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Product, ProductSpec
+
+
+# Canonical specification keys: type drives unit normalization, synonyms are matched
+# after _normalize_key (lowercase, separators collapsed, parenthesized units removed)
+SPEC_DEFINITIONS: Dict[str, Dict[str, Any]] = {
+    "frets": {"label": "Frets", "type": "count", "synonyms": ["frets", "number of frets", "fret count", "no of frets"]},
+    "strings": {"label": "Strings", "type": "count", "synonyms": ["strings", "number of strings", "string count", "no of strings"]},
+    "keys": {"label": "Keys", "type": "count", "synonyms": ["keys", "number of keys", "key count", "keyboard keys", "keyboard"]},
+    "pads": {"label": "Pads", "type": "count", "synonyms": ["pads", "number of pads", "drum pads"]},
+    "polyphony": {"label": "Polyphony", "type": "count", "synonyms": ["polyphony", "max polyphony", "maximum polyphony", "voices"]},
+    "channels": {"label": "Channels", "type": "count", "synonyms": ["channels", "number of channels", "mixer channels"]},
+    "inputs": {"label": "Inputs", "type": "count", "synonyms": ["inputs", "number of inputs", "input channels"]},
+    "outputs": {"label": "Outputs", "type": "count", "synonyms": ["outputs", "number of outputs", "output channels"]},
+    "bit_depth": {"label": "Bit Depth", "type": "count", "synonyms": ["bit depth", "resolution", "max bit depth"]},
+    "weight": {"label": "Weight", "type": "mass", "synonyms": ["weight", "net weight", "product weight", "weight approx"]},
+    "scale_length": {"label": "Scale Length", "type": "length", "synonyms": ["scale length", "scale", "mensur"]},
+    "width": {"label": "Width", "type": "length", "synonyms": ["width"]},
+    "height": {"label": "Height", "type": "length", "synonyms": ["height"]},
+    "depth": {"label": "Depth", "type": "length", "synonyms": ["depth"]},
+    "speaker_size": {"label": "Speaker Size", "type": "length", "synonyms": ["speaker size", "woofer size", "speaker", "woofer", "driver size"]},
+    "power": {"label": "Power", "type": "power", "synonyms": ["power", "output power", "power output", "wattage", "rms power", "amplifier power"]},
+    "sample_rate": {"label": "Sample Rate", "type": "frequency", "synonyms": ["sample rate", "sampling rate", "max sample rate"]},
+    "dimensions": {"label": "Dimensions", "type": "text", "synonyms": ["dimensions", "size", "dimensions wxhxd"]},
+    "body_material": {"label": "Body Material", "type": "text", "synonyms": ["body material", "body", "body wood"]},
+    "neck_material": {"label": "Neck Material", "type": "text", "synonyms": ["neck material", "neck", "neck wood"]},
+    "fretboard_material": {"label": "Fretboard Material", "type": "text", "synonyms": ["fretboard material", "fretboard", "fingerboard", "fingerboard material"]},
+    "pickups": {"label": "Pickups", "type": "text", "synonyms": ["pickups", "pickup configuration", "pickup config", "pickup"]},
+    "color": {"label": "Color", "type": "text", "synonyms": ["color", "colour", "finish color"]},
+    "connectivity": {"label": "Connectivity", "type": "text", "synonyms": ["connectivity", "connections", "connectors"]},
+}
+
+# Base unit per numeric type and conversion factors into it
+UNIT_CONVERSIONS: Dict[str, Tuple[str, Dict[str, float]]] = {
+    "mass": ("kg", {"kg": 1.0, "kgs": 1.0, "kilogram": 1.0, "kilograms": 1.0, "g": 0.001, "gram": 0.001, "grams": 0.001,
+                    "lb": 0.453592, "lbs": 0.453592, "pound": 0.453592, "pounds": 0.453592, "oz": 0.0283495}),
+    "length": ("mm", {"mm": 1.0, "cm": 10.0, "m": 1000.0, "in": 25.4, "inch": 25.4, "inches": 25.4, '"': 25.4,
+                      "″": 25.4, "ft": 304.8, "feet": 304.8}),
+    "power": ("W", {"w": 1.0, "watt": 1.0, "watts": 1.0, "kw": 1000.0}),
+    "frequency": ("Hz", {"hz": 1.0, "khz": 1000.0, "mhz": 1000000.0}),
+    "count": ("", {}),
+}
+
+_SYNONYM_INDEX: Dict[str, str] = {
+    synonym: key
+    for key, definition in SPEC_DEFINITIONS.items()
+    for synonym in [key.replace("_", " ")] + definition["synonyms"]
+}
+
+_PAREN_UNIT_RE = re.compile(r"\(([^)]*)\)")
+_KEY_CLEAN_RE = re.compile(r"[^a-z0-9]+")
+# Numbers take "44,100" / "1,000.5" as thousands groups; any other comma is a decimal
+# comma ("1,5 kg", "0,75")
+_NUMBER_UNIT_RE = re.compile(
+    r"(?<![\d.,])(-?(?:\d{1,3}(?:,\d{3})+(?![\d,])(?:\.\d+)?|\d+(?:[.,]\d+)?))"
+    r"\s*(kgs?|kilograms?|grams?|g|lbs?|pounds?|oz|mm|cm|m|inch(?:es)?|in|ft|feet|\"|″|kw|watts?|w|khz|mhz|hz)?(?![a-z])",
+    re.IGNORECASE,
+)
+_THOUSANDS_RE = re.compile(r"-?\d{1,3}(?:,\d{3})+(?:\.\d+)?")
+_FILTER_RE = re.compile(r"^\s*([A-Za-z0-9 _\-]+?)\s*(>=|<=|!=|=|>|<)\s*(.+?)\s*$")
+
+
+def _normalize_key(raw_key: str) -> Tuple[str, Optional[str]]:
+    """Lowercase and collapse separators; returns (key, unit hint from a parenthesized suffix)"""
+    lowered = str(raw_key).strip().lower()
+    unit_hint = None
+    paren = _PAREN_UNIT_RE.search(lowered)
+    if paren:
+        unit_hint = paren.group(1).strip() or None
+        lowered = _PAREN_UNIT_RE.sub(" ", lowered)
+    return _KEY_CLEAN_RE.sub(" ", lowered).strip(), unit_hint
+
+
+def canonical_spec_key(raw_key: str) -> str:
+    """Map a free-form specification key to its canonical key ("Number of Frets" -> "frets")"""
+    normalized, _ = _normalize_key(raw_key)
+    return _SYNONYM_INDEX.get(normalized, normalized.replace(" ", "_")[:100])
+
+
+def spec_label(key: str) -> str:
+    definition = SPEC_DEFINITIONS.get(key)
+    return definition["label"] if definition else key.replace("_", " ").title()
+
+
+def spec_type(key: str) -> str:
+    definition = SPEC_DEFINITIONS.get(key)
+    return definition["type"] if definition else "unknown"
+
+
+def _parse_number(text: str) -> float:
+    if _THOUSANDS_RE.fullmatch(text):
+        return float(text.replace(",", ""))
+    return float(text.replace(",", "."))
+
+
+def parse_spec_value(key: str, value: Any, unit_hint: Optional[str] = None) -> Tuple[Optional[float], Optional[str]]:
+    """
+    Parse a raw value into (numeric_value in the base unit, base unit).
+    Unit types take the first number carrying one of their units ("2 x 50 W" -> 50 W,
+    "24-bit / 96 kHz" -> 96000 Hz), else the first unitless number. Unknown keys
+    still get a unitless number, so ad-hoc numeric specs remain filterable; text
+    types never get a number.
+    """
+    kind = spec_type(key)
+    if kind == "text" or value is None or isinstance(value, (dict, list, bool)):
+        return None, None
+
+    base_unit, factors = UNIT_CONVERSIONS.get(kind, ("", {}))
+    if isinstance(value, (int, float)):
+        number, unit = float(value), unit_hint
+    else:
+        matches = list(_NUMBER_UNIT_RE.finditer(str(value)))
+        if not matches:
+            return None, None
+        match = next((m for m in matches if m.group(2) and m.group(2).lower() in factors), matches[0])
+        number = _parse_number(match.group(1))
+        unit = match.group(2) or unit_hint
+
+    if kind not in UNIT_CONVERSIONS or kind == "count":
+        return number, None
+
+    if not unit:
+        return number, base_unit
+    factor = factors.get(unit.strip().lower())
+    if factor is None:
+        return None, None
+    return round(number * factor, 4), base_unit
+
+
+def normalize_specifications(specifications: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Turn a product's raw specifications dict into canonical spec rows (first synonym wins)"""
+    if not specifications or not isinstance(specifications, dict):
+        return []
+
+    rows: Dict[str, Dict[str, Any]] = {}
+    for raw_key, value in specifications.items():
+        if value in (None, "", "N/A"):
+            continue
+        key = canonical_spec_key(raw_key)
+        if not key or key in rows:
+            continue
+        _, unit_hint = _normalize_key(raw_key)
+        numeric_value, unit = parse_spec_value(key, value, unit_hint)
+        rows[key] = {
+            "spec_key": key,
+            "raw_key": str(raw_key)[:255],
+            "value_text": value if isinstance(value, str) else str(value),
+            "numeric_value": numeric_value,
+            "unit": unit,
+        }
+    return list(rows.values())
+
+
+def parse_spec_filter(expression: str) -> Tuple[str, str, Any]:
+    """
+    Parse a filter like "frets>=24" or "weight<3kg" into (canonical key, operator, value).
+    Numeric values are converted into the key's base unit; raises ValueError when invalid.
+    """
+    match = _FILTER_RE.match(expression or "")
+    if not match:
+        raise ValueError(f"Invalid spec filter: {expression!r}")
+    raw_key, operator, raw_value = match.groups()
+    key = canonical_spec_key(raw_key)
+
+    numeric_value, _ = parse_spec_value(key, raw_value)
+    if numeric_value is not None:
+        return key, operator, numeric_value
+    if operator in ("=", "!="):
+        return key, operator, raw_value
+    raise ValueError(f"Spec filter {expression!r} needs a numeric value")
+
+
+class SpecIndexService:
+    """Maintains the product_specs index from Product.content['specifications']"""
+
+    def __init__(self, db_session: AsyncSession):
+        self.db = db_session
+
+    async def reindex_products(
+        self,
+        product_ids: Optional[Iterable[int]] = None,
+        batch_size: int = 500
+    ) -> Dict[str, int]:
+        """Rebuild spec rows for the given products (all products when None), walking by keyset"""
+        ids = list(product_ids) if product_ids is not None else None
+        products_indexed = 0
+        rows_written = 0
+        last_id = 0
+
+        while True:
+            query = (
+                select(Product.id, Product.content)
+                .where(Product.id > last_id)
+                .order_by(Product.id)
+                .limit(batch_size)
+            )
+            if ids is not None:
+                query = query.where(Product.id.in_(ids))
+            batch = (await self.db.execute(query)).all()
+            if not batch:
+                break
+
+            rows_written += await self._replace_rows(batch)
+            products_indexed += len(batch)
+            last_id = batch[-1][0]
+
+        await self.db.commit()
+        return {"products_indexed": products_indexed, "spec_rows": rows_written}
+
+    async def index_product(self, product_id: int, content: Optional[Dict[str, Any]]) -> int:
+        """
+        Replace one product's spec rows from its content, in the caller's transaction.
+        Ingest calls this right after writing Product.content so the index never lags
+        it; only Core statements are used, so any AsyncSession on the database works.
+        """
+        return await self._replace_rows([(product_id, content)])
+
+    async def _replace_rows(self, products: List[Tuple[int, Any]]) -> int:
+        values = []
+        for product_id, content in products:
+            specifications = (content or {}).get("specifications") if isinstance(content, dict) else None
+            for row in normalize_specifications(specifications):
+                values.append({"product_id": product_id, **row})
+
+        product_ids = [product_id for product_id, _ in products]
+        await self.db.execute(delete(ProductSpec).where(ProductSpec.product_id.in_(product_ids)))
+        if values:
+            await self.db.execute(ProductSpec.__table__.insert(), values)
+        return len(values)
+
+    async def get_aligned_specs(self, products: List[Product]) -> Dict[int, Dict[str, Dict[str, Any]]]:
+        """
+        Canonical specs per product: {product_id: {spec_key: row}} from the index,
+        normalizing on the fly only for products that have not been indexed yet.
+        """
+        product_ids = [p.id for p in products]
+        result = await self.db.execute(select(ProductSpec).where(ProductSpec.product_id.in_(product_ids)))
+        aligned: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        for spec in result.scalars().all():
+            aligned.setdefault(spec.product_id, {})[spec.spec_key] = {
+                "spec_key": spec.spec_key,
+                "raw_key": spec.raw_key,
+                "value_text": spec.value_text,
+                "numeric_value": spec.numeric_value,
+                "unit": spec.unit,
+            }
+
+        for product in products:
+            if product.id not in aligned:
+                specifications = (product.content or {}).get("specifications")
+                aligned[product.id] = {row["spec_key"]: row for row in normalize_specifications(specifications)}
+
+        return aligned
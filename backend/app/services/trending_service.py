@@ -14,6 +14,7 @@ from sqlalchemy.orm import selectinload
 from ..models import Product, Brand, Category, AffiliateStore
 from ..utils.vote_utils import get_multiple_products_vote_stats, get_product_vote_stats
 from ..config import settings
+from ..metrics import metrics
 
 
 class TrendingService:
@@ -35,6 +36,7 @@ class TrendingService:
         self.view_count_key = "views:product"
         self.comparison_count_key = "comparisons:pair"
         self.category_trending_key = "trending:category"
+        self.compared_with_key = "comparisons:with"
         
         # Voting influence weight (each net upvote contributes this many points)
         self.vote_weight = 2.0
@@ -140,6 +142,10 @@ class TrendingService:
             await redis_client.zincrby("comparisons:individual", 1, product_id_1)
             await redis_client.zincrby("comparisons:individual", 1, product_id_2)
             
+            # Track per-product partners for "compared with" lookups
+            await redis_client.zincrby(f"{self.compared_with_key}:{product_id_1}", 1, product_id_2)
+            await redis_client.zincrby(f"{self.compared_with_key}:{product_id_2}", 1, product_id_1)
+            
         except Exception as e:
             print(f"Error tracking comparison: {e}")
 
@@ -159,6 +165,7 @@ class TrendingService:
         # Try cache first
         cache_key = f"{self.trending_key}:{category_id or 'all'}:{limit}"
         cached_result = await redis_client.get(cache_key)
+        metrics.record_cache("trending", bool(cached_result))
         if cached_result:
             return json.loads(cached_result)
 
@@ -244,6 +251,7 @@ class TrendingService:
         # Try cache first
         cache_key = f"{self.comparison_key}:{limit}"
         cached_result = await redis_client.get(cache_key)
+        metrics.record_cache("popular_comparisons", bool(cached_result))
         if cached_result:
             return json.loads(cached_result)
 
@@ -320,6 +328,61 @@ class TrendingService:
         
         return popular_comparisons
 
+    async def get_compared_with(
+        self,
+        product_id: int,
+        limit: int = 6,
+        db: AsyncSession = None
+    ) -> List[Dict[str, Any]]:
+        """Get the products most often compared with the given product"""
+        redis_client = await self._get_redis_client()
+        if not redis_client or not db:
+            return []
+        
+        try:
+            partners = await redis_client.zrevrange(
+                f"{self.compared_with_key}:{product_id}", 0, limit - 1, withscores=True
+            )
+        except Exception as e:
+            print(f"Error getting compared-with products: {e}")
+            return []
+        
+        if not partners:
+            return []
+        
+        partner_ids = [int(pid) for pid, _ in partners]
+        query = (
+            select(Product)
+            .options(
+                selectinload(Product.brand),
+                selectinload(Product.category)
+            )
+            .where(
+                Product.id.in_(partner_ids),
+                Product.is_active.is_(True)
+            )
+        )
+        result = await db.execute(query)
+        products = {p.id: p for p in result.scalars().all()}
+        
+        compared_with = []
+        for pid_str, comparison_count in partners:
+            product = products.get(int(pid_str))
+            if not product:
+                continue
+            compared_with.append({
+                "id": product.id,
+                "name": product.name,
+                "slug": product.slug,
+                "brand": {"name": product.brand.name, "slug": product.brand.slug},
+                "category": {"name": product.category.name, "slug": product.category.slug},
+                "images": self._extract_image_urls(product.images) if product.images else [],
+                "msrp_price": float(product.msrp_price) if product.msrp_price else None,
+                "comparison_count": int(comparison_count)
+            })
+        
+        return compared_with
+
     async def get_category_trending(self, db: AsyncSession = None) -> Dict[str, List[Dict]]:
         """Get trending products by category"""
         
@@ -329,6 +392,7 @@ class TrendingService:
         
         cache_key = "trending:by_category"
         cached_result = await redis_client.get(cache_key)
+        metrics.record_cache("trending_by_category", bool(cached_result))
         if cached_result:
             return json.loads(cached_result)
 
@@ -0,0 +1,209 @@
+"""
+Statement budgets and slow-query recording.
+
+Every pooled connection gets a statement_timeout matching the route group of
+the request that checks it out, so one runaway query cannot hold a connection
+(and eventually the whole pool) indefinitely. The value is set outside any
+transaction and remembered on the connection record, so a SET is only sent
+when a connection moves between groups.
+
+Statements slower than SLOW_QUERY_MS are kept in a fixed-size ring buffer with
+their shape, a parameter fingerprint (never the values), duration and route.
+The first time a SELECT shape turns up slow, its plan is captured with EXPLAIN
+(no ANALYZE) on a separate connection in the background.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from .config import settings
+from .query_stats import QueryStats, current_request, detach_query_scope, statement_shape
+
+logger = logging.getLogger(__name__)
+
+# Default statement_timeout (ms) per route group; override with STATEMENT_TIMEOUT_RULES="blog=3000,admin=60000"
+DEFAULT_STATEMENT_TIMEOUTS: Dict[str, int] = {
+    "default": 5000,
+    "search": 3000,
+    "blog": 5000,
+    "admin": 60000,
+}
+
+# Path prefix (below API_V1_STR) -> statement timeout group
+STATEMENT_TIMEOUT_GROUPS: List[Tuple[str, str]] = [
+    ("/admin", "admin"),
+    ("/blog", "blog"),
+    ("/search", "search"),
+]
+
+
+def parse_statement_timeouts(rules: str) -> Dict[str, int]:
+    """Parse "group=milliseconds,..." into a dict; invalid or negative entries are skipped (0 disables the timeout)"""
+    parsed: Dict[str, int] = {}
+    for rule in (rules or "").split(","):
+        if "=" not in rule:
+            continue
+        group, value = rule.split("=", 1)
+        try:
+            timeout = int(value.strip())
+            if timeout < 0:
+                raise ValueError("timeout must not be negative")
+            parsed[group.strip()] = timeout
+        except ValueError:
+            logger.warning(f"Ignoring invalid statement timeout rule: {rule!r}")
+    return parsed
+
+
+def statement_timeout_group(path: str) -> str:
+    if path.startswith(settings.API_V1_STR):
+        path = path[len(settings.API_V1_STR):]
+    for prefix, group in STATEMENT_TIMEOUT_GROUPS:
+        if path.startswith(prefix):
+            return group
+    return "default"
+
+
+def _request_route(request: Optional[Dict[str, Any]]) -> Optional[str]:
+    if not request:
+        return None
+    return getattr(request.get("route"), "path", None) or request.get("path")
+
+
+def _fingerprint(parameters: Any) -> str:
+    return hashlib.md5(repr(parameters).encode("utf-8", "replace")).hexdigest()[:12]
+
+
+class SlowQueryLog:
+    """Ring buffer of slow statements plus EXPLAIN plans for the slow SELECT shapes"""
+
+    def __init__(self, threshold_ms: float, capacity: int = 500, max_plans: int = 50):
+        self.threshold_ms = threshold_ms
+        self.entries: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self.max_plans = max_plans
+        self.plans: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._explaining: set = set()
+        self._engine = None
+
+    def bind(self, engine) -> None:
+        """Engine used for background EXPLAIN capture"""
+        self._engine = engine
+
+    def record(self, statement: str, parameters: Any, duration: float, stats: Optional[QueryStats]) -> None:
+        """Statement observer for query_stats.instrument_engine"""
+        duration_ms = duration * 1000
+        if duration_ms < self.threshold_ms:
+            return
+        shape = statement_shape(statement)
+        route = _request_route(stats.request if stats is not None else None)
+        self.entries.append({
+            "shape": shape,
+            "params_fingerprint": _fingerprint(parameters),
+            "duration_ms": round(duration_ms, 1),
+            "route": route,
+            "recorded_at": time.time(),
+        })
+        logger.warning(f"Slow query ({duration_ms:.0f}ms) on {route or 'no request'}: {shape[:200]}")
+
+        if shape not in self.plans and shape not in self._explaining and statement.lstrip()[:6].upper() == "SELECT":
+            self._schedule_explain(shape, statement, parameters)
+
+    def _schedule_explain(self, shape: str, statement: str, parameters: Any) -> None:
+        if self._engine is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._explaining.add(shape)
+        loop.create_task(self._capture_explain(shape, statement, parameters))
+
+    async def _capture_explain(self, shape: str, statement: str, parameters: Any) -> None:
+        detach_query_scope()  # this task inherited the request's context
+        try:
+            async with self._engine.connect() as conn:
+                result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+                plan = "\n".join(row[0] for row in result.fetchall())
+            self.plans[shape] = {"plan": plan, "captured_at": time.time()}
+            while len(self.plans) > self.max_plans:
+                self.plans.popitem(last=False)
+        except Exception as e:
+            logger.warning(f"EXPLAIN capture failed for slow query: {e}")
+        finally:
+            self._explaining.discard(shape)
+
+    def summary(self, limit: int = 20) -> Dict[str, Any]:
+        """Recent entries plus per-shape aggregates, slowest first"""
+        shapes: Dict[str, Dict[str, Any]] = {}
+        for entry in self.entries:
+            agg = shapes.setdefault(entry["shape"], {
+                "shape": entry["shape"], "count": 0, "total_ms": 0.0, "max_ms": 0.0, "routes": set(),
+            })
+            agg["count"] += 1
+            agg["total_ms"] += entry["duration_ms"]
+            agg["max_ms"] = max(agg["max_ms"], entry["duration_ms"])
+            if entry["route"]:
+                agg["routes"].add(entry["route"])
+
+        top = sorted(shapes.values(), key=lambda agg: agg["max_ms"], reverse=True)[:limit]
+        return {
+            "threshold_ms": self.threshold_ms,
+            "buffered": len(self.entries),
+            "top_shapes": [
+                {
+                    "shape": agg["shape"],
+                    "count": agg["count"],
+                    "avg_ms": round(agg["total_ms"] / agg["count"], 1),
+                    "max_ms": agg["max_ms"],
+                    "routes": sorted(agg["routes"]),
+                    "plan": (self.plans.get(agg["shape"]) or {}).get("plan"),
+                }
+                for agg in top
+            ],
+            "recent": list(self.entries)[-limit:][::-1],
+        }
+
+
+class StatementBudget:
+    """Applies per-route-group statement_timeout on pool checkout"""
+
+    def __init__(self, timeouts: Dict[str, int]):
+        self.timeouts = {**DEFAULT_STATEMENT_TIMEOUTS, **timeouts}
+
+    def timeout_for(self, request: Optional[Dict[str, Any]]) -> int:
+        # Outside a request (startup, scripts) statements are not bounded
+        if not request:
+            return 0
+        group = statement_timeout_group(request.get("path", ""))
+        return self.timeouts.get(group, self.timeouts["default"])
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        timeout = self.timeout_for(current_request())
+        if connection_record.info.get("statement_timeout") == timeout:
+            return
+        sql = f"SET statement_timeout = {int(timeout)}"
+        if hasattr(dbapi_connection, "run_async"):
+            # Run on the driver connection directly: no transaction is open yet, so the
+            # setting is session-level and survives the rollback on check-in
+            dbapi_connection.run_async(lambda conn: conn.execute(sql))
+        else:
+            cursor = dbapi_connection.cursor()
+            cursor.execute(sql)
+            cursor.close()
+        connection_record.info["statement_timeout"] = timeout
+
+
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_MS)
+statement_budget = StatementBudget(parse_statement_timeouts(settings.STATEMENT_TIMEOUT_RULES))
+
+
+def install(engine) -> None:
+    """Attach statement budgets to the engine's pool and bind it for EXPLAIN capture"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine.pool, "checkout", statement_budget.on_checkout)
+    slow_query_log.bind(engine)
@@ -7,10 +7,11 @@ Creates 100 diverse, high-quality blog posts with proper product matching
 import asyncio
 import json
 import random
-from typing import List, Tuple
+from typing import List, Optional, Set, Tuple
 from sqlalchemy import text
 from app.database import async_session_factory
 from app.services.improved_blog_generator import ImprovedBlogGenerator
+from app.services.llm_client import get_llm_client
 
 class ProductionBlogBatchGenerator:
     def __init__(self):
@@ -32,6 +33,10 @@ class ProductionBlogBatchGenerator:
             "Rachel Green",
             "Kevin O'Connor"
         ]
+        # Slugs in blog_posts plus those handed out in this run; posts are saved
+        # concurrently, so they are allocated here under a lock
+        self.taken_slugs: Optional[Set[str]] = None
+        self._slug_lock = asyncio.Lock()
         
     async def initialize(self):
         """Initialize the generator"""
@@ -232,12 +237,10 @@ class ProductionBlogBatchGenerator:
         generated_count = 0
         failed_count = 0
         
-        for i, (topic, template) in enumerate(topics):
-            print(f"\n[{i+1}/{len(topics)}] Generating: {topic}")
-            print(f"Template: {template}")
-            
+        async def generate_one(i: int, topic: str, template: str):
+            nonlocal generated_count, failed_count
             try:
-                # Generate blog content
+                # Generate blog content (calls queue on the shared client's rate limits)
                 content = await self.generator.generate_blog_post(
                     topic=topic, 
                     template_name=template,
@@ -248,9 +251,11 @@ class ProductionBlogBatchGenerator:
                 await self._save_blog_post(content, topic, template)
                 
                 generated_count += 1
-                print(f"✅ Generated: {content['title']}")
-                print(f"   Word count: {content.get('word_count', 0)}")
-                print(f"   Author: {content.get('author_name', 'Unknown')}")
+                lines = [
+                    f"\n[{i+1}/{len(topics)}] ✅ Generated: {content['title']} (template: {template})",
+                    f"   Word count: {content.get('word_count', 0)}",
+                    f"   Author: {content.get('author_name', 'Unknown')}",
+                ]
                 
                 # Show products that were included
                 product_count = 0
@@ -258,20 +263,24 @@ class ProductionBlogBatchGenerator:
                     if section.get('type') == 'product_spotlight':
                         product = section.get('product', {})
                         product_count += 1
-                        print(f"   📦 Product {product_count}: {product.get('name', 'Unknown')} (ID: {product.get('id', 'N/A')})")
+                        lines.append(f"   📦 Product {product_count}: {product.get('name', 'Unknown')} (ID: {product.get('id', 'N/A')})")
                 
                 if product_count == 0:
-                    print("   ⚠️  No product spotlights found")
+                    lines.append("   ⚠️  No product spotlights found")
+                print("\n".join(lines))
                 
             except Exception as e:
                 failed_count += 1
-                print(f"❌ Failed: {str(e)[:100]}...")
-                continue
+                print(f"\n[{i+1}/{len(topics)}] ❌ Failed: {topic}: {str(e)[:100]}...")
+        
+        # All posts are submitted at once; the LLM client bounds concurrency and quota use
+        await asyncio.gather(*(generate_one(i, topic, template) for i, (topic, template) in enumerate(topics)))
         
         print(f"\n🎉 Production batch complete!")
         print(f"✅ Successfully generated: {generated_count} posts")
         print(f"❌ Failed to generate: {failed_count} posts")
         print(f"📊 Success rate: {(generated_count/(generated_count+failed_count)*100):.1f}%")
+        print(f"🤖 {get_llm_client().summary()}")
         
         # Show final statistics
         await self._show_batch_statistics()
@@ -286,18 +295,7 @@ class ProductionBlogBatchGenerator:
             slug = slug[:100]  # Limit slug length
             
             # Ensure unique slug
-            base_slug = slug
-            counter = 1
-            while True:
-                result = await session.execute(text('''
-                    SELECT COUNT(*) FROM blog_posts WHERE slug = :slug
-                '''), {'slug': slug})
-                
-                if result.fetchone()[0] == 0:
-                    break
-                    
-                slug = f"{base_slug}-{counter}"
-                counter += 1
+            slug = await self._allocate_slug(session, slug)
             
             # Insert blog post
             await session.execute(text('''
@@ -329,6 +327,20 @@ class ProductionBlogBatchGenerator:
             
             await session.commit()
     
+    async def _allocate_slug(self, session, slug: str) -> str:
+        """First free slug, slug-1, slug-2, ... reserved for this run"""
+        async with self._slug_lock:
+            if self.taken_slugs is None:
+                result = await session.execute(text('SELECT slug FROM blog_posts'))
+                self.taken_slugs = {row[0] for row in result.fetchall()}
+            base_slug = slug
+            counter = 1
+            while slug in self.taken_slugs:
+                slug = f"{base_slug}-{counter}"
+                counter += 1
+            self.taken_slugs.add(slug)
+            return slug
+    
     async def _show_batch_statistics(self):
         """Show statistics of generated batch"""
         async with async_session_factory() as session:
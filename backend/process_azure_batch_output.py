@@ -12,7 +12,8 @@ from datetime import datetime
 # Add the app directory to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from app.services.simple_blog_batch_processor import SimpleBlogBatchProcessor
+from app.services.simple_blog_batch_processor import SimpleBlogBatchProcessor, describe_duplicate
+from app.services.blog_near_duplicates import DEFAULT_THRESHOLD
 
 async def main():
     if len(sys.argv) < 2:
@@ -52,8 +53,9 @@ async def main():
     
     print(f"\n🚀 Processing batch output...")
     
-    # Initialize processor
-    processor = SimpleBlogBatchProcessor()
+    # Initialize processor (near-duplicates of existing posts are skipped unless --allow-duplicates)
+    allow_duplicates = "--allow-duplicates" in sys.argv
+    processor = SimpleBlogBatchProcessor(duplicate_threshold=None if allow_duplicates else DEFAULT_THRESHOLD)
     
     # Process the batch file
     try:
@@ -63,6 +65,10 @@ async def main():
         print(f"📊 Results:")
         print(f"  ✅ Successfully processed: {result.get('processed_count', 0)}")
         print(f"  ❌ Errors: {result.get('error_count', 0)}")
+        print(f"  ⚡ Throughput: {result.get('posts_per_second', 0)} posts/s ({result.get('elapsed_seconds', 0)}s)")
+        print(f"  ⏭️ Skipped near-duplicates: {len(result.get('skipped_duplicates', []))}")
+        for skipped in result.get('skipped_duplicates', [])[:5]:
+            print(f"     {skipped['custom_id']} ~ {describe_duplicate(skipped)} /{skipped['slug']} (jaccard {skipped['jaccard']})")
         
         if result.get('errors'):
             print(f"\n❌ Errors encountered:")
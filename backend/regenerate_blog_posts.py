@@ -5,14 +5,19 @@ Script to delete existing blog posts and regenerate them with improved product m
 
 import asyncio
 import json
-from typing import List
+from typing import List, Optional, Set
 from sqlalchemy import text
 from app.database import async_session_factory
 from app.services.improved_blog_generator import ImprovedBlogGenerator
+from app.services.llm_client import get_llm_client
 
 class BlogRegenerator:
     def __init__(self):
         self.generator = ImprovedBlogGenerator()
+        # Slugs in blog_posts plus those handed out in this run; posts are saved
+        # concurrently, so they are allocated here under a lock
+        self.taken_slugs: Optional[Set[str]] = None
+        self._slug_lock = asyncio.Lock()
         
     async def delete_existing_posts(self, confirm: bool = False):
         """Delete existing blog posts"""
@@ -140,18 +145,17 @@ class BlogRegenerator:
         generated_count = 0
         failed_count = 0
         
-        for i, (topic, template) in enumerate(blog_ideas):
-            print(f"\n[{i+1}/{len(blog_ideas)}] Generating: {topic}")
-            
+        async def generate_one(i: int, topic: str, template: str):
+            nonlocal generated_count, failed_count
             try:
-                # Generate blog content
+                # Generate blog content (calls queue on the shared client's rate limits)
                 content = await self.generator.generate_blog_post(topic, template)
                 
                 # Save to database
                 await self._save_blog_post(content, topic, template)
                 
                 generated_count += 1
-                print(f"  ✅ Generated and saved: {content['title']}")
+                print(f"[{i+1}/{len(blog_ideas)}] ✅ Generated and saved: {content['title']}")
                 
                 # Show products that were included
                 for section in content['sections']:
@@ -161,12 +165,15 @@ class BlogRegenerator:
                 
             except Exception as e:
                 failed_count += 1
-                print(f"  ❌ Failed to generate: {e}")
-                continue
+                print(f"[{i+1}/{len(blog_ideas)}] ❌ Failed to generate {topic}: {e}")
+        
+        # All posts are submitted at once; the LLM client bounds concurrency and quota use
+        await asyncio.gather(*(generate_one(i, topic, template) for i, (topic, template) in enumerate(blog_ideas)))
         
         print(f"\n🎉 Batch generation complete!")
         print(f"  ✅ Generated: {generated_count} posts")
         print(f"  ❌ Failed: {failed_count} posts")
+        print(f"  🤖 {get_llm_client().summary()}")
     
     async def _save_blog_post(self, content: dict, original_topic: str, template: str):
         """Save generated blog post to database"""
@@ -175,6 +182,7 @@ class BlogRegenerator:
             import re
             slug = re.sub(r'[^a-zA-Z0-9\s-]', '', content['title'])
             slug = re.sub(r'\s+', '-', slug.strip()).lower()
+            slug = await self._allocate_slug(session, slug)
             
             # Insert blog post
             await session.execute(text('''
@@ -205,6 +213,20 @@ class BlogRegenerator:
             
             await session.commit()
     
+    async def _allocate_slug(self, session, slug: str) -> str:
+        """First free slug, slug-1, slug-2, ... reserved for this run"""
+        async with self._slug_lock:
+            if self.taken_slugs is None:
+                result = await session.execute(text('SELECT slug FROM blog_posts'))
+                self.taken_slugs = {row[0] for row in result.fetchall()}
+            base_slug = slug
+            counter = 1
+            while slug in self.taken_slugs:
+                slug = f"{base_slug}-{counter}"
+                counter += 1
+            self.taken_slugs.add(slug)
+            return slug
+    
     def _get_random_author(self) -> str:
         """Get a random author name for blog posts"""
         authors = [
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Timings for the blog listing filters and product JSON-path queries indexed by
+migrations 015/016 (GIN on tag_slugs and content->'store_links', the published
+category index, the missing-main-image partial index).
+
+Runs each query with EXPLAIN (ANALYZE, BUFFERS) several times and reports the
+median execution time and the plan's scan node with the indexes it used.
+--seed-posts/--seed-products insert synthetic rows and --drop-indexes drops the
+indexes above, both inside the benchmark's transaction, which is rolled back at
+the end: nothing is left behind, but the tables are locked while it runs, so
+point DATABASE_URL at a development database.
+
+Measured (median of 7, ms) with --seed-products 200000 --seed-posts 50000 on an
+empty database, PostgreSQL 16, local socket (seeded: 5% of products with a
+Thomann store link, 2% missing the main image; 10 categories and 10 tags, 6 in 7
+posts published):
+
+  query                         --drop-indexes    indexes
+  blog_by_tag                           72.7       15.5
+  blog_by_category                      59.5        5.4
+  products_with_store_link             158.5       20.0
+  products_missing_main_image          170.6        2.7
+
+Usage (from backend/):
+  python -m scripts.benchmarks.jsonb_queries
+  python -m scripts.benchmarks.jsonb_queries --seed-products 200000 --seed-posts 50000 [--drop-indexes]
+  python -m scripts.benchmarks.jsonb_queries --runs 10 --tag guitar --category reviews --store Thomann
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+
+from sqlalchemy import text
+
+from app.database import async_session_factory
+
+# Same predicates as GET /blog/posts (tag, category) and the product maintenance scripts
+QUERIES = {
+    "blog_by_tag": (
+        "SELECT bp.id FROM blog_posts bp "
+        "WHERE bp.status = 'published' AND bp.tag_slugs @> ARRAY[CAST(:tag AS text)]"
+    ),
+    "blog_by_category": (
+        "SELECT bp.id FROM blog_posts bp "
+        "WHERE bp.category_slug = :category AND bp.status = 'published'"
+    ),
+    "products_with_store_link": (
+        "SELECT p.id FROM products p WHERE p.content->'store_links' ? :store"
+    ),
+    "products_missing_main_image": (
+        "SELECT p.id FROM products p WHERE COALESCE(p.images->'thomann_main'->>'url', '') = ''"
+    ),
+}
+
+
+INDEXES = (
+    "ix_blog_posts_tag_slugs",
+    "ix_blog_posts_published_category",
+    "ix_products_store_links",
+    "ix_products_missing_main_image",
+)
+
+SEED_CATEGORIES = ["reviews", "buying-guide", "comparison", "tutorial", "history",
+                   "artist-spotlight", "gear-tips", "news", "roundup", "quiz"]
+SEED_TAGS = ["guitar", "bass", "drums", "keys", "synth", "mics", "pedals", "amps", "studio", "dj"]
+
+
+async def seed(session, products: int, posts: int) -> None:
+    """Synthetic products and blog posts, for the caller's transaction to roll back"""
+    if products:
+        brand_id = (await session.execute(text(
+            "INSERT INTO brands (name, slug, created_at) VALUES ('JSONB Bench', 'jsonb-bench', NOW()) RETURNING id"
+        ))).scalar()
+        category_id = (await session.execute(text(
+            "INSERT INTO categories (name, slug, is_active, created_at) "
+            "VALUES ('JSONB Bench', 'jsonb-bench', true, NOW()) RETURNING id"
+        ))).scalar()
+        await session.execute(text("""
+            INSERT INTO products (
+                sku, name, slug, brand_id, category_id, images, content, review_count, is_active,
+                created_at, updated_at, category_attributes, openai_processing_status
+            )
+            SELECT 'JSONB-BENCH-' || g, 'JSONB Bench ' || g, 'jsonb-bench-' || g, :brand_id, :category_id,
+                   CASE WHEN g % 50 = 0 THEN '{}'::jsonb
+                        ELSE jsonb_build_object('thomann_main', jsonb_build_object('url', 'https://img.test/' || g || '.jpg')) END,
+                   jsonb_build_object(
+                       'store_links', CASE WHEN g % 20 = 0 THEN jsonb_build_object('Thomann', 'https://t.test/' || g)
+                                           ELSE jsonb_build_object('Gear4music', 'https://g.test/' || g) END,
+                       'specifications', jsonb_build_object('weight', (g % 10) || ' kg'),
+                       'description', repeat('lorem ipsum ', 20)
+                   ),
+                   0, true, NOW(), NOW(), '{}'::jsonb, 'completed'
+            FROM generate_series(1, :count) g
+        """), {"brand_id": brand_id, "category_id": category_id, "count": products})
+    if posts:
+        # Inserted through the listing-fields trigger, which fills category_slug and tag_slugs
+        await session.execute(text("""
+            INSERT INTO blog_posts (title, slug, status, published_at, content_json)
+            SELECT 'JSONB Bench ' || g, 'jsonb-bench-' || g,
+                   CASE WHEN g % 7 = 0 THEN 'draft' ELSE 'published' END,
+                   NOW() - make_interval(mins => g),
+                   jsonb_build_object(
+                       'category', (CAST(:categories AS text[]))[g % 10 + 1],
+                       'tags', jsonb_build_array((CAST(:tags AS text[]))[g % 10 + 1], 'gear ' || (g % 97)),
+                       'sections', jsonb_build_array(jsonb_build_object('content', repeat('body text ', 100)))
+                   )
+            FROM generate_series(1, :count) g
+        """), {"categories": SEED_CATEGORIES, "tags": SEED_TAGS, "count": posts})
+    await session.execute(text("ANALYZE products"))
+    await session.execute(text("ANALYZE blog_posts"))
+
+
+def _index_names(node: dict) -> list:
+    names = [node["Index Name"]] if node.get("Index Name") else []
+    for child in node.get("Plans", []):
+        names.extend(_index_names(child))
+    return names
+
+
+def _top_node(plan: dict) -> str:
+    node = plan["Plan"]
+    # Skip wrapper nodes to show how the rows are actually found
+    while node.get("Plans") and node["Node Type"] in ("Gather", "Result", "Limit", "Sort"):
+        node = node["Plans"][0]
+    # Bitmap scans name their indexes on the child Bitmap Index Scan / BitmapAnd nodes
+    indexes = ", ".join(_index_names(node))
+    return f"{node['Node Type']}{f' using {indexes}' if indexes else ''}"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Benchmark blog listing filters and product JSON-path queries')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--tag', type=str, default='guitar')
+    parser.add_argument('--category', type=str, default='reviews')
+    parser.add_argument('--store', type=str, default='Thomann')
+    parser.add_argument('--seed-products', type=int, default=0, help='Synthetic products to add (rolled back)')
+    parser.add_argument('--seed-posts', type=int, default=0, help='Synthetic blog posts to add (rolled back)')
+    parser.add_argument('--drop-indexes', action='store_true', help='Measure without the indexes (rolled back)')
+    args = parser.parse_args()
+
+    params = {"tag": args.tag, "category": args.category, "store": args.store}
+
+    # Everything runs in one transaction that is never committed
+    async with async_session_factory() as session:
+        if args.seed_products or args.seed_posts:
+            print(f"🌱 Seeding {args.seed_products} products and {args.seed_posts} blog posts...")
+            await seed(session, args.seed_products, args.seed_posts)
+        if args.drop_indexes:
+            for index in INDEXES:
+                await session.execute(text(f"DROP INDEX IF EXISTS {index}"))
+
+        print(f"{'query':<30} {'median ms':>10} {'rows':>8}  plan")
+        for name, sql in QUERIES.items():
+            timings = []
+            rows = 0
+            node = ""
+            for _ in range(args.runs):
+                result = await session.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params)
+                raw = result.scalar()
+                plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+                timings.append(plan["Execution Time"])
+                rows = plan["Plan"]["Actual Rows"]
+                node = _top_node(plan)
+            print(f"{name:<30} {statistics.median(timings):>10.2f} {rows:>8}  {node}")
+        await session.rollback()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
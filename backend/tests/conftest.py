@@ -0,0 +1,70 @@
+"""
+Shared fixtures.
+
+Tests that need PostgreSQL use DATABASE_URL (migrated with `alembic upgrade head`)
+and are skipped when it cannot be reached. Data written through db_session is
+rolled back after each test.
+"""
+
+import os
+
+os.environ.setdefault("ENVIRONMENT", "development")
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import engine, get_db, get_read_db
+from app.main import app
+from app.query_stats import max_queries
+
+
+@pytest.fixture(autouse=True)
+async def _dispose_engine():
+    yield
+    # Every test gets its own event loop; pooled asyncpg connections cannot outlive it
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db_connection():
+    try:
+        connection = await engine.connect()
+    except Exception as e:
+        pytest.skip(f"Database unavailable: {e}")
+    yield connection
+    await connection.close()
+
+
+@pytest.fixture
+async def db_session(db_connection):
+    """Session inside an outer transaction that is rolled back; commits become savepoints"""
+    transaction = await db_connection.begin()
+    session = AsyncSession(bind=db_connection, join_transaction_mode="create_savepoint", expire_on_commit=False)
+    yield session
+    await session.close()
+    await transaction.rollback()
+
+
+@pytest.fixture
+async def client(db_session):
+    """HTTP client for the app with get_db/get_read_db bound to db_session"""
+    async def override_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_read_db] = override_db
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http_client:
+        yield http_client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Query budget for a block, failing with the repeated statement shapes:
+
+        with assert_max_queries(4):
+            await client.get("/api/v1/compare?ids=1,2")
+    """
+    return max_queries
@@ -0,0 +1,49 @@
+"""Materialized affiliate URLs written at ingest time"""
+
+from sqlalchemy import select
+
+from app.models import AffiliateStore, Brand, Category, Product, ProductAffiliateUrl
+from app.services.enhanced_affiliate_service import EnhancedAffiliateService
+
+
+async def _seed(db):
+    brand = Brand(name="Affiliate Test Brand", slug="affiliate-test-brand")
+    category = Category(name="Affiliate Test Category", slug="affiliate-test-category")
+    store = AffiliateStore(
+        name="Affiliatestore", slug="affiliatestore", website_url="https://affiliatestore.test",
+        has_affiliate_program=True, affiliate_id="gear-21",
+    )
+    db.add_all([brand, category, store])
+    await db.flush()
+    product = Product(
+        sku="AFF-1", name="Affiliate Test Product", slug="affiliate-test-product",
+        brand_id=brand.id, category_id=category.id,
+        content={"store_links": {"Affiliatestore": "https://affiliatestore.test/old"}},
+    )
+    db.add(product)
+    await db.flush()
+    return product, store
+
+
+async def _stored_url(db, product_id: int, store_id: int) -> ProductAffiliateUrl:
+    result = await db.execute(
+        select(ProductAffiliateUrl)
+        .where(ProductAffiliateUrl.product_id == product_id, ProductAffiliateUrl.store_id == store_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+async def test_materialize_product_urls_follows_store_link_changes(db_session):
+    product, store = await _seed(db_session)
+    service = EnhancedAffiliateService(db_session)
+
+    assert await service.materialize_product_urls(product.id, product.content) >= 1
+    row = await _stored_url(db_session, product.id, store.id)
+    assert row.original_url == "https://affiliatestore.test/old"
+
+    new_content = {"store_links": {"Affiliatestore": "https://affiliatestore.test/new"}}
+    await service.materialize_product_urls(product.id, new_content)
+    row = await _stored_url(db_session, product.id, store.id)
+    assert row.original_url == "https://affiliatestore.test/new"
+    assert service._is_materialized_url_fresh(row, store, "https://affiliatestore.test/new")
@@ -0,0 +1,63 @@
+"""Generation job queue end to end with the offline provider (LLM_PROVIDER=fake)"""
+
+import pytest
+from sqlalchemy import text
+
+from app.api.dependencies import ADMIN_API_KEY
+from app.config import settings
+from app.database import async_session_factory
+from app.services import llm_client
+from app.services.blog_generation_jobs import BlogGenerationWorker, enqueue_job, get_job
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "fake")
+    # Build the shared client afresh around the fake provider
+    monkeypatch.setattr(llm_client, "_client", None)
+
+
+async def test_worker_drains_generate_job_offline(db_connection, fake_llm):
+    # The worker commits through its own sessions, so this test cleans up after itself
+    async with async_session_factory() as session:
+        job = await enqueue_job(session, "generate", {"title": "Offline Queue Test Guide", "target_word_count": 800})
+        await session.commit()
+
+    post_id = None
+    try:
+        worker = BlogGenerationWorker(poll_interval=0)
+        assert worker.provider.name == "fake"
+        assert await worker.run(drain=True) >= 1
+
+        async with async_session_factory() as session:
+            finished = await get_job(session, job["id"])
+            assert finished["status"] == "completed", finished["error_message"]
+            assert finished["attempts"] == 1
+            post_id = finished["blog_post_id"]
+            assert post_id is not None
+            assert finished["result"]["title"] == "Offline Queue Test Guide"
+
+            result = await session.execute(
+                text("SELECT status, generated_by_ai, generation_model FROM blog_posts WHERE id = :id"), {"id": post_id}
+            )
+            post = result.fetchone()
+            assert (post.status, post.generated_by_ai, post.generation_model) == ("draft", True, "fake")
+    finally:
+        async with async_session_factory() as session:
+            await session.execute(text("DELETE FROM blog_generation_jobs WHERE id = :id"), {"id": job["id"]})
+            if post_id is not None:
+                await session.execute(text("DELETE FROM blog_posts WHERE id = :id"), {"id": post_id})
+            await session.commit()
+
+
+async def test_blog_generate_endpoint_queues_a_job(client):
+    headers = {"X-Admin-Key": ADMIN_API_KEY}
+    body = {"template_id": 1, "title": "Queued Endpoint Test Guide"}
+
+    response = await client.post(f"{settings.API_V1_STR}/blog/generate", json=body, headers=headers)
+
+    assert response.status_code == 202
+    job = response.json()
+    assert job["kind"] == "generate" and job["status"] == "pending"
+    polled = await client.get(f"{settings.API_V1_STR}/blog/jobs/{job['id']}", headers=headers)
+    assert polled.json()["status"] == "pending"
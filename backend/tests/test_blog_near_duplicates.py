@@ -0,0 +1,72 @@
+"""MinHash/LSH near-duplicate detection and in-batch skipping, without a database"""
+
+import json
+
+from app.services.blog_near_duplicates import DEFAULT_THRESHOLD, NearDuplicateIndex, jaccard, post_text, shingles
+from app.services.simple_blog_batch_processor import SimpleBlogBatchProcessor
+
+
+def _words(start: int, stop: int, prefix: str = "w") -> str:
+    return " ".join(f"{prefix}{i}" for i in range(start, stop))
+
+
+def _content(body: str, title: str = "Near Duplicate Test") -> dict:
+    return {"title": title, "sections": [{"type": "intro", "title": "Overview", "content": body}]}
+
+
+def _batch_item(custom_id: str, content: dict) -> dict:
+    return {"custom_id": custom_id, "response": {"body": {"choices": [{"message": {"content": json.dumps(content)}}]}}}
+
+
+ARTICLE = _words(0, 200)
+# Two words changed out of 200
+NEAR_COPY = ARTICLE.replace("w50 ", "x50 ").replace("w150 ", "x150 ")
+UNRELATED = _words(0, 200, prefix="z")
+
+
+def test_near_copy_scores_above_threshold_and_unrelated_text_does_not():
+    assert jaccard(shingles(ARTICLE), shingles(NEAR_COPY)) >= DEFAULT_THRESHOLD
+    assert jaccard(shingles(ARTICLE), shingles(UNRELATED)) == 0.0
+
+    index = NearDuplicateIndex()
+    index.add(1, "Near Duplicate Test", _content(ARTICLE))
+
+    matches = index.find_similar("Near Duplicate Test", _content(NEAR_COPY))
+    assert [post_id for post_id, _ in matches] == [1]
+    assert matches[0][1] >= DEFAULT_THRESHOLD
+    assert index.find_similar("Something Else", _content(UNRELATED)) == []
+
+
+def test_post_text_reads_title_and_sections():
+    assert post_text("Title", _content("Body")) == "Title Overview Body"
+    assert post_text(None, {"sections": "not a list"}) == ""
+
+
+def test_duplicate_groups_merge_transitive_pairs():
+    # 1~2 and 2~3 overlap by 170 of 200 words (~0.73); 1 and 3 only by 140 (~0.53)
+    index = NearDuplicateIndex()
+    index.add(1, None, _content(_words(0, 200), title=""))
+    index.add(2, None, _content(_words(30, 230), title=""))
+    index.add(3, None, _content(_words(60, 260), title=""))
+    index.add(4, None, _content(UNRELATED, title=""))
+
+    assert sorted((first, second) for first, second, _ in index.duplicate_pairs()) == [(1, 2), (2, 3)]
+    assert index.duplicate_groups() == [[1, 2, 3]]
+
+
+def test_second_matching_line_in_a_batch_is_skipped():
+    processor = SimpleBlogBatchProcessor()
+    processor.duplicate_index = NearDuplicateIndex(processor.duplicate_threshold)
+
+    first = processor._prepare_batch_item(_batch_item("post-a", _content(ARTICLE)), 1)
+    second = processor._prepare_batch_item(_batch_item("post-b", _content(NEAR_COPY)), 2)
+    third = processor._prepare_batch_item(_batch_item("post-c", _content(UNRELATED, title="Other Topic")), 3)
+
+    assert first is not None and third is not None
+    assert second is None
+    [skipped] = processor.skipped_duplicates
+    assert skipped["custom_id"] == "post-b"
+    assert skipped["batch_custom_id"] == "post-a"
+    assert skipped["batch_line"] == 1
+    assert skipped["post_id"] is None
+    assert skipped["jaccard"] >= DEFAULT_THRESHOLD
@@ -0,0 +1,61 @@
+"""Incremental related-posts rebuilds when posts are unpublished and republished"""
+
+import json
+
+from sqlalchemy import text
+
+from app.services.blog_similarity import BlogSimilarityService
+
+POSTS = {
+    "sim-test-amp-review": "Tube guitar amp review",
+    "sim-test-amp-guide": "Tube guitar amp buying guide",
+    "sim-test-amp-history": "History of the tube guitar amp",
+}
+
+
+async def _seed_posts(session) -> dict:
+    ids = {}
+    for slug, title in POSTS.items():
+        result = await session.execute(
+            text("""
+                INSERT INTO blog_posts (title, slug, status, published_at, content_json)
+                VALUES (:title, :slug, 'published', NOW(), CAST(:content AS jsonb))
+                RETURNING id
+            """),
+            {"title": title, "slug": slug, "content": json.dumps({"sections": [{"title": title, "content": title}]})},
+        )
+        ids[slug] = result.scalar()
+    return ids
+
+
+async def _related(session, post_id: int) -> list:
+    result = await session.execute(
+        text("SELECT related_id FROM blog_post_related WHERE post_id = :id AND kind = 'post' ORDER BY rank"),
+        {"id": post_id},
+    )
+    return [row[0] for row in result.fetchall()]
+
+
+async def _set_status(session, post_id: int, status: str) -> None:
+    await session.execute(text("UPDATE blog_posts SET status = :status WHERE id = :id"), {"status": status, "id": post_id})
+
+
+async def test_unpublish_refills_lists_and_republish_recomputes(db_session):
+    ids = await _seed_posts(db_session)
+    service = BlogSimilarityService(db_session, top_k=1)
+    await service.rebuild(full=True)
+
+    review, guide, history = ids["sim-test-amp-review"], ids["sim-test-amp-guide"], ids["sim-test-amp-history"]
+    neighbour = (await _related(db_session, review))[0]
+    other = history if neighbour == guide else guide
+
+    # The neighbour's slot is refilled from the remaining posts, not left empty
+    await _set_status(db_session, neighbour, "draft")
+    await service.rebuild()
+    assert await _related(db_session, review) == [other]
+    assert await _related(db_session, neighbour) == []
+
+    # Republished with unchanged text, it still gets a list again
+    await _set_status(db_session, neighbour, "published")
+    await service.rebuild()
+    assert await _related(db_session, neighbour) != []
@@ -0,0 +1,90 @@
+"""RateLimitedLLMClient quota buckets, retries and 429 cooldown with the offline provider"""
+
+import asyncio
+import random
+
+import pytest
+
+from app.services.llm_client import RateLimitedLLMClient, TokenBucket
+from app.services.llm_providers import FakeProvider, LLMProviderError
+
+MESSAGES = [{"role": "user", "content": "Topic: Rate Limit Test"}]
+
+
+@pytest.fixture
+def max_backoff(monkeypatch):
+    # Full jitter draws from [0, cap]; always take the cap so waits are predictable
+    monkeypatch.setattr(random, "uniform", lambda low, high: high)
+
+
+def test_token_bucket_refills_over_time():
+    now = [0.0]
+    bucket = TokenBucket(60, clock=lambda: now[0])
+
+    assert bucket.wait_time(60) == 0.0
+    bucket.tokens = 0.0
+    assert bucket.wait_time(30) == pytest.approx(30.0)
+    now[0] = 15.0
+    assert bucket.wait_time(30) == pytest.approx(15.0)
+    # Requests larger than the bucket wait for a full bucket, not forever
+    assert bucket.wait_time(1000) == pytest.approx(45.0)
+    now[0] = 120.0
+    assert bucket.wait_time(60) == 0.0
+    assert bucket.tokens == pytest.approx(60.0)
+
+
+async def test_calls_are_charged_to_both_buckets():
+    client = RateLimitedLLMClient(FakeProvider(), requests_per_minute=60, tokens_per_minute=10000, max_retries=0)
+
+    result = await client.chat(MESSAGES, "test-model", max_tokens=500)
+
+    assert "Rate Limit Test" in result.text
+    assert client.request_bucket.tokens == pytest.approx(59.0, abs=0.1)
+    assert client.token_bucket.tokens < 10000 - 500
+    assert client.stats["calls"] == 1
+
+
+async def test_retryable_failures_are_retried(max_backoff):
+    provider = FakeProvider(fail_times=2, fail_status=503)
+    client = RateLimitedLLMClient(provider, 0, 0, max_retries=3, backoff_base=0.01, backoff_max=0.01)
+
+    await client.chat(MESSAGES, "test-model")
+
+    assert provider.calls == 3
+    assert client.stats["retries"] == 2
+    assert client.stats["calls"] == 1
+    assert client.stats["failures"] == 0
+
+
+async def test_gives_up_after_max_retries(max_backoff):
+    provider = FakeProvider(fail_times=5)
+    client = RateLimitedLLMClient(provider, 0, 0, max_retries=1, backoff_base=0.01, backoff_max=0.01)
+
+    with pytest.raises(LLMProviderError):
+        await client.chat(MESSAGES, "test-model")
+
+    assert provider.calls == 2
+    assert client.stats["failures"] == 1
+
+
+async def test_client_errors_are_not_retried():
+    provider = FakeProvider(fail_times=1, fail_status=400)
+    client = RateLimitedLLMClient(provider, 0, 0, max_retries=3)
+
+    with pytest.raises(LLMProviderError):
+        await client.chat(MESSAGES, "test-model")
+
+    assert provider.calls == 1
+    assert client.stats["retries"] == 0
+
+
+async def test_429_pauses_other_callers(max_backoff):
+    provider = FakeProvider(fail_times=1, fail_status=429)
+    client = RateLimitedLLMClient(provider, 0, 0, max_concurrency=2, max_retries=1, backoff_base=0.2, backoff_max=0.2)
+
+    # The first call hits the 429; the second one starts during the backoff and waits it out
+    await asyncio.gather(client.chat(MESSAGES, "test-model"), client.chat(MESSAGES, "test-model"))
+
+    assert provider.calls == 3
+    assert client.stats["retries"] == 1
+    assert client.stats["wait_seconds"] >= 0.15
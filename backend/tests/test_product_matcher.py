@@ -0,0 +1,69 @@
+"""ProductIndex lookups and ranking over in-memory product rows"""
+
+import pytest
+
+from app.services.product_matcher import BRAND_WEIGHT, NAME_WEIGHT, ProductIndex
+
+# Load order is the popularity ranking
+PRODUCTS = [
+    {"id": 1, "name": "MPC One", "brand_name": "AKAI Professional", "category_slug": "drum-machines", "category_name": "Drum Machines"},
+    {"id": 2, "name": "MPK Mini MK3", "brand_name": "Akai", "category_slug": "midi-keyboards", "category_name": "MIDI Keyboards"},
+    {"id": 3, "name": "Stratocaster Electric Guitar", "brand_name": "Fender", "category_slug": "electric-guitars", "category_name": "Electric Guitars"},
+    {"id": 4, "name": "Telecaster Electric Guitar", "brand_name": "Fender", "category_slug": "electric-guitars", "category_name": "Electric Guitars"},
+    {"id": 5, "name": "Kaiser 50 Combo", "brand_name": "Kaiser", "category_slug": "amps", "category_name": "Amplifiers"},
+]
+
+
+@pytest.fixture
+def index():
+    return ProductIndex(PRODUCTS)
+
+
+def _ids(results):
+    return [product["id"] for product, _ in results]
+
+
+def test_duplicate_ids_are_loaded_once():
+    assert len(ProductIndex(PRODUCTS + [dict(PRODUCTS[0], name="Duplicate")])) == len(PRODUCTS)
+
+
+def test_brand_ids_match_whole_words(index):
+    assert index.brand_ids("akai") == {1, 2}
+    assert index.brand_ids("AKAI Professional") == {1}
+    assert index.brand_ids("professional akai") == set()
+    assert index.brand_ids("kai") == set()
+    assert index.brand_ids("") == set()
+
+
+def test_keyword_ids_need_every_word(index):
+    assert index.keyword_ids("electric guitars") == {3, 4}
+    assert index.keyword_ids("akai mpc") == {1}
+    assert index.keyword_ids("midi keyboard") == {2}
+    assert index.keyword_ids("electric banjo") == set()
+    assert index.keyword_ids("") == set()
+
+
+def test_search_ranks_brand_and_name_matches(index):
+    results = index.search("Fender Stratocaster buying guide", brands=["fender"])
+
+    assert _ids(results) == [3, 4]
+    assert [score for _, score in results] == [BRAND_WEIGHT + NAME_WEIGHT, BRAND_WEIGHT]
+
+
+def test_search_combines_categories_keywords_and_limit(index):
+    results = index.search(categories=["amps"], keywords=["drum machine"])
+    assert _ids(results) == [1, 5]
+    assert _ids(index.search(brands=["akai"], limit=1)) == [1]
+    assert index.search("nothing matches here") == []
+
+
+def test_search_ties_follow_load_order():
+    assert _ids(ProductIndex(PRODUCTS).search(brands=["fender"])) == [3, 4]
+    assert _ids(ProductIndex(list(reversed(PRODUCTS))).search(brands=["fender"])) == [4, 3]
+
+
+def test_top_overall_and_by_category(index):
+    assert [product["id"] for product in index.top(2)] == [1, 2]
+    assert [product["id"] for product in index.top(5, ["amps", "electric-guitars"])] == [3, 4, 5]
+    assert [product["id"] for product in index.top(1, ["Electric-Guitars"])] == [3]
+    assert index.top(3, ["synths"]) == []
@@ -0,0 +1,74 @@
+"""Query budgets (and compare caching) for endpoints that used to issue queries per product (N+1)"""
+
+from decimal import Decimal
+
+import pytest
+
+from app.api.compare import MAX_COMPARE_PRODUCTS
+from app.config import settings
+from app.models import AffiliateStore, Brand, Category, Product, ProductPrice
+
+COMPARE_URL = f"{settings.API_V1_STR}/compare"
+
+
+async def _seed_products(db, count: int) -> list:
+    brand = Brand(name="Query Count Brand", slug="query-count-brand")
+    category = Category(name="Query Count Category", slug="query-count-category")
+    store = AffiliateStore(name="Query Count Store", slug="query-count-store", website_url="https://store.test")
+    db.add_all([brand, category, store])
+    await db.flush()
+
+    products = [
+        Product(
+            sku=f"QC-{i}",
+            name=f"Query Count Product {i}",
+            slug=f"query-count-product-{i}",
+            brand_id=brand.id,
+            category_id=category.id,
+            content={"specifications": {"Weight": f"{i + 1} kg", "Color": "Black"}},
+        )
+        for i in range(count)
+    ]
+    db.add_all(products)
+    await db.flush()
+    db.add_all([
+        ProductPrice(product_id=p.id, store_id=store.id, price=Decimal("199.00"), affiliate_url=f"https://store.test/{p.slug}")
+        for p in products
+    ])
+    await db.flush()
+    ids = [p.id for p in products]
+    # The endpoint has to load everything itself, as it would for a fresh request
+    db.expunge_all()
+    return ids
+
+
+@pytest.mark.parametrize("count", [2, 5])
+async def test_compare_query_count_does_not_grow_with_products(client, db_session, assert_max_queries, count):
+    ids = await _seed_products(db_session, count)
+
+    # Version stamp, products with brand/category/prices, vote stats, spec index
+    with assert_max_queries(4):
+        response = await client.get(COMPARE_URL, params={"ids": ",".join(map(str, ids))})
+
+    assert response.status_code == 200
+    assert [p["id"] for p in response.json()["products"]] == sorted(ids)
+
+
+async def test_compare_serves_etag_without_cache_fields(client, db_session):
+    ids = await _seed_products(db_session, 2)
+
+    response = await client.get(COMPARE_URL, params={"ids": ",".join(map(str, ids))})
+    assert response.status_code == 200
+    assert "version" not in response.json() and "etag" not in response.json()
+
+    # Same set in another order: served from the cache entry, so the ETag matches
+    cached = await client.get(
+        COMPARE_URL, params={"ids": ",".join(map(str, reversed(ids)))},
+        headers={"If-None-Match": response.headers["etag"]},
+    )
+    assert cached.status_code == 304
+
+
+async def test_compare_post_is_bounded(client):
+    response = await client.post(COMPARE_URL, json=list(range(1, MAX_COMPARE_PRODUCTS + 2)))
+    assert response.status_code == 400
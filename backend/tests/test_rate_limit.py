@@ -0,0 +1,17 @@
+"""RATE_LIMIT_RULES parsing"""
+
+import pytest
+
+from app.rate_limit import RateLimit, parse_rate_limit_rules
+
+
+def test_parses_rules():
+    assert parse_rate_limit_rules("default=100/60, search=60/60") == {
+        "default": RateLimit(100, 60),
+        "search": RateLimit(60, 60),
+    }
+
+
+@pytest.mark.parametrize("rule", ["api=0/60", "api=10/0", "api=-1/60", "api=ten/60", "api=10"])
+def test_skips_invalid_and_non_positive_rules(rule):
+    assert parse_rate_limit_rules(f"{rule},default=100/60") == {"default": RateLimit(100, 60)}
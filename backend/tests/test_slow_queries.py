@@ -0,0 +1,18 @@
+"""STATEMENT_TIMEOUT_RULES parsing"""
+
+import pytest
+
+from app.slow_queries import parse_statement_timeouts
+
+
+def test_parses_rules():
+    assert parse_statement_timeouts("blog=3000, admin=60000,search=0") == {
+        "blog": 3000,
+        "admin": 60000,
+        "search": 0,
+    }
+
+
+@pytest.mark.parametrize("rule", ["search=-1", "search=fast", "search=1.5", "search"])
+def test_skips_invalid_and_negative_rules(rule):
+    assert parse_statement_timeouts(f"{rule},blog=3000") == {"blog": 3000}
@@ -0,0 +1,54 @@
+"""Spec value and filter parsing for the product_specs index"""
+
+import pytest
+
+from app.services.spec_index import parse_spec_filter, parse_spec_value
+
+
+@pytest.mark.parametrize("key, value, expected", [
+    ("sample_rate", "44,100 Hz", (44100.0, "Hz")),
+    ("sample_rate", "24-bit / 96 kHz", (96000.0, "Hz")),
+    ("power", "2 x 50 W", (50.0, "W")),
+    ("power", "1,000.5 W", (1000.5, "W")),
+    ("weight", "1,5 kg", (1.5, "kg")),
+    ("weight", "0,75", (0.75, "kg")),
+    ("weight", "3.5 kg (7.7 lbs)", (3.5, "kg")),
+    ("weight", "2 lbs", (0.9072, "kg")),
+    ("scale_length", '25.5"', (647.7, "mm")),
+    ("frets", "22", (22.0, None)),
+    ("frets", 24, (24.0, None)),
+    ("pickup_count", "3 humbuckers", (3.0, None)),
+])
+def test_parse_spec_value(key, value, expected):
+    assert parse_spec_value(key, value) == expected
+
+
+@pytest.mark.parametrize("key, value", [
+    ("weight", "50 W"),
+    ("body_material", "Alder"),
+    ("color", "2 tone sunburst"),
+    ("weight", None),
+])
+def test_parse_spec_value_without_number(key, value):
+    assert parse_spec_value(key, value) == (None, None)
+
+
+def test_parse_spec_value_uses_unit_hint():
+    assert parse_spec_value("weight", "800", unit_hint="g") == (0.8, "kg")
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("power>=1,000W", ("power", ">=", 1000.0)),
+    ("Number of Frets >= 24", ("frets", ">=", 24.0)),
+    ("weight<3kg", ("weight", "<", 3.0)),
+    ("sample rate=48 kHz", ("sample_rate", "=", 48000.0)),
+    ("color=Black", ("color", "=", "Black")),
+])
+def test_parse_spec_filter(expression, expected):
+    assert parse_spec_filter(expression) == expected
+
+
+@pytest.mark.parametrize("expression", ["frets", "color>Black", ""])
+def test_parse_spec_filter_rejects_invalid(expression):
+    with pytest.raises(ValueError):
+        parse_spec_filter(expression)
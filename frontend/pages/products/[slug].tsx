@@ -9,7 +9,7 @@ import ProductSpecifications from '../../src/components/ProductSpecifications';
 import ProductContentSections from '../../src/components/ProductContentSections';
 import ComprehensiveProductContent from '../../src/components/ComprehensiveProductContent';
 import { ProductDetailButtons } from '../../src/components/AffiliateButtons';
-import { fetchProductAffiliateStores } from '../../src/lib/api';
+import { fetchProductAffiliateStores, fetchProductPage } from '../../src/lib/api';
 import RelatedProducts from '../../src/components/RelatedProducts';
 import ProductReviews from '../../src/components/ProductReviews';
 import ProductVoting from '../../src/components/ProductVoting';
@@ -536,7 +536,23 @@ export const getServerSideProps: GetServerSideProps = async ({ params }) => {
       };
     }
 
-    const product = await fetchProduct(slug);
+    // One bundled request for product, affiliate stores, votes and related data
+    let product: any = null;
+    let affiliateStores: any[] = [];
+    try {
+      const page = await fetchProductPage(slug);
+      product = page.product;
+      affiliateStores = page.affiliate_stores || [];
+    } catch {
+      // Fall back to the individual endpoints
+      product = await fetchProduct(slug);
+      if (product) {
+        try {
+          const resp = await fetchProductAffiliateStores(product.id);
+          affiliateStores = resp.affiliate_stores || [];
+        } catch {}
+      }
+    }
 
     if (!product) {
       return {
@@ -544,13 +560,6 @@ export const getServerSideProps: GetServerSideProps = async ({ params }) => {
       };
     }
 
-    // Preload affiliate stores to avoid extra client calls and rate limits
-    let affiliateStores: any[] = [];
-    try {
-      const resp = await fetchProductAffiliateStores(product.id);
-      affiliateStores = resp.affiliate_stores || [];
-    } catch {}
-
     return {
       props: {
         product,
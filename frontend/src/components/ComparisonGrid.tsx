@@ -10,17 +10,21 @@ interface ComparisonGridProps {
 }
 
 export default function ComparisonGrid({ comparison }: ComparisonGridProps) {
-  const { products, common_specs, comparison_matrix } = comparison;
+  const { products, common_specs, aligned_specs, spec_labels } = comparison;
+  // Prefer rows aligned on canonical keys; older responses only have the raw matrix
+  const comparison_matrix = aligned_specs || comparison.comparison_matrix;
 
   if (products.length === 0) return null;
 
   // Get all specifications from all products (not just common ones)
   const allSpecs = new Set<string>();
-  products.forEach(product => {
-    if (product.specifications) {
-      Object.keys(product.specifications).forEach(spec => allSpecs.add(spec));
-    }
-  });
+  if (!aligned_specs) {
+    products.forEach(product => {
+      if (product.specifications) {
+        Object.keys(product.specifications).forEach(spec => allSpecs.add(spec));
+      }
+    });
+  }
   
   // Also add specs from comparison_matrix
   if (comparison_matrix) {
@@ -28,6 +32,9 @@ export default function ComparisonGrid({ comparison }: ComparisonGridProps) {
   }
   
   const sortedSpecs = Array.from(allSpecs).sort();
+  const specValue = (product: { id: number; specifications?: Record<string, any> }, spec: string) =>
+    aligned_specs ? aligned_specs[spec]?.[product.id] : (product.specifications?.[spec] || comparison_matrix?.[spec]?.[product.id]);
+  const specName = (spec: string) => spec_labels?.[spec] || spec.replace(/_/g, ' ');
 
   return (
     <>
@@ -70,7 +77,7 @@ export default function ComparisonGrid({ comparison }: ComparisonGridProps) {
           {sortedSpecs.map((spec) => {
             // Check if this row has any values
             const hasValues = products.some(product => {
-              const value = product.specifications?.[spec] || comparison_matrix?.[spec]?.[product.id];
+              const value = specValue(product, spec);
               return value && value !== 'N/A' && value !== '';
             });
             
@@ -79,10 +86,10 @@ export default function ComparisonGrid({ comparison }: ComparisonGridProps) {
             return (
               <tr key={spec} className="hover:bg-gray-50">
                 <td className="px-6 py-4 text-sm font-medium text-gray-900 capitalize bg-gray-50 break-words">
-                  {spec.replace(/_/g, ' ')}
+                  {specName(spec)}
                 </td>
                 {products.map((product) => {
-                  const value = product.specifications?.[spec] || comparison_matrix?.[spec]?.[product.id];
+                  const value = specValue(product, spec);
                   
                   const formatValue = (val: any) => {
                     if (!val || val === 'N/A' || val === '') return 'N/A';
@@ -139,7 +146,7 @@ export default function ComparisonGrid({ comparison }: ComparisonGridProps) {
         
         {sortedSpecs.filter(spec => {
           const hasValues = products.some(product => {
-            const value = product.specifications?.[spec] || comparison_matrix?.[spec]?.[product.id];
+            const value = specValue(product, spec);
             return value && value !== 'N/A' && value !== '';
           });
           return hasValues;
@@ -187,10 +194,10 @@ export default function ComparisonGrid({ comparison }: ComparisonGridProps) {
             <div className="p-4">
               <div className="space-y-3">
                 {sortedSpecs.filter(spec => {
-                  const value = product.specifications?.[spec] || comparison_matrix?.[spec]?.[product.id];
+                  const value = specValue(product, spec);
                   return value && value !== 'N/A' && value !== '';
                 }).map((spec) => {
-                  const value = product.specifications?.[spec] || comparison_matrix?.[spec]?.[product.id];
+                  const value = specValue(product, spec);
                   
                   const formatValue = (val: any) => {
                     if (!val || val === 'N/A' || val === '') return 'N/A';
@@ -234,7 +241,7 @@ export default function ComparisonGrid({ comparison }: ComparisonGridProps) {
                     <div key={spec} className="border-b border-gray-100 pb-2 last:border-b-0">
                       <div className="flex flex-col space-y-1">
                         <span className="text-sm font-medium text-gray-700 capitalize">
-                          {spec.replace(/_/g, ' ')}
+                          {specName(spec)}
                         </span>
                         <div className="text-sm text-gray-900">
                           {displayValue}
@@ -119,11 +119,34 @@ export async function fetchProduct(slugOrId: string | number): Promise<Product>
   }
 }
 
+export interface ProductPageBundle {
+  product: Product;
+  affiliate_stores: AffiliateStoreWithUrl[];
+  compared_with: any[];
+  related_products: any[];
+  user_region?: string | null;
+  generated_at: string;
+}
+
+// Single request for everything the product page renders (product, affiliate stores,
+// votes, compared-with and related products). Also records the product view.
+export async function fetchProductPage(slug: string): Promise<ProductPageBundle> {
+  const response = await apiFetch(`${PROXY_BASE}/products/${encodeURIComponent(slug)}/page`, {
+    headers: getHeaders(),
+  });
+
+  if (!response.ok) {
+    throw new Error(`Failed to fetch product page: ${response.statusText}`);
+  }
+
+  return response.json();
+}
+
 export async function fetchProductComparison(productIds: number[]): Promise<ProductComparison> {
-  const response = await apiFetch(`${PROXY_BASE}/compare`, {
-    method: 'POST',
+  // GET form is cacheable: the backend keys results by the sorted id set
+  const ids = Array.from(new Set(productIds)).sort((a, b) => a - b).join(',');
+  const response = await apiFetch(`${PROXY_BASE}/compare?ids=${ids}`, {
     headers: getHeaders(),
-    body: JSON.stringify(productIds),
   });
   
   if (!response.ok) {
@@ -141,6 +141,9 @@ export interface ProductComparison {
   products: Product[];
   common_specs: string[];
   comparison_matrix: Record<string, Record<string, any>>;
+  // Specs aligned on canonical keys (synonymous keys merged) with display labels
+  aligned_specs?: Record<string, Record<string, any>>;
+  spec_labels?: Record<string, string>;
 }
 
 export interface SearchResult {
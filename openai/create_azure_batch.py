@@ -2,16 +2,47 @@
 """
 Create batch files in the correct Azure OpenAI format.
 Based on Microsoft documentation: https://learn.microsoft.com/en-us/azure/ai-foundry/openai/how-to/batch-blob-storage?tabs=python
+
+Products are streamed by id (keyset, server-side cursor) and each request line is
+written as soon as it is encoded, so memory stays flat for the whole catalog.
+Output is split into shard files before either Azure input limit (lines or bytes
+per file) is reached. With --all the id space is cut into equal ranges that a
+process pool builds concurrently.
 """
 
 import json
 import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from database import get_async_session
+from typing import Any, Dict, List, Optional, Tuple
+from database import async_engine, get_async_session
 from sqlalchemy import text
 import argparse
 
+# Use your actual deployment name here
+DEPLOYMENT_NAME = "gpt-4.1"
+
+# Azure OpenAI batch input limits per file
+MAX_LINES_PER_FILE = 100_000
+MAX_BYTES_PER_FILE = 200 * 1024 * 1024
+
+# Rows fetched per round trip from the server-side cursor
+STREAM_BATCH_SIZE = 1000
+
+BATCH_DIR = Path(__file__).parent / "batch_files"
+
+PRODUCT_SELECT = """
+    SELECT p.id AS product_id, p.sku, p.name, p.slug, p.description, p.msrp_price,
+           b.name AS brand_name, c.name AS category_name
+    FROM products p
+    LEFT JOIN brands b ON p.brand_id = b.id
+    LEFT JOIN categories c ON p.category_id = c.id
+"""
+
 
 def get_azure_prompt(prompt_file=None, mode=None):
     """Get the prompt formatted for Azure OpenAI batch.
@@ -27,74 +58,52 @@ def get_azure_prompt(prompt_file=None, mode=None):
     return get_batch_prompt()
 
 
-async def create_azure_batch_file(
-    num_products=30,
-    mode=None,
-    prompt_file=None,
-    offset=0,
-    part_index=None,
-    total_parts=None,
-    start_id=None,
-    return_meta=False,
-):
-    """Create a batch file in the correct Azure OpenAI format.
-    - mode: None (full) or 'ratings_append'
-    - prompt_file: optional explicit prompt filename from config_files
+def max_tokens_for(mode=None):
+    return 25000 if mode == 'ratings_append' else 4000
+
+
+class BatchRequestEncoder:
+    """Encodes one product row into one JSONL request line.
+
+    Every line carries the same system prompt (the batch format has no shared
+    context), so the request is JSON-encoded once around two placeholders and
+    each line only encodes its custom_id and user message. Lines are identical
+    to json.dumps of the full request.
     """
 
-    # Get products from database (always from products)
-    async with await get_async_session() as session:
-        # Join brand/category names if available
-        if start_id is not None:
-            query = text(
-                """
-                SELECT p.id AS product_id, p.sku, p.name, p.slug, p.description, p.msrp_price,
-                       b.name AS brand_name, c.name AS category_name
-                FROM products p
-                LEFT JOIN brands b ON p.brand_id = b.id
-                LEFT JOIN categories c ON p.category_id = c.id
-                WHERE p.id > :start_id
-                ORDER BY p.id
-                LIMIT :limit
-                """
-            )
-            params = {"limit": num_products, "start_id": start_id}
-        else:
-            query = text(
-                """
-                SELECT p.id AS product_id, p.sku, p.name, p.slug, p.description, p.msrp_price,
-                       b.name AS brand_name, c.name AS category_name
-                FROM products p
-                LEFT JOIN brands b ON p.brand_id = b.id
-                LEFT JOIN categories c ON p.category_id = c.id
-                ORDER BY p.id
-                LIMIT :limit OFFSET :offset
-                """
-            )
-            params = {"limit": num_products, "offset": offset}
+    _CUSTOM_ID = "\x00custom_id\x00"
+    _USER_CONTENT = "\x00user_content\x00"
 
-        result = await session.execute(query, params)
+    def __init__(self, azure_prompt: str, mode=None, deployment_name: str = DEPLOYMENT_NAME):
+        self.mode = mode
+        template = json.dumps({
+            "custom_id": self._CUSTOM_ID,
+            "method": "POST",
+            "url": "/chat/completions",  # Changed from /v1/chat/completions
+            "body": {
+                "model": deployment_name,  # Use your deployment name
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": azure_prompt
+                    },
+                    {
+                        "role": "user",
+                        "content": self._USER_CONTENT
+                    }
+                ],
+                "response_format": {"type": "json_object"},
+                "max_tokens": max_tokens_for(mode),
+                "temperature": 0.1
+            }
+        })
+        head, rest = template.split(json.dumps(self._CUSTOM_ID))
+        self._head = head
+        self._middle, self._tail = rest.split(json.dumps(self._USER_CONTENT))
 
-        products = result.fetchall()
-    
-    if not products:
-        print("❌ No products found")
-        return None
-    
-    print(f"📋 Found {len(products)} products for batch processing")
-    
-    # Create batch requests
-    batch_requests = []
-    azure_prompt = get_azure_prompt(prompt_file=prompt_file, mode=mode)
-    
-    # Use your actual deployment name here
-    deployment_name = "gpt-4.1"  # Replace with your actual deployment name
-    
-    for i, product in enumerate(products, 1):
-        print(f"  Processing product {i}/{len(products)}: {product.name}...")
-        
-        # Create product input
-        product_input = {
+    @staticmethod
+    def product_input(product) -> Dict[str, Any]:
+        return {
             "id": getattr(product, "product_id", None),
             "sku": getattr(product, "sku", None),
             "name": product.name,
@@ -104,10 +113,10 @@ async def create_azure_batch_file(
             "brand": getattr(product, "brand_name", None),
             "category": getattr(product, "category_name", None),
         }
-        
-        # Create batch request in Azure OpenAI format
-        custom_id = product_input.get("sku") or product_input.get("slug") or f"idx_{i}"
-        if mode == 'ratings_append':
+
+    def custom_id(self, product_input: Dict[str, Any], index: int) -> str:
+        custom_id = product_input.get("sku") or product_input.get("slug") or f"idx_{index}"
+        if self.mode == 'ratings_append':
             # Encode multiple identifiers to robustly match later
             parts = []
             if product_input.get("id"):
@@ -117,73 +126,283 @@ async def create_azure_batch_file(
             if product_input.get("slug"):
                 parts.append(f"slug:{product_input['slug']}")
             parts.append("mode:ratings_append")
-            custom_id = "|".join(parts) if parts else f"idx_{i}|mode:ratings_append"
+            custom_id = "|".join(parts) if parts else f"idx_{index}|mode:ratings_append"
+        return custom_id
 
-        batch_request = {
-            "custom_id": custom_id,
-            "method": "POST",
-            "url": "/chat/completions",  # Changed from /v1/chat/completions
-            "body": {
-                "model": deployment_name,  # Use your deployment name
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": azure_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": (
-                            f"Process this product: {json.dumps(product_input)}"
-                            if mode != 'ratings_append' else
-                            f"Generate ONLY the new sections to append under content as per the system JSON. Product: {json.dumps(product_input)}"
-                        )
-                    }
-                ],
-                "response_format": {"type": "json_object"},
-                "max_tokens": 25000 if mode == 'ratings_append' else 4000,
-                "temperature": 0.1
-            }
+    def encode(self, product, index: int) -> str:
+        product_input = self.product_input(product)
+        user_content = (
+            f"Process this product: {json.dumps(product_input)}"
+            if self.mode != 'ratings_append' else
+            f"Generate ONLY the new sections to append under content as per the system JSON. Product: {json.dumps(product_input)}"
+        )
+        return (
+            self._head + json.dumps(self.custom_id(product_input, index))
+            + self._middle + json.dumps(user_content) + self._tail
+        )
+
+
+class ShardWriter:
+    """Writes request lines to numbered JSONL files, starting a new file before either limit would be exceeded.
+
+    A shard is written as <stem>_partNNN.jsonl and renamed to include its id
+    range once closed.
+    """
+
+    def __init__(self, stem: str, max_lines: int = MAX_LINES_PER_FILE, max_bytes: int = MAX_BYTES_PER_FILE,
+                 batch_dir: Path = BATCH_DIR):
+        self.stem = stem
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.batch_dir = batch_dir
+        self.shards: List[Dict[str, Any]] = []
+        self._file = None
+        self._path: Optional[Path] = None
+        self._lines = 0
+        self._bytes = 0
+        self._first_id = None
+        self._last_id = None
+
+    def write(self, line: str, product_id=None) -> None:
+        # json.dumps escapes non-ASCII, so characters are bytes
+        size = len(line) + 1
+        if self._file is not None and (self._lines >= self.max_lines or self._bytes + size > self.max_bytes):
+            self._close_shard()
+        if self._file is None:
+            self._open_shard()
+        self._file.write(line)
+        self._file.write("\n")
+        self._lines += 1
+        self._bytes += size
+        if product_id is not None:
+            if self._first_id is None:
+                self._first_id = product_id
+            self._last_id = product_id
+
+    def close(self) -> List[Dict[str, Any]]:
+        if self._file is not None:
+            self._close_shard()
+        return self.shards
+
+    def _open_shard(self) -> None:
+        self.batch_dir.mkdir(parents=True, exist_ok=True)
+        self._path = self.batch_dir / f"{self.stem}_part{len(self.shards) + 1:03d}.jsonl"
+        self._file = open(self._path, "w")
+        self._lines = self._bytes = 0
+        self._first_id = self._last_id = None
+
+    def _close_shard(self) -> None:
+        self._file.close()
+        path = self._path
+        if self._first_id is not None:
+            path = self._path.with_name(f"{self._path.stem}_ids{self._first_id}-{self._last_id}.jsonl")
+            os.replace(self._path, path)
+        self.shards.append({
+            "filename": str(path),
+            "lines": self._lines,
+            "bytes": self._bytes,
+            "first_id": self._first_id,
+            "last_id": self._last_id,
+        })
+        self._file = None
+
+
+async def stream_products(session, after_id=None, until_id=None, limit=None):
+    """Products with after_id < id <= until_id in id order, fetched through a server-side cursor"""
+    conditions, params = [], {}
+    if after_id is not None:
+        conditions.append("p.id > :after_id")
+        params["after_id"] = after_id
+    if until_id is not None:
+        conditions.append("p.id <= :until_id")
+        params["until_id"] = until_id
+    sql = PRODUCT_SELECT
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY p.id"
+    if limit is not None:
+        sql += " LIMIT :limit"
+        params["limit"] = limit
+    result = await session.stream(text(sql).execution_options(yield_per=STREAM_BATCH_SIZE), params)
+    async for product in result:
+        yield product
+
+
+async def write_batch_shards(
+    writer: ShardWriter,
+    encoder: BatchRequestEncoder,
+    after_id=None,
+    until_id=None,
+    limit=None,
+) -> List[Dict[str, Any]]:
+    """Stream a product id range through the encoder into the writer's shards"""
+    async with await get_async_session() as session:
+        index = 0
+        async for product in stream_products(session, after_id, until_id, limit):
+            index += 1
+            writer.write(encoder.encode(product, index), getattr(product, "product_id", None))
+    return writer.close()
+
+
+async def catalog_ranges(parts: int, after_id=None, limit=None) -> List[Tuple[Optional[int], int]]:
+    """Split products (id > after_id, first limit rows) into up to parts (after_id, until_id] ranges of equal row count"""
+    conditions, params = "", {"parts": parts}
+    if after_id is not None:
+        conditions = "WHERE id > :after_id"
+        params["after_id"] = after_id
+    limit_sql = ""
+    if limit is not None:
+        limit_sql = "LIMIT :limit"
+        params["limit"] = limit
+    query = text(f"""
+        SELECT max(id) AS until_id
+        FROM (
+            SELECT id, ntile(:parts) OVER (ORDER BY id) AS part
+            FROM (SELECT id FROM products {conditions} ORDER BY id {limit_sql}) ids
+        ) numbered
+        GROUP BY part
+        ORDER BY until_id
+    """)
+    async with await get_async_session() as session:
+        bounds = [row.until_id for row in (await session.execute(query, params)).fetchall()]
+    ranges = []
+    lower = after_id
+    for until_id in bounds:
+        ranges.append((lower, until_id))
+        lower = until_id
+    return ranges
+
+
+def _build_range(job: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Process-pool entry point: build the shards for one id range"""
+    encoder = BatchRequestEncoder(job["azure_prompt"], mode=job["mode"])
+    writer = ShardWriter(job["stem"], max_lines=job["max_lines"], max_bytes=job["max_bytes"])
+    return asyncio.run(_write_range(writer, encoder, job["after_id"], job["until_id"]))
+
+
+async def _write_range(writer: ShardWriter, encoder: BatchRequestEncoder, after_id, until_id) -> List[Dict[str, Any]]:
+    try:
+        return await write_batch_shards(writer, encoder, after_id=after_id, until_id=until_id)
+    finally:
+        # A pooled worker runs several ranges, each in a new event loop; pooled
+        # connections of the previous loop cannot be reused, so close them here
+        await async_engine.dispose()
+
+
+async def build_catalog_batch_files(
+    mode=None,
+    prompt_file=None,
+    workers: Optional[int] = None,
+    max_lines: int = MAX_LINES_PER_FILE,
+    max_bytes: int = MAX_BYTES_PER_FILE,
+    after_id=None,
+    limit=None,
+) -> List[Dict[str, Any]]:
+    """Batch files for every product (id > after_id, first limit rows), one id range per worker process.
+
+    Returns the shard descriptions (filename, lines, bytes, first_id, last_id) in id order.
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = await catalog_ranges(workers, after_id=after_id, limit=limit)
+    if not ranges:
+        print("❌ No products found")
+        return []
+
+    # Loaded once here rather than once per worker
+    azure_prompt = get_azure_prompt(prompt_file=prompt_file, mode=mode)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    suffix = "ratings_append" if mode == 'ratings_append' else "full"
+    width = len(str(len(ranges)))
+    jobs = [
+        {
+            "azure_prompt": azure_prompt,
+            "mode": mode,
+            "stem": f"azure_batch_{suffix}_products_{timestamp}_range{i:0{width}d}of{len(ranges):0{width}d}",
+            "max_lines": max_lines,
+            "max_bytes": max_bytes,
+            "after_id": lower,
+            "until_id": upper,
         }
-        
-        batch_requests.append(batch_request)
-    
+        for i, (lower, upper) in enumerate(ranges, 1)
+    ]
+    print(f"🧩 Building {len(jobs)} id ranges with {min(workers, len(jobs))} worker processes")
+
+    started = time.perf_counter()
+    # Spawned workers open their own database engine instead of inheriting this one's connections
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), mp_context=multiprocessing.get_context("spawn")) as pool:
+        results = await asyncio.gather(*(loop.run_in_executor(pool, _build_range, job) for job in jobs))
+    elapsed = time.perf_counter() - started
+
+    shards = [shard for range_shards in results for shard in range_shards]
+    total_lines = sum(shard["lines"] for shard in shards)
+    total_bytes = sum(shard["bytes"] for shard in shards)
+    print(f"✅ Created {len(shards)} batch files: {total_lines} requests, {total_bytes / 1024 / 1024:.1f} MB "
+          f"in {elapsed:.1f}s ({total_lines / elapsed if elapsed else 0:.0f} requests/s)")
+    return shards
+
+
+async def create_azure_batch_file(
+    num_products=30,
+    mode=None,
+    prompt_file=None,
+    offset=0,
+    part_index=None,
+    total_parts=None,
+    start_id=None,
+    return_meta=False,
+):
+    """Create a batch file in the correct Azure OpenAI format.
+    - mode: None (full) or 'ratings_append'
+    - prompt_file: optional explicit prompt filename from config_files
+    - start_id: take products with id > start_id (keyset); offset is only used without it
+    """
+
+    azure_prompt = get_azure_prompt(prompt_file=prompt_file, mode=mode)
+    encoder = BatchRequestEncoder(azure_prompt, mode=mode)
+
     # Write to file (ensure we write inside openai/batch_files)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     suffix = "ratings_append" if mode == 'ratings_append' else "full"
     source_label = "products"
-    batch_dir = Path(__file__).parent / "batch_files"
-    batch_dir.mkdir(parents=True, exist_ok=True)
     # Include offset and zero-padded part index for uniqueness and natural sort order
     if part_index and total_parts:
         width = len(str(total_parts))
         part_str = f"_part{part_index:0{width}d}of{total_parts:0{width}d}"
+        print(f"🧩 File part {part_index}/{total_parts} | offset={offset} | count={num_products}")
     else:
         part_str = ""
-    # Include id range when available
-    ids = [getattr(p, "product_id", None) for p in products if getattr(p, "product_id", None) is not None]
-    id_range = ""
-    first_id = last_id = None
-    if ids:
-        first_id = min(ids)
-        last_id = max(ids)
-        id_range = f"_ids{first_id}-{last_id}"
-    filename = str(batch_dir / f"azure_batch_{suffix}_{source_label}_{num_products}{part_str}_offset{offset}{id_range}_{timestamp}.jsonl")
-    if part_index and total_parts:
-        print(f"🧩 File part {part_index}/{total_parts} | offset={offset} | count={num_products}")
+    stem = f"azure_batch_{suffix}_{source_label}_{num_products}{part_str}_offset{offset}_{timestamp}"
+    # A single file: the count bounds it, not the shard limits
+    writer = ShardWriter(stem, max_lines=num_products, max_bytes=float("inf"))
 
-    with open(filename, 'w') as f:
-        for request in batch_requests:
-            f.write(json.dumps(request) + '\n')
-    
+    if start_id is None and offset:
+        # Resolve the offset to an id once, then stream by keyset like every other batch
+        async with await get_async_session() as session:
+            result = await session.execute(
+                text("SELECT id FROM products ORDER BY id LIMIT 1 OFFSET :offset"), {"offset": offset - 1}
+            )
+            start_id = result.scalar()
+        if start_id is None:
+            print("❌ No products found")
+            return None
+
+    shards = await write_batch_shards(writer, encoder, after_id=start_id, limit=num_products)
+    if not shards:
+        print("❌ No products found")
+        return None
+
+    shard = shards[0]
+    filename = shard["filename"]
     print(f"\n✅ Azure batch file created: {filename}")
-    print(f"📊 Total requests: {len(batch_requests)}")
+    print(f"📊 Total requests: {shard['lines']}")
     print(f"📝 System prompt length: {len(azure_prompt)} characters")
-    print(f"🔢 Max tokens per request: {25000 if mode == 'ratings_append' else 4000}")
-    print(f"🎯 Deployment name: {deployment_name}")
+    print(f"🔢 Max tokens per request: {max_tokens_for(mode)}")
+    print(f"🎯 Deployment name: {DEPLOYMENT_NAME}")
     print(f"🔗 URL format: /chat/completions")
     
     if return_meta:
-        return filename, first_id, last_id
+        return filename, shard["first_id"], shard["last_id"]
     return filename
 
 
@@ -321,22 +540,40 @@ def main():
     parser.add_argument("--mode", choices=["full", "ratings_append"], default="full", help="Prompt/output mode")
     parser.add_argument("--prompt-file", dest="prompt_file", default=None, help="Prompt filename from config_files (overrides mode)")
     parser.add_argument("--offset", type=int, default=0, help="Row offset for pagination")
+    parser.add_argument("--start-id", dest="start_id", type=int, default=None, help="Only products with id greater than this")
+    parser.add_argument("--all", dest="all_products", action="store_true", help="Whole catalog, sharded and built in parallel (ignores num)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for --all (default: CPU count)")
+    parser.add_argument("--max-lines", dest="max_lines", type=int, default=MAX_LINES_PER_FILE, help="Requests per file for --all")
+    parser.add_argument("--max-mb", dest="max_mb", type=float, default=MAX_BYTES_PER_FILE / 1024 / 1024, help="Megabytes per file for --all")
     args = parser.parse_args()
 
-    print(f"🚀 Creating Azure OpenAI batch file for {args.num} items | source=products | mode={args.mode}")
-
     mode_arg = None if args.mode == 'full' and not args.prompt_file else ('ratings_append' if args.mode == 'ratings_append' else None)
 
-    # Create batch file
-    loop = asyncio.get_event_loop()
-    batch_file = loop.run_until_complete(create_azure_batch_file(args.num, mode=mode_arg, prompt_file=args.prompt_file, offset=args.offset))
+    if args.all_products:
+        print(f"🚀 Creating Azure OpenAI batch files for all products | source=products | mode={args.mode}")
+        shards = asyncio.run(build_catalog_batch_files(
+            mode=mode_arg,
+            prompt_file=args.prompt_file,
+            workers=args.workers,
+            max_lines=args.max_lines,
+            max_bytes=int(args.max_mb * 1024 * 1024),
+            after_id=args.start_id,
+        ))
+        for shard in shards:
+            print(f"  - {shard['filename']} ({shard['lines']} requests, {shard['bytes'] / 1024 / 1024:.1f} MB)")
+        batch_file = shards[0]["filename"] if shards else None
+    else:
+        print(f"🚀 Creating Azure OpenAI batch file for {args.num} items | source=products | mode={args.mode}")
+        batch_file = asyncio.run(create_azure_batch_file(
+            args.num, mode=mode_arg, prompt_file=args.prompt_file, offset=args.offset, start_id=args.start_id
+        ))
 
     if batch_file:
         # Create submission script
         script_file = create_azure_batch_script()
 
         print(f"\n📋 Next Steps:")
-        print(f"1. Upload {batch_file} to your Azure Blob Storage batch-input container")
+        print(f"1. Upload {'the batch files' if args.all_products else batch_file} to your Azure Blob Storage batch-input container")
         print(f"2. Update configuration in {script_file}")
         print(f"3. Run: python3 {script_file}")
         print(f"4. Monitor the batch job progress")
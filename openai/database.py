@@ -1,7 +1,9 @@
 import asyncio
 import os
+import sys
 from datetime import datetime
-from typing import Optional
+from pathlib import Path
+from typing import Any, Dict, Optional
 
 from sqlalchemy import create_engine, MetaData, Table, Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey, JSON, text
 from sqlalchemy.dialects.postgresql import JSONB
@@ -123,6 +125,28 @@ async def get_async_session() -> AsyncSession:
     async with async_session_maker() as session:
         return session
 
+# product_specs and product_affiliate_urls are derived from content by backend services
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+
+def _use_backend_services() -> None:
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.append(str(BACKEND_DIR))
+
+
+async def index_product_specs(session: AsyncSession, product_id: int, content: Optional[Dict[str, Any]]) -> int:
+    """Refresh product_specs for one product inside the session's transaction; commit it with the content write"""
+    _use_backend_services()
+    from app.services.spec_index import SpecIndexService
+    return await SpecIndexService(session).index_product(product_id, content)
+
+
+async def materialize_affiliate_urls(session: AsyncSession, product_id: int, content: Optional[Dict[str, Any]]) -> int:
+    """Rewrite product_affiliate_urls for one product inside the session's transaction, from content.store_links"""
+    _use_backend_services()
+    from app.services.enhanced_affiliate_service import EnhancedAffiliateService
+    return await EnhancedAffiliateService(session).materialize_product_urls(product_id, content)
+
 async def create_tables():
     """Create all tables"""
     async with async_engine.begin() as conn:
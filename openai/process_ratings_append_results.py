@@ -17,7 +17,7 @@ import asyncio
 from pathlib import Path
 from typing import Any, Dict
 from sqlalchemy import text
-from database import get_async_session
+from database import get_async_session, index_product_specs, materialize_affiliate_urls
 
 
 def deep_merge_fill_missing(existing: Any, patch: Any) -> Any:
@@ -67,6 +67,10 @@ async def merge_by_identifiers(ident: Dict[str, str], content_append: Dict[str,
             text("UPDATE products SET content = :content, updated_at = NOW() WHERE id = :id"),
             {"content": json.dumps(new_content), "id": row.id},
         )
+        if new_content.get("specifications") != current.get("specifications"):
+            await index_product_specs(session, row.id, new_content)
+        if new_content.get("store_links") != current.get("store_links"):
+            await materialize_affiliate_urls(session, row.id, new_content)
         await session.commit()
         
         # Show detailed info in test mode
@@ -13,7 +13,7 @@ from typing import Dict, Any, Optional
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import get_async_session, ProductsFilled, Product, Brand, Category
+from database import get_async_session, index_product_specs, materialize_affiliate_urls, ProductsFilled, Product, Brand, Category
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -139,6 +139,11 @@ class ProductsFilledParser:
             # Store links, customer reviews, and product images are now stored in the content JSONB
             # No need for separate table inserts
             
+            # Spec filters and /compare read product_specs, affiliate buttons read
+            # product_affiliate_urls; refresh both in the same transaction
+            await index_product_specs(self.session, product.id, product.content)
+            await materialize_affiliate_urls(self.session, product.id, product.content)
+            
             await self.session.commit()
             logger.info(f"Successfully inserted product: {product.name} (ID: {product.id}, SKU: {product.sku})")
             return True